@@ -1,5 +1,10 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+import subprocess
+import sys
+
+# Pre-render images into assets/prerendered.bundle (shipped with the assets folder)
+subprocess.check_call([sys.executable, 'tools/build_assets.py'])
 
 a = Analysis(
     ['launcher.py'],
@@ -0,0 +1,430 @@
+# File: benchmarks/run_benchmarks.py
+"""
+Headless benchmark suite for the launcher.
+
+Every scenario runs in a fresh child process against the in-process fake
+Supabase client (ZARRAGA_BACKEND=fake, see utils/fake_supabase.py), with an isolated app-data
+directory, so results do not depend on the network or on earlier runs.
+On Linux without a display an Xvfb server is started for the run.
+
+Scenarios:
+    cold-start      process spawn -> login screen drawn (repeated --repeats times)
+    page-switch     first build of every registered page, then show_page
+                    latency for every ordered pair of pages
+    load-accounts   EditAccountsPage first server page (fixed PAGE_SIZE rows,
+                    does not grow with the size), full cache sync and peak
+                    memory, once per --sizes entry
+    images          decode time of every file in assets/ and the image
+                    phases of MainFrame.__init__
+
+Usage:
+    python benchmarks/run_benchmarks.py [--latency-ms 20] [--sizes 100,10000,100000]
+                                        [--repeats 5] [--only cold-start,images]
+                                        [--output benchmark_results.json]
+
+The JSON report (schema SCHEMA_VERSION) is meant to be kept per release
+and compared field by field. No reference numbers are kept in the repo:
+figures depend on the machine, so compare reports made on the same one.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from supabase_init import BACKEND_ENV
+from utils.fake_supabase import ENV_LATENCY_MS, ENV_USERS
+
+SCHEMA_VERSION = 2
+SCENARIOS = ("cold-start", "page-switch", "load-accounts", "images")
+DEFAULT_SIZES = (100, 10_000, 100_000)
+DEFAULT_LATENCY_MS = 20.0
+DEFAULT_REPEATS = 5
+# Child processes print their result on a line starting with this marker
+RESULT_PREFIX = "BENCH_RESULT "
+CHILD_TIMEOUT_S = 600
+# Upper bound for any single wait on the Tk event loop inside a child
+PUMP_TIMEOUT_S = 300
+XVFB_SCREEN = "1280x800x24"
+
+
+# ---------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------
+def summarize(samples):
+    """min/median/p95/max/mean of a list of milliseconds."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "n": len(ordered),
+        "min": round(ordered[0], 3),
+        "median": round(statistics.median(ordered), 3),
+        "p95": round(p95, 3),
+        "max": round(ordered[-1], 3),
+        "mean": round(statistics.fmean(ordered), 3),
+    }
+
+
+def _ms_since(start):
+    return (time.perf_counter() - start) * 1000
+
+
+def _peak_rss_bytes():
+    """Peak resident set size of this process, or None where it cannot be read."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset
+        except Exception:
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+# ---------------------------------------------------------
+# Child side (runs inside the measured process)
+# ---------------------------------------------------------
+def _pump_until(app, done, timeout_s=PUMP_TIMEOUT_S):
+    """Run the Tk event loop until done() is true."""
+    deadline = time.perf_counter() + timeout_s
+    while not done():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Timed out waiting on the Tk event loop")
+        app.update()
+        time.sleep(0.001)
+
+
+def _start_app(first_paint_marks=None, prewarm=False):
+    """Construct MainFrame and run it until the login screen has been drawn."""
+    from mainFrame import MainFrame
+
+    marks = first_paint_marks if first_paint_marks is not None else {}
+    original = MainFrame._show_first_page
+
+    def show_first_page(self, saved):
+        original(self, saved)
+        marks["first_paint"] = time.time()
+
+    MainFrame._show_first_page = show_first_page
+    app = MainFrame()
+    if not prewarm:
+        app.prewarm_queue.clear()
+    _pump_until(app, lambda: "first_paint" in marks)
+    return app
+
+
+def child_cold_start(args):
+    t_import = time.perf_counter()
+    import mainFrame  # noqa: F401  (timed import of the whole UI)
+    import_ms = _ms_since(t_import)
+
+    marks = {}
+    t_construct = time.perf_counter()
+    app = _start_app(marks, prewarm=True)
+    ready_ms = _ms_since(t_construct)
+    app.on_close()
+    return {
+        "spawn_to_first_paint_ms": round((marks["first_paint"] - args.t0) * 1000, 3),
+        "import_ms": round(import_ms, 3),
+        "construct_to_first_paint_ms": round(ready_ms, 3),
+    }
+
+
+def child_page_switch(args):
+    app = _start_app()
+    pages = list(app.pages)
+
+    first_build = {}
+    for page_class in pages:
+        start = time.perf_counter()
+        app.show_page(page_class)
+        app.update_idletasks()
+        first_build[page_class.__name__] = round(_ms_since(start), 3)
+        app.update()
+
+    pairs = {}
+    for _ in range(args.repeats):
+        for source in pages:
+            for target in pages:
+                if source is target:
+                    continue
+                app.show_page(source)
+                app.update()
+                start = time.perf_counter()
+                app.show_page(target)
+                app.update_idletasks()
+                pairs.setdefault(f"{source.__name__}->{target.__name__}", []).append(_ms_since(start))
+                app.update()
+    app.on_close()
+
+    return {
+        "pages": [page_class.__name__ for page_class in pages],
+        "first_show_ms": first_build,
+        "switch_ms": {pair: summarize(samples) for pair, samples in pairs.items()},
+        "switch_all_ms": summarize([ms for samples in pairs.values() for ms in samples]),
+    }
+
+
+def child_load_accounts(args):
+    import tracemalloc
+    from system_pages.account_modifications.editAccounts import EditAccountsPage
+
+    app = _start_app()
+    page = app.get_page(EditAccountsPage)
+    rss_start = _peak_rss_bytes()
+
+    # First page from the server (what a search or the first fetch costs);
+    # one PAGE_SIZE request whatever the table size
+    start = time.perf_counter()
+    page.load_accounts()
+    _pump_until(app, lambda: not page.loading)
+    first_page_ms = _ms_since(start)
+    first_page_rows = len(page.accounts)
+
+    # Full cache download + search index rebuild + render of the whole list.
+    # load_accounts() already set accounts_loaded, so wait on the sync itself
+    _pump_until(app, lambda: not page.syncing)
+    start = time.perf_counter()
+    page.sync_cache()
+    _pump_until(app, lambda: not page.syncing)
+    sync_ms = _ms_since(start)
+    cached_rows = app.account_cache.count()
+    rss_peak = _peak_rss_bytes()
+
+    # Python heap peak for the same work (separate pass: tracing slows it down).
+    # The first sync has finished, so this one cannot join its shared request
+    app.account_cache.clear()
+    tracemalloc.start()
+    page.sync_cache()
+    _pump_until(app, lambda: not page.syncing)
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    app.on_close()
+
+    return {
+        "accounts": args.accounts,
+        "first_page_ms": round(first_page_ms, 3),
+        "first_page_rows": first_page_rows,
+        "sync_cache_ms": round(sync_ms, 3),
+        "cached_rows": cached_rows,
+        "rss_start_bytes": rss_start,
+        "rss_peak_bytes": rss_peak,
+        "python_heap_peak_bytes": heap_peak,
+    }
+
+
+def child_images(args):
+    from PIL import Image
+    from utils.startup_profiler import PROFILER, PROFILE_ENV, PROFILE_FLAG
+
+    decode = {}
+    assets_dir = os.path.join(REPO_ROOT, "assets")
+    for name in sorted(os.listdir(assets_dir)):
+        path = os.path.join(assets_dir, name)
+        samples = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            with Image.open(path) as image:
+                image.load()
+            samples.append(_ms_since(start))
+        decode[name] = summarize(samples)
+
+    result = {"decode_ms": decode}
+    os.environ[PROFILE_ENV] = os.path.join(os.environ["APPDATA"], "startup_profile.json")
+    PROFILER.configure([PROFILE_FLAG])
+    try:
+        app = _start_app()
+    except Exception as e:
+        result["mainframe_error"] = f"{type(e).__name__}: {e}"
+        return result
+    app.on_close()
+    result["mainframe_phases_ms"] = {
+        entry["phase"]: entry["ms"] for entry in PROFILER.phases if "image" in entry["phase"]
+    }
+    return result
+
+
+CHILD_SCENARIOS = {
+    "cold-start": child_cold_start,
+    "page-switch": child_page_switch,
+    "load-accounts": child_load_accounts,
+    "images": child_images,
+}
+
+
+def run_child(args):
+    # Set here too, so a child started by hand never talks to the real project
+    os.environ[BACKEND_ENV] = "fake"
+    os.environ[ENV_USERS] = str(args.accounts)
+    os.environ[ENV_LATENCY_MS] = str(args.latency_ms)
+    # Isolated cache / journal / logs for every measured process
+    os.environ["APPDATA"] = tempfile.mkdtemp(prefix="zarraga-bench-")
+    os.chdir(REPO_ROOT)
+    result = CHILD_SCENARIOS[args.child](args)
+    result["peak_rss_bytes"] = _peak_rss_bytes()
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+    shutil.rmtree(os.environ["APPDATA"], ignore_errors=True)
+    # Skip interpreter teardown of Tk/threads; the result is already out
+    os._exit(0)
+
+
+# ---------------------------------------------------------
+# Parent side (orchestration)
+# ---------------------------------------------------------
+def start_virtual_display():
+    """Start Xvfb if this is Linux without a display. Returns the process or None."""
+    if not sys.platform.startswith("linux") or os.getenv("DISPLAY"):
+        return None
+    if not shutil.which("Xvfb"):
+        sys.exit("No display available and Xvfb is not installed (apt install xvfb).")
+
+    for number in range(90, 200):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        process = subprocess.Popen(
+            ["Xvfb", f":{number}", "-screen", "0", XVFB_SCREEN, "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                os.environ["DISPLAY"] = f":{number}"
+                return process
+            if process.poll() is not None:
+                break
+            time.sleep(0.05)
+        process.kill()
+    sys.exit("Could not start Xvfb.")
+
+
+def spawn_child(scenario, args, accounts=None):
+    command = [
+        sys.executable, os.path.abspath(__file__),
+        "--child", scenario,
+        "--latency-ms", str(args.latency_ms),
+        "--repeats", str(args.repeats),
+        "--accounts", str(accounts if accounts is not None else args.accounts),
+        "--t0", repr(time.time()),
+    ]
+    # The child's MainFrame picks the fake backend up through supabase_init
+    env = {
+        **os.environ,
+        BACKEND_ENV: "fake",
+        ENV_USERS: str(accounts if accounts is not None else args.accounts),
+        ENV_LATENCY_MS: str(args.latency_ms),
+    }
+    try:
+        completed = subprocess.run(
+            command, cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=CHILD_TIMEOUT_S
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {CHILD_TIMEOUT_S}s"}
+
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    tail = (completed.stderr or completed.stdout).strip().splitlines()[-5:]
+    return {"error": f"exit code {completed.returncode}", "output": tail}
+
+
+def run_suite(args):
+    selected = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = set(selected) - set(SCENARIOS)
+    if unknown:
+        sys.exit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    display = start_virtual_display()
+    results = {}
+    try:
+        if "cold-start" in selected:
+            print("[bench] cold-start")
+            runs = [spawn_child("cold-start", args) for _ in range(args.repeats)]
+            ok = [run for run in runs if "error" not in run]
+            results["cold_start"] = {
+                field: summarize([run[field] for run in ok])
+                for field in ("spawn_to_first_paint_ms", "import_ms", "construct_to_first_paint_ms")
+            }
+            results["cold_start"]["errors"] = [run for run in runs if "error" in run]
+
+        if "page-switch" in selected:
+            print("[bench] page-switch")
+            results["page_switch"] = spawn_child("page-switch", args)
+
+        if "load-accounts" in selected:
+            results["load_accounts"] = {}
+            for size in args.sizes:
+                print(f"[bench] load-accounts ({size} accounts)")
+                results["load_accounts"][str(size)] = spawn_child("load-accounts", args, accounts=size)
+
+        if "images" in selected:
+            print("[bench] images")
+            results["images"] = spawn_child("images", args)
+    finally:
+        if display is not None:
+            display.terminate()
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "latency_ms": args.latency_ms,
+            "sizes": args.sizes,
+            "repeats": args.repeats,
+            "accounts": args.accounts,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Launcher benchmark suite (headless, fake backend)")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS,
+                        help="simulated round-trip time of every backend request")
+    parser.add_argument("--sizes", type=lambda v: [int(s) for s in v.split(",")], default=list(DEFAULT_SIZES),
+                        help="account table sizes for load-accounts")
+    parser.add_argument("--accounts", type=int, default=DEFAULT_SIZES[0],
+                        help="account table size for the other scenarios")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--only", default="", help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--t0", type=float, default=0.0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    report = run_suite(args)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[bench] Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
-from mainFrame import MainFrame
+from utils.startup_profiler import PROFILER
+
+PROFILER.configure()
+
+with PROFILER.phase("import mainFrame"):
+    from mainFrame import MainFrame
 
 if __name__ == "__main__":
-    app = MainFrame()
+    with PROFILER.phase("MainFrame.__init__"):
+        app = MainFrame()
     app.mainloop()
@@ -1,17 +1,17 @@
 # File: system_pages/loginPage.py
 import customtkinter as ctk
 from utils.dialogs import show_info, show_error
-from utils.ui_styles import COLORS, get_fonts, styled_button
+from utils.ui_styles import COLORS, FONTS, styled_button
+from utils.data_worker import request_key, set_busy, is_busy
+from utils.tracing import traced_action, span, VALIDATE
 from navigation import go_to_main_menu
 
-FONTS = get_fonts()
 
 class LoginPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent)
 
         self.controller = controller
-        self.supabase = controller.supabase
 
         # Modern compact card
         self.configure(
@@ -28,6 +28,11 @@ class LoginPage(ctk.CTkFrame):
         self.email_entry.bind("<Return>", lambda e: self.password_entry.focus())
         self.password_entry.bind("<Return>", lambda e: self.login_user())
 
+    @property
+    def supabase(self):
+        # Resolved lazily: the client may still be loading while this page is built
+        return self.controller.supabase
+
     def create_ui(self):
         # Title (shortened to fit modern card)
         ctk.CTkLabel(
@@ -38,12 +43,13 @@ class LoginPage(ctk.CTkFrame):
         ).pack(pady=(25, 4))
 
         # Subtitle
-        ctk.CTkLabel(
+        self.subtitle_label = ctk.CTkLabel(
             self,
             text="Sign in to continue",
             font=FONTS["label_font"],
             text_color=COLORS["subtext"]
-        ).pack(pady=(0, 20))
+        )
+        self.subtitle_label.pack(pady=(0, 20))
 
         # Email entry
         self.email_entry = ctk.CTkEntry(
@@ -69,17 +75,18 @@ class LoginPage(ctk.CTkFrame):
         self.password_entry.pack(pady=8)
 
         # Login button
-        styled_button(
+        self.login_button = styled_button(
             self,
             text="Login",
             command=self.login_user,
             color=COLORS["button"],
             hover_color=COLORS["button_hover"],
             width=260
-        ).pack(pady=(18, 12))
+        )
+        self.login_button.pack(pady=(18, 12))
 
         # Forgot password link (compact modern style)
-        ctk.CTkButton(
+        self.forgot_button = ctk.CTkButton(
             self,
             text="Forgot password?",
             width=100,
@@ -88,36 +95,57 @@ class LoginPage(ctk.CTkFrame):
             text_color=COLORS["accent"],
             hover_color=COLORS["button_hover"],
             command=self.forgot_password
-        ).pack(pady=0)
+        )
+        self.forgot_button.pack(pady=0)
+
+    def on_connectivity_change(self, online):
+        if online:
+            self.subtitle_label.configure(text="Sign in to continue", text_color=COLORS["subtext"])
+        else:
+            self.subtitle_label.configure(text="Offline mode", text_color=COLORS["danger"])
 
+    @traced_action("login")
     def login_user(self):
+        # Enter in the password field bypasses the disabled button
+        if is_busy(self.login_button):
+            return
         email = self.email_entry.get().strip()
         password = self.password_entry.get().strip()
 
-        if not email or not password:
-            show_error("Missing Information", "Please enter both email and password.")
-            return
+        with span("validate", VALIDATE):
+            if not email or not password:
+                show_error("Missing Information", "Please enter both email and password.")
+                return
 
-        try:
-            res = self.supabase.auth.sign_in_with_password({
+        set_busy(self.login_button, True, "Signing in...")
+        self.controller.worker.submit(
+            lambda: self.supabase.auth.sign_in_with_password({
                 "email": email,
                 "password": password
-            })
-            user = getattr(res, "user", None)
-
-            if user:
-                self.controller.current_user = user
-                self.controller.current_user_email = user.email
-                show_info("Login Successful", "Welcome to FloodTwin!")
-                go_to_main_menu(controller=self.controller)
-            else:
-                show_error("Login Failed", "Invalid email or password.")
-
-        except Exception as e:
-            if email == "zarraga@offline.com" and password == "admin0":
-                go_to_main_menu(controller=self.controller)
-            else:
-                show_error("Login Error", str(e))
+            }),
+            on_success=self._on_login_result,
+            on_error=lambda e: self._on_login_error(e, email, password),
+            on_done=lambda: set_busy(self.login_button, False),
+            key="login",
+            share=request_key("auth.sign_in_with_password", email, password)
+        )
+
+    def _on_login_result(self, res):
+        user = getattr(res, "user", None)
+
+        if user:
+            # Saved for the next launch, and refreshed in the background until logout
+            self.controller.remember_session(res.session, user)
+            show_info("Login Successful", "Welcome to FloodTwin!")
+            go_to_main_menu(controller=self.controller)
+        else:
+            show_error("Login Failed", "Invalid email or password.")
+
+    def _on_login_error(self, e, email, password):
+        if email == "zarraga@offline.com" and password == "admin0":
+            go_to_main_menu(controller=self.controller)
+        else:
+            show_error("Login Error", str(e))
 
     def forgot_password(self):
         email = self.email_entry.get().strip()
@@ -125,13 +153,16 @@ class LoginPage(ctk.CTkFrame):
             show_error("Missing Email", "Please enter your email.")
             return
 
-        try:
-            redirect = "https://zarraga-reset-password-vercel.vercel.app/"
-            self.supabase.auth.reset_password_for_email(
+        redirect = "https://zarraga-reset-password-vercel.vercel.app/"
+        set_busy(self.forgot_button, True, "Sending...")
+        self.controller.worker.submit(
+            lambda: self.supabase.auth.reset_password_for_email(
                 email,
                 options={"redirect_to": redirect}
-            )
-            show_info("Password Reset", "A reset link has been sent to your email.")
-
-        except Exception as e:
-            show_error("Error", str(e))
+            ),
+            on_success=lambda _: show_info("Password Reset", "A reset link has been sent to your email."),
+            on_error=lambda e: show_error("Error", str(e)),
+            on_done=lambda: set_busy(self.forgot_button, False),
+            key="forgot_password",
+            idempotency_key=("auth.reset_password_for_email", email)
+        )
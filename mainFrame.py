@@ -1,6 +1,20 @@
 # minframe.py
 import customtkinter as ctk
-from supabase_init import init_supabase
+from supabase_init import init_supabase_async
+from utils.data_worker import DataWorker
+from utils.connectivity import CircuitBreaker, ConnectivityMonitor, is_network_error
+from utils.account_cache import AccountCache
+from utils.search_index import AccountSearchIndex
+from utils.account_store import AccountStore
+from utils.write_journal import WriteJournal, ReplayInterrupted
+from utils.dialogs import ask_confirm, show_info
+from utils.startup_profiler import PROFILER
+from utils.asset_bundle import load_asset, display_size, pick_scale
+from utils.ui_styles import init_styles
+from utils.stall_watchdog import StallWatchdog
+from utils.backend_metrics import flush_metrics
+from utils.session_store import SessionStore, SessionRefresher, session_to_dict
+from utils import tracing
 from PIL import Image
 
 from mainMenu import MainMenuPage
@@ -18,6 +32,18 @@ import os
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
 
+# First replay of account changes saved offline in an earlier session
+JOURNAL_REPLAY_DELAY_MS = 3000
+
+# Idle pre-building of pages after the login screen is visible
+PREWARM_START_DELAY_MS = 300
+PREWARM_STEP_DELAY_MS = 50
+
+# Navigation history depth (back stack)
+NAV_HISTORY_LIMIT = 50
+# Showing one of these pages starts a fresh history (no "back" across login/logout)
+NAV_HISTORY_ROOTS = ("LoginPage",)
+
 
 # ---------------------------------------------------------
 # Resource Path Helper (unchanged)
@@ -35,16 +61,82 @@ def resource_path(relative_path: str) -> str:
 # ---------------------------------------------------------
 class MainFrame(ctk.CTk):
     def __init__(self):
-        super().__init__()
-
         # -------------------------------------------------
-        # Initialize Supabase
+        # Initialize Supabase (in the background, resolved on first use)
         # -------------------------------------------------
-        self.supabase = init_supabase()
+        PROFILER.step("start supabase init")
+        self.supabase_future = init_supabase_async()
+
+        PROFILER.step("tk root")
+        super().__init__()
+        # Shared fonts are created once, now that the root exists
+        init_styles()
+        # Logs mainloop stalls with the Tk thread's stack; it starts watching on
+        # the mainloop's first idle tick, so building the window is not a stall
+        self.watchdog = StallWatchdog(
+            self, page_name=lambda: getattr(getattr(self, "current_page_class", None), "__name__", None)
+        )
+        self.watchdog.start()
+
+        PROFILER.step("data services")
+
+        # Background worker for all blocking data access; backend calls fail
+        # fast through the circuit breaker while the backend is unreachable
+        self.online = True
+        self.breaker = CircuitBreaker()
+        self.worker = DataWorker(self, breaker=self.breaker)
+        self.connectivity = ConnectivityMonitor(
+            self._test_connection,
+            self.breaker,
+            on_change=lambda online: self.worker.call_soon(self._on_connectivity_change, online)
+        )
+        self.connectivity.start()
+
+        # Session saved by the last launch, read on the worker while the window
+        # is being built; the first page is chosen once it arrives
+        self.session_store = SessionStore()
+        self.worker.submit(
+            self.session_store.load,
+            on_success=self._show_first_page,
+            on_error=lambda e: self._show_first_page(None),
+            key="session.load",
+            backend=False
+        )
+
+        # Keeps the signed-in session's access token fresh and saved
+        self.current_user = None
+        self.current_user_email = None
+        self.session_restore_pending = None
+        self.session_refresher = SessionRefresher(
+            lambda: self.supabase,
+            self.session_store,
+            on_expired=lambda: self.worker.call_soon(self._on_session_expired)
+        )
+
+        # Local copy of the mobile-app user list (instant, offline-readable)
+        self.account_cache = AccountCache()
+        self.account_index = AccountSearchIndex()
+        # Every account write goes through the store, which patches subscribed views
+        self.account_store = AccountStore(self.account_cache, self.account_index, self.worker.call_soon)
+        # Type-ahead works on the cached list right away, not only after the first sync
+        self.worker.submit(
+            self.account_store.load_index,
+            on_error=lambda e: print("[DEBUG] Account index not loaded:", e),
+            key="accounts.index",
+            backend=False
+        )
+
+        # Account changes made while offline, replayed when the connection returns
+        self.write_journal = WriteJournal(
+            on_change=lambda pending, conflicts: self.worker.call_soon(self._on_pending_changes, pending, conflicts)
+        )
+        self.pending_counts = self.write_journal.counts()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # -------------------------------------------------
         # Window configuration
         # -------------------------------------------------
+        PROFILER.step("window configuration")
         self.title("Zarraga Flood Monitoring Main Menu")
         window_width, window_height = 900, 550
 
@@ -57,17 +149,17 @@ class MainFrame(ctk.CTk):
 
         # -------------------------------------------------
         # Background Image (darkened)
+        # Pre-rendered at the window size for the current display scaling
+        # (see utils/asset_bundle.py and tools/build_assets.py)
         # -------------------------------------------------
-        img_path = resource_path("assets/jalaur.png")
-        original_img = Image.open(img_path).resize((window_width, window_height))
-
-        dark_overlay = Image.new("RGBA", original_img.size, (0, 0, 0, 150))
-        dark_img = Image.alpha_composite(original_img.convert("RGBA"), dark_overlay)
+        PROFILER.step("background image")
+        asset_scale = pick_scale(ctk.ScalingTracker.get_widget_scaling(self))
+        dark_img = load_asset("background", asset_scale)
 
         self.bg_image = ctk.CTkImage(
             light_image=dark_img,
             dark_image=dark_img,
-            size=(window_width, window_height)
+            size=display_size("background")
         )
 
         bg_label = ctk.CTkLabel(self, image=self.bg_image, text="")
@@ -76,11 +168,10 @@ class MainFrame(ctk.CTk):
         # -------------------------------------------------
         # RIGHT-SIDE FIXED IMAGE PANEL  (NEW)
         # -------------------------------------------------
-        right_img_path = resource_path("assets/wide-logo.png")
-
+        PROFILER.step("right panel image")
         self.right_side_image = ctk.CTkImage(
-            light_image=Image.open(right_img_path),
-            size=(300, 300)     # <--- adjustable
+            light_image=load_asset("right_panel", asset_scale),
+            size=display_size("right_panel")     # <--- adjustable in ASSET_SPECS
         )
 
         self.right_panel = ctk.CTkLabel(
@@ -100,6 +191,7 @@ class MainFrame(ctk.CTk):
         # -------------------------------------------------
         # CENTER/LEFT PAGE CONTAINER (for all pages)
         # -------------------------------------------------
+        PROFILER.step("page container and registry")
         self.container = ctk.CTkFrame(self, fg_color="transparent")
         self.container.place(relx=0.5, rely=0.5, anchor="center")
 
@@ -107,31 +199,49 @@ class MainFrame(ctk.CTk):
         self.container.grid_columnconfigure(0, weight=1)
 
         # -------------------------------------------------
-        # Page Registration
+        # Page Registration (factories, built on first use)
         # -------------------------------------------------
         self.pages = {
-            MainMenuPage: MainMenuPage(self.container, self, account_page_class=AccountManagerPage),
-            AccountManagerPage: AccountManagerPage(self.container, self),
-            CreateAccountsPage: CreateAccountsPage(self.container, self),
-            EditAccountsPage: EditAccountsPage(self.container, self),
-            SystemSettingsPage: SystemSettingsPage(
+            MainMenuPage: lambda: MainMenuPage(self.container, self, account_page_class=AccountManagerPage),
+            AccountManagerPage: lambda: AccountManagerPage(self.container, self),
+            CreateAccountsPage: lambda: CreateAccountsPage(self.container, self),
+            EditAccountsPage: lambda: EditAccountsPage(self.container, self),
+            SystemSettingsPage: lambda: SystemSettingsPage(
                 self.container,
                 self,
                 admin_create_account_page=AdminCreateAccountPage,
                 admin_configure_account_page=adminConfigureAccountsPage
             ),
-            AdminCreateAccountPage: AdminCreateAccountPage(self.container, self),
-            adminConfigureAccountsPage: adminConfigureAccountsPage(self.container, self),
-            LoginPage: LoginPage(self.container, self),
+            AdminCreateAccountPage: lambda: AdminCreateAccountPage(self.container, self),
+            adminConfigureAccountsPage: lambda: adminConfigureAccountsPage(self.container, self),
+            LoginPage: lambda: LoginPage(self.container, self),
         }
-
-        # Hide all pages initially
-        for page in self.pages.values():
-            page.grid(row=0, column=0, sticky="nsew")
-            page.grid_remove()
-
-        # Default page
-        self.after(0, lambda: self.show_page(LoginPage))
+        self.page_instances = {}
+
+        # Back/forward navigation (page classes)
+        self.current_page_class = None
+        self.back_stack = []
+        self.forward_stack = []
+        self.bind_all("<Alt-Left>", lambda e: self.go_back())
+        self.bind_all("<Alt-Right>", lambda e: self.go_forward())
+
+        # Pages most likely to be opened after login, pre-built while idle
+        self.prewarm_queue = [
+            MainMenuPage,
+            AccountManagerPage,
+            CreateAccountsPage,
+            EditAccountsPage,
+            SystemSettingsPage,
+            AdminCreateAccountPage,
+            adminConfigureAccountsPage,
+        ]
+
+        PROFILER.step(None)
+
+        # Warm up the other pages once the first one (shown when the saved session is read) is drawn
+        self.after(0, lambda: PROFILER.mark("mainloop_started"))
+        self.after(PREWARM_START_DELAY_MS, self._schedule_prewarm)
+        self.after(JOURNAL_REPLAY_DELAY_MS, self.replay_journal)
 
 
     # ---------------------------------------------------------
@@ -147,35 +257,267 @@ class MainFrame(ctk.CTk):
 
 
     # ---------------------------------------------------------
-    # Connection Test (unchanged)
+    # Supabase client (created off the critical path)
+    # ---------------------------------------------------------
+    @property
+    def supabase(self):
+        """
+        The Supabase client. Blocks until background creation has finished,
+        so only touch it from worker threads while start-up is in progress.
+        """
+        return self.supabase_future.result()
+
+
+    # ---------------------------------------------------------
+    # Shutdown
+    # ---------------------------------------------------------
+    def on_close(self):
+        self._notify_pages("on_app_close")
+        self.watchdog.stop()
+        self.connectivity.stop()
+        self.session_refresher.shutdown()
+        self.worker.shutdown()
+        flush_metrics()
+        self.destroy()
+
+
+    # ---------------------------------------------------------
+    # Connection Test (used by the background connectivity monitor)
     # ---------------------------------------------------------
     def _test_connection(self) -> bool:
         try:
             self.supabase.table("user").select("user_name").limit(1).execute()
             return True
-        except Exception:
-            return False
+        except Exception as e:
+            # An API-level error still means the server answered
+            return not is_network_error(e)
+
+    def _on_connectivity_change(self, online):
+        """Tell every built page that the backend became (un)reachable."""
+        self.online = online
+        self._notify_pages("on_connectivity_change", online)
+        if online:
+            if self.session_restore_pending:
+                self._restore_session(self.session_restore_pending)
+            self.replay_journal()
+
+    def _notify_pages(self, hook, *args):
+        """Call hook(*args) on every built page that defines it."""
+        for page in self.page_instances.values():
+            if hasattr(page, hook):
+                getattr(page, hook)(*args)
+
+    # ---------------------------------------------------------
+    # Offline write journal
+    # ---------------------------------------------------------
+    def _on_pending_changes(self, pending, conflicts):
+        self.pending_counts = (pending, conflicts)
+        self._notify_pages("on_pending_changes", pending, conflicts)
+
+    def replay_journal(self):
+        """Push account changes saved while offline to the server, in batches."""
+        if self.pending_counts[0] == 0:
+            return
+        self.worker.submit(
+            lambda: self.write_journal.replay(self.supabase),
+            on_success=self._on_journal_replayed,
+            on_error=self._on_journal_replay_error,
+            key="journal.replay"
+        )
+
+    def _on_journal_replay_error(self, e):
+        print("[DEBUG] Journal replay failed:", e)
+        if isinstance(e, ReplayInterrupted):
+            # Keep what was applied before the connection dropped; the rest stays pending
+            e.result.interrupted = True
+            self._on_journal_replayed(e.result)
+
+    def _on_journal_replayed(self, result):
+        self.account_store.apply(result.inserted + result.updated)
+
+        if result.conflicts:
+            lines = "\n".join(f"- {name} ({op}): {reason}" for op, name, reason in result.conflicts)
+            if ask_confirm(
+                "Offline Changes Not Applied",
+                f"These account changes made while offline conflict with the server:\n\n{lines}\n\nDiscard them?"
+            ):
+                self.write_journal.discard_conflicts()
 
 
     # ---------------------------------------------------------
-    # show_page (your exact logic retained)
+    # Persisted session
     # ---------------------------------------------------------
-    def show_page(self, page_identifier):
-        # Resolve string to class if needed
-        if isinstance(page_identifier, str):
-            page_class = None
-            for cls in self.pages.keys():
-                if cls.__name__ == page_identifier:
-                    page_class = cls
-                    break
-            if not page_class:
-                print(f"Page '{page_identifier}' not found.")
-                return
+    def remember_session(self, session, user):
+        """Save a freshly signed-in session for the next launch and keep it refreshed."""
+        self.current_user = user
+        self.current_user_email = user.email
+        saved = session_to_dict(session)
+        self.worker.submit(
+            lambda: self.session_store.save(saved),
+            on_error=lambda e: print("[DEBUG] Could not save the session:", e),
+            key="session.save",
+            backend=False
+        )
+        self.session_refresher.start(saved)
+
+    def forget_session(self):
+        """Logout: stop refreshing and delete the saved session."""
+        self.current_user = None
+        self.current_user_email = None
+        self.session_restore_pending = None
+        self.session_refresher.stop()
+        self.worker.submit(
+            self.session_store.clear,
+            on_error=lambda e: print("[DEBUG] Could not delete the saved session:", e),
+            key="session.save",
+            backend=False
+        )
+
+    def _restore_session(self, saved):
+        """Hand the saved tokens to the client; refreshes them first if they expired."""
+        self.session_restore_pending = None
+        self.worker.submit(
+            lambda: self.supabase.auth.set_session(saved["access_token"], saved["refresh_token"]),
+            on_success=self._on_session_restored,
+            on_error=lambda e: self._on_session_restore_error(e, saved),
+            key="session.restore"
+        )
+
+    def _on_session_restored(self, res):
+        if self.current_user_email is None:
+            # Logged out while the request was running
+            return
+        self.current_user = res.user
+        self.current_user_email = res.user.email
+        fresh = session_to_dict(res.session)
+        self.worker.submit(lambda: self.session_store.save(fresh), key="session.save", backend=False)
+        self.session_refresher.start(fresh)
+
+    def _on_session_restore_error(self, e, saved):
+        if self.current_user_email is None:
+            return
+        if is_network_error(e):
+            # Stay signed in offline; hand the tokens over once the backend is back
+            print("[DEBUG] Session restore postponed (offline):", e)
+            self.session_restore_pending = saved
+            return
+        print("[DEBUG] Saved session rejected:", e)
+        self.session_refresher.stop()
+        self.worker.submit(self.session_store.clear, key="session.save", backend=False)
+        self._on_session_expired()
+
+    def _on_session_expired(self):
+        """The session can no longer be refreshed: back to the login screen."""
+        if self.current_user_email is None:
+            return
+        self.current_user = None
+        self.current_user_email = None
+        self.session_restore_pending = None
+        self.show_page(LoginPage)
+        show_info("Session Expired", "Your session has expired. Please log in again.")
+
+    def _show_first_page(self, saved):
+        """Worker callback with the session saved by the last launch (None: login screen)."""
+        if saved:
+            # Signed in last time: straight to the menu, the client catches up in the background
+            self.current_user_email = saved.get("email") or ""
+            with PROFILER.phase("show MainMenuPage"):
+                self.show_page(MainMenuPage)
+            self._restore_session(saved)
         else:
-            page_class = page_identifier
+            with PROFILER.phase("show LoginPage"):
+                self.show_page(LoginPage)
+        # Flush pending geometry/redraw so the first page is actually on screen
+        self.update_idletasks()
+        PROFILER.mark("first_paint")
+        PROFILER.finish()
+
+
+    # ---------------------------------------------------------
+    # Lazy page construction
+    # ---------------------------------------------------------
+    def get_page(self, page_class):
+        """
+        Return the page instance for page_class, building it on first use.
+        Returns None if the page is not registered.
+        """
+        page = self.page_instances.get(page_class)
+        if page is not None:
+            return page
+
+        factory = self.pages.get(page_class)
+        if factory is None:
+            return None
+
+        with PROFILER.phase(f"build {page_class.__name__}"):
+            page = factory()
+        page.grid(row=0, column=0, sticky="nsew")
+        page.grid_remove()
+        self.page_instances[page_class] = page
+        if not self.online and hasattr(page, "on_connectivity_change"):
+            page.on_connectivity_change(False)
+        if hasattr(page, "on_pending_changes"):
+            page.on_pending_changes(*self.pending_counts)
+        return page
+
+    def _schedule_prewarm(self):
+        """Queue the next pre-build for when Tk has nothing else to do."""
+        if self.prewarm_queue:
+            self.after_idle(self._prewarm_next)
+
+    def _prewarm_next(self):
+        """Build one queued page per idle slice so input stays responsive."""
+        while self.prewarm_queue:
+            page_class = self.prewarm_queue.pop(0)
+            if page_class not in self.page_instances:
+                try:
+                    self.get_page(page_class)
+                except Exception as e:
+                    print(f"[DEBUG] Prewarm of {page_class.__name__} failed:", e)
+                break
+
+        if self.prewarm_queue:
+            self.after(PREWARM_STEP_DELAY_MS, self._schedule_prewarm)
 
-        # Hide all
-        for page in self.pages.values():
+
+    # ---------------------------------------------------------
+    # show_page (your exact logic retained)
+    # ---------------------------------------------------------
+    def _resolve_page(self, page_identifier):
+        """Return the registered page class for a class or class name, or None."""
+        if not isinstance(page_identifier, str):
+            return page_identifier
+        for cls in self.pages.keys():
+            if cls.__name__ == page_identifier:
+                return cls
+        return None
+
+    def show_page(self, page_identifier, record_history=True):
+        """
+        Show a page and record it in the navigation history.
+        Parameters:
+        page_identifier (R): page class or class name
+        record_history (O): False when moving through the history itself (back/forward)
+        """
+        # Resolve string to class if needed
+        page_class = self._resolve_page(page_identifier)
+        if not page_class:
+            print(f"Page '{page_identifier}' not found.")
+            return
+
+        if page_class.__name__ in NAV_HISTORY_ROOTS or (
+            self.current_page_class is not None and self.current_page_class.__name__ in NAV_HISTORY_ROOTS
+        ):
+            self.back_stack.clear()
+            self.forward_stack.clear()
+        elif record_history and self.current_page_class not in (None, page_class):
+            self.back_stack.append(self.current_page_class)
+            del self.back_stack[:-NAV_HISTORY_LIMIT]
+            self.forward_stack.clear()
+        self.current_page_class = page_class
+
+        # Hide all built pages
+        for page in self.page_instances.values():
             page.grid_remove()
 
         # Adjust container alignment
@@ -184,10 +526,56 @@ class MainFrame(ctk.CTk):
         else:
             self.container.place(relx=0.5, rely=0.5, anchor="center")
 
-        # Show requested page
-        page = self.pages.get(page_class)
-        if page:
-            page.grid()
-            page.tkraise()
-        else:
-            print(f"Page {page_class.__name__} not found.")
+        # Show requested page (built on first request)
+        with tracing.span(f"show page: {page_class.__name__}", tracing.UI, built=page_class in self.page_instances):
+            page = self.get_page(page_class)
+            if page:
+                page.grid()
+                page.tkraise()
+                if hasattr(page, "on_show"):
+                    page.on_show()
+            else:
+                print(f"Page {page_class.__name__} not found.")
+        tracing.settle(self)
+
+
+    # ---------------------------------------------------------
+    # Navigation history and prefetch
+    # ---------------------------------------------------------
+    def can_go_back(self):
+        return bool(self.back_stack)
+
+    def can_go_forward(self):
+        return bool(self.forward_stack)
+
+    def go_back(self):
+        """Show the previous page. Returns False if there is no history."""
+        if not self.back_stack:
+            return False
+        self.forward_stack.append(self.current_page_class)
+        self.show_page(self.back_stack.pop(), record_history=False)
+        return True
+
+    def go_forward(self):
+        """Re-show the page left with go_back(). Returns False if there is none."""
+        if not self.forward_stack:
+            return False
+        self.back_stack.append(self.current_page_class)
+        self.show_page(self.forward_stack.pop(), record_history=False)
+        return True
+
+    def prefetch_page(self, page_identifier):
+        """
+        Build a page (if needed) and let it start loading its data in the
+        background, e.g. while the pointer is over the button that opens it.
+        """
+        page_class = self._resolve_page(page_identifier)
+        if page_class is None or page_class is self.current_page_class:
+            return
+        try:
+            page = self.get_page(page_class)
+        except Exception as e:
+            print(f"[DEBUG] Prefetch of {page_class.__name__} failed:", e)
+            return
+        if page is not None and hasattr(page, "prefetch"):
+            page.prefetch()
@@ -1,27 +1,25 @@
 # File: mainMenu.py
 import customtkinter as ctk
-import subprocess
 import sys
 import os
-import threading
 import time
-from PIL import Image, ImageTk
 
-from utils.dialogs import show_error, show_info
-from navigation import go_to_page
-from utils.ui_styles import COLORS, get_fonts, PADDING
+from utils.dialogs import show_error
+from navigation import go_to_page, bind_prefetch
+from utils.ui_styles import COLORS, FONTS, PADDING
+from utils.twin_supervisor import TwinSupervisor, STARTING, RUNNING
+from utils.asset_bundle import load_asset, display_size, pick_scale
+from utils import tracing
 from loginPage import LoginPage
 from system_pages.systemSettings import SystemSettingsPage
 
-FONTS = get_fonts()
 
-
-def resource_path(relative_path):
-    try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+# Refresh rate of the "Starting..." elapsed-time readout
+TWIN_STATUS_TICK_MS = 200
+# Relaunch the twin automatically if it crashes (set ZARRAGA_TWIN_RESTART_ON_CRASH=1)
+TWIN_RESTART_ON_CRASH = os.getenv("ZARRAGA_TWIN_RESTART_ON_CRASH") == "1"
+# Machine-wide CPU share above which the usage readout turns red
+TWIN_CPU_WARN_PERCENT = 85
 
 
 class MainMenuPage(ctk.CTkFrame):
@@ -29,7 +27,9 @@ class MainMenuPage(ctk.CTkFrame):
         super().__init__(parent)
         self.controller = controller
         self.account_page_class = account_page_class
-        self.digital_twin_process = None
+        self.twin_supervisor = None
+        self._twin_tick_id = None
+        self._twin_trace = (None, 0.0)
 
         self.configure(
             width=300,
@@ -42,13 +42,9 @@ class MainMenuPage(ctk.CTkFrame):
         # =========================================
         # TOP LOGO
         # =========================================
-        logo_path = resource_path("assets/icon-logo.png")
-        print("[DEBUG] Logo path:", logo_path)
-
         try:
-            logo_image = Image.open(logo_path)
-            logo_image = logo_image.resize((120, 120))
-            self.logo_photo = ImageTk.PhotoImage(logo_image)
+            logo_image = load_asset("menu_logo", pick_scale(ctk.ScalingTracker.get_widget_scaling(self)))
+            self.logo_photo = ctk.CTkImage(light_image=logo_image, size=display_size("menu_logo"))
 
             ctk.CTkLabel(self, image=self.logo_photo, text="").pack(pady=(40, 20))
 
@@ -83,6 +79,26 @@ class MainMenuPage(ctk.CTkFrame):
             text_color="#043E71"
         ).pack(pady=(0, 10))
 
+        # Launch progress / readiness
+        self.twin_status = ctk.CTkLabel(
+            self,
+            text="",
+            font=FONTS["water_level"],
+            text_color=COLORS["subtext"]
+        )
+        self.twin_status.pack(pady=(0, 4))
+        self.twin_progress = ctk.CTkProgressBar(self, width=200, progress_color=COLORS["button"])
+        self.twin_progress.set(0)
+
+        # Live CPU / memory / runtime of the running twin
+        self.twin_usage = ctk.CTkLabel(
+            self,
+            text="",
+            font=("Arial", 12),
+            text_color=COLORS["subtext"]
+        )
+        self.twin_usage.pack(pady=(0, 4))
+
         # =========================================
         # BOTTOM ICON BUTTONS
         # =========================================
@@ -99,7 +115,7 @@ class MainMenuPage(ctk.CTkFrame):
         btn_size = 40
 
         # Account button
-        ctk.CTkButton(
+        account_button = ctk.CTkButton(
             button_frame,
             text="👤",
             width=btn_size,
@@ -109,7 +125,9 @@ class MainMenuPage(ctk.CTkFrame):
             corner_radius=8,
             font=("Arial", 22),
             command=lambda: go_to_page(self.controller, self.account_page_class)
-        ).pack(pady=(8, 4), padx=10)
+        )
+        account_button.pack(pady=(8, 4), padx=10)
+        bind_prefetch(account_button, self.controller, self.account_page_class)
 
         # Logout button
         ctk.CTkButton(
@@ -128,73 +146,127 @@ class MainMenuPage(ctk.CTkFrame):
     # LOGOUT
     # =========================================
     def logout(self):
-        try:
-            self.controller.supabase.auth.sign_out()
-        except Exception as e:
-            show_error("Logout Failed", str(e))
-            return
+        self.controller.worker.submit(
+            lambda: self.controller.supabase.auth.sign_out(),
+            on_success=lambda _: self._on_logged_out(),
+            on_error=lambda e: show_error("Logout Failed", str(e)),
+            key="logout"
+        )
+
+    def _on_logged_out(self):
+        self.controller.forget_session()
         go_to_page(self.controller, LoginPage)
 
     # =========================================
     # DIGITAL TWIN
     # =========================================
-    def open_digital_twin(self):
+    def on_app_close(self):
+        """The launcher is exiting: the twin must not outlive it."""
+        if self.twin_supervisor is not None:
+            self.twin_supervisor.stop()
+
+    def _digital_twin_command(self):
+        """Return (argv, path) for the twin; ZARRAGA_DIGITAL_TWIN overrides the bundled exe."""
         base_path = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
-        exe_path = os.path.join(base_path, "ZarragaFloodMonitoringAndSimulation", "Zarraga Flood Simulation.exe")
+        exe_path = os.getenv("ZARRAGA_DIGITAL_TWIN") or os.path.join(
+            base_path, "ZarragaFloodMonitoringAndSimulation", "Zarraga Flood Simulation.exe"
+        )
+        # The twin runs with its own folder as cwd, so a relative override must not be reused as is
+        exe_path = os.path.abspath(exe_path)
+        if exe_path.endswith(".py"):
+            return [sys.executable, exe_path], exe_path
+        return [exe_path], exe_path
 
-        if self.digital_twin_process and self.digital_twin_process.poll() is None:
-            show_error("Notice", "Digital Twin is already running.")
-            return
+    @tracing.traced_action("open_digital_twin")
+    def open_digital_twin(self):
+        command, exe_path = self._digital_twin_command()
 
-        if not os.path.exists(exe_path):
-            show_error("Error", f"Digital Twin executable not found:\n{exe_path}")
-            return
+        with tracing.span("validate", tracing.VALIDATE):
+            # Also covers the back-off before an automatic restart, when no process is alive
+            if self.twin_supervisor and self.twin_supervisor.is_active():
+                show_error("Notice", "Digital Twin is already running.")
+                return
 
-        appdata = os.getenv("APPDATA") or os.path.expanduser("~")
-        auth_dir = os.path.join(appdata, "ZarragaFloodMonitoring")
-        os.makedirs(auth_dir, exist_ok=True)
-        auth_file = os.path.join(auth_dir, "session_auth.txt")
-        ready_file = os.path.join(auth_dir, "ready.txt")
+            if not os.path.exists(exe_path):
+                show_error("Error", f"Digital Twin executable not found:\n{exe_path}")
+                return
 
+        post = self.controller.worker.call_soon
+        supervisor = TwinSupervisor(
+            command,
+            cwd=os.path.dirname(exe_path),
+            on_event=lambda kind, snapshot: post(self._on_twin_event, supervisor, kind, snapshot),
+            restart_on_crash=TWIN_RESTART_ON_CRASH
+        )
         try:
-            with open(auth_file, "w", encoding="utf-8") as f:
-                f.write("AUTHORIZED")
+            with tracing.span("launch twin process", tracing.WORKER):
+                supervisor.start()
         except Exception as e:
-            show_error("Error", f"Unable to create auth token:\n{e}")
+            show_error("Error", f"Failed to open Digital Twin:\n{e}")
             return
 
-        try:
-            creationflags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
-            self.digital_twin_process = subprocess.Popen(
-                [exe_path],
-                shell=False,
-                creationflags=creationflags,
-                cwd=os.path.dirname(exe_path)
-            )
-            show_info("Launching", "Digital Twin is starting...")
-        except Exception as e:
-            for f in [auth_file, ready_file]:
-                if os.path.exists(f):
-                    os.remove(f)
-            show_error("Error", f"Failed to open Digital Twin:\n{e}")
+        # The ready event arrives much later on another thread; it closes a span in this trace
+        self._twin_trace = (tracing.capture(), time.perf_counter())
+        self.twin_supervisor = supervisor
+        self._show_twin_starting()
+
+    def _show_twin_starting(self):
+        self.twin_progress.set(0)
+        self.twin_progress.pack(pady=(0, 10), before=self.twin_usage)
+        self.twin_usage.configure(text="")
+        if self._twin_tick_id is None:
+            self._tick_twin_status()
+
+    def _tick_twin_status(self):
+        supervisor = self.twin_supervisor
+        if supervisor is None or supervisor.state != STARTING:
+            self._twin_tick_id = None
+            return
+        snapshot = supervisor.snapshot()
+        self.twin_status.configure(text=f"{snapshot['progress_text']} {snapshot['runtime_s']:.1f} s")
+        self._twin_tick_id = self.after(TWIN_STATUS_TICK_MS, self._tick_twin_status)
+
+    def _on_twin_event(self, supervisor, kind, snapshot):
+        if supervisor is not self.twin_supervisor:
             return
 
-        def wait_for_ready():
-            try:
-                timeout = 10
-                interval = 0.1
-                elapsed = 0
-                while elapsed < timeout:
-                    if os.path.exists(ready_file):
-                        break
-                    time.sleep(interval)
-                    elapsed += interval
-            finally:
-                for f in [auth_file, ready_file]:
-                    if os.path.exists(f):
-                        try:
-                            os.remove(f)
-                        except:
-                            pass
-
-        threading.Thread(target=wait_for_ready, daemon=True).start()
+        if kind == "progress":
+            percent = snapshot.get("percent")
+            if percent is not None:
+                self.twin_progress.set(max(0.0, min(percent / 100.0, 1.0)))
+        elif kind == "ready":
+            context, launched = self._twin_trace
+            tracing.record("twin start-up until ready", launched, tracing.WORKER, context)
+            self.twin_progress.pack_forget()
+            self.twin_status.configure(text=f"Ready in {snapshot['ready_after_s']:.1f} s")
+        elif kind == "sample":
+            if snapshot["state"] == RUNNING:
+                self._show_twin_usage(snapshot)
+        elif kind == "restarting":
+            self.twin_status.configure(text=f"Crashed, restarting ({snapshot['restarts'] + 1})...")
+        elif kind in ("exited", "crashed", "failed"):
+            self.twin_progress.pack_forget()
+            self.twin_usage.configure(text="")
+            if kind == "exited" and snapshot["ready_after_s"] is not None:
+                self.twin_status.configure(text="Digital Twin closed")
+            else:
+                self.twin_status.configure(text="Digital Twin stopped")
+                show_error("Digital Twin", "Digital Twin exited unexpectedly.")
+
+        if supervisor.state == STARTING and self._twin_tick_id is None:
+            self._show_twin_starting()
+
+    def _show_twin_usage(self, snapshot):
+        cpu = snapshot["cpu_percent"]
+        rss = snapshot["rss_bytes"]
+        runtime = int(snapshot["runtime_s"])
+        parts = [
+            f"CPU {cpu:.0f}%" if cpu is not None else "CPU --",
+            f"RAM {rss / (1024 ** 3):.2f} GB" if rss is not None else "RAM --",
+            f"Up {runtime // 3600:02d}:{runtime // 60 % 60:02d}:{runtime % 60:02d}",
+        ]
+        warn = cpu is not None and cpu >= TWIN_CPU_WARN_PERCENT
+        self.twin_usage.configure(
+            text="  ·  ".join(parts),
+            text_color=COLORS["danger"] if warn else COLORS["subtext"]
+        )
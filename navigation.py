@@ -15,7 +15,10 @@ def go_to_page(controller, page_class):
             # fall back to manual lookup
             pass
 
-    page = getattr(controller, "pages", {}).get(page_class)
+    if hasattr(controller, "get_page"):
+        page = controller.get_page(page_class)
+    else:
+        page = getattr(controller, "page_instances", {}).get(page_class)
     if page:
         page.tkraise()
     else:
@@ -23,33 +26,47 @@ def go_to_page(controller, page_class):
         print(f"Page {name} not found on controller.")
 
 
-def go_back(controller):
+def go_back(controller, fallback="MainMenuPage"):
+    """
+    Return to the previous page in the controller's navigation history.
+    Without history (or on a controller that doesn't track it) the fallback
+    page is shown instead, by name.
+    """
+    if hasattr(controller, "go_back") and controller.go_back():
+        return
+    _show_page_by_name(controller, fallback)
+
+
+def go_forward(controller):
+    """Re-open the page left with go_back(), if any."""
+    if hasattr(controller, "go_forward"):
+        controller.go_forward()
+
+
+def bind_prefetch(widget, controller, page_class):
     """
-    Go back to a sensible default page. The app currently doesn't track history,
-    so this will return to the main menu by name.
+    Start loading page_class (and its data) in the background when the
+    pointer enters or keyboard focus reaches widget, so the page opens
+    already populated.
     """
+    if not hasattr(controller, "prefetch_page"):
+        return
+    for sequence in ("<Enter>", "<FocusIn>"):
+        widget.bind(sequence, lambda e: controller.prefetch_page(page_class), add="+")
+
+
+def _show_page_by_name(controller, page_name):
     if hasattr(controller, "show_page_from_name"):
-        controller.show_page_from_name("MainMenuPage")
+        controller.show_page_from_name(page_name)
+    elif hasattr(controller, "show_page"):
+        controller.show_page(page_name)
     else:
-        # best-effort fallback
-        if hasattr(controller, "show_page"):
-            # attempt to import MainMenuPage lazily
-            try:
-                from mainMenu import MainMenuPage
-
-                controller.show_page(MainMenuPage)
-                return
-            except Exception:
-                pass
-        print("Cannot navigate back: controller lacks a show_page() API.")
+        print(f"Cannot open {page_name}: controller lacks a show_page() API.")
 
 
 def go_to_main_menu(controller):
     """Convenience wrapper to open the main menu."""
-    if hasattr(controller, "show_page_from_name"):
-        controller.show_page_from_name("MainMenuPage")
-    else:
-        go_back(controller)
+    _show_page_by_name(controller, "MainMenuPage")
 
 
 def go_to_manage_accounts(controller):
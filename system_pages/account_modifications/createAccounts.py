@@ -1,19 +1,27 @@
-import re
+import os
 import customtkinter as ctk
-from utils.dialogs import show_info, show_error, ask_confirm
-from utils.ui_styles import COLORS
+from tkinter import filedialog
+from utils.dialogs import show_info, show_warning, show_error, ask_confirm
+from utils.ui_styles import COLORS, FONTS, button_style
+from utils.data_worker import request_key, set_busy
+from utils.tracing import traced_action, span, VALIDATE
+from utils.connectivity import is_network_error
+from utils.validation import PIN_INPUT_PATTERN, is_valid_pin
+from utils.bulk_import import BulkAccountImporter
+from navigation import go_back
 
 class CreateAccountsPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+        self.importer = None
         self.configure(width=300, height=550, corner_radius=20, fg_color=COLORS["background"])
         self.pack_propagate(False)
         
         # Title
         ctk.CTkLabel(
             self, text="Create Account",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=FONTS["title"]
         ).pack(pady=20)
 
         # Username input
@@ -29,49 +37,213 @@ class CreateAccountsPage(ctk.CTkFrame):
         # Apply validation
         self._apply_pin_validation()
 
+        # Offline notice (shown while the backend is unreachable)
+        self.status_label = ctk.CTkLabel(self, text="", text_color=COLORS["danger"])
+        self.status_label.pack(pady=(0, 5))
+        self.pending_label = ctk.CTkLabel(self, text="", text_color=COLORS["subtext"])
+        self.pending_label.pack(pady=(0, 5))
+
         # Buttons
-        ctk.CTkButton(self, text="Create", command=self.create_account).pack(pady=5)
+        self.create_button = ctk.CTkButton(self, text="Create", command=self.create_account)
+        self.create_button.pack(pady=5)
+        self.bulk_button = ctk.CTkButton(
+            self, text="Bulk Import...",
+            **button_style("success", "small_button"),
+            command=self.bulk_import
+        )
+        self.bulk_button.pack(pady=5)
+
+        # Bulk import progress (hidden until an import starts)
+        self.import_progress = ctk.CTkProgressBar(self, width=250)
+        self.import_label = ctk.CTkLabel(self, text="", text_color=COLORS["subtext"])
+
         ctk.CTkButton(
             self, text="Back",
-            fg_color="#34495e", hover_color="#2c3e50",
-            command=lambda: controller.show_page("AccountManagerPage")
+            **button_style("back", "small_button"),
+            command=lambda: go_back(controller, fallback="AccountManagerPage")
         ).pack(pady=5)
 
+    def on_connectivity_change(self, online):
+        self.status_label.configure(text="" if online else "Offline - cannot reach the server")
+
+    def on_pending_changes(self, pending, conflicts):
+        self.pending_label.configure(text=pending_changes_text(pending, conflicts))
+
     def _apply_pin_validation(self):
         """Restrict PIN entry to digits only, maximum 4."""
         def validate_input(P):
-            return bool(re.match(r'^\d{0,4}$', P))
+            return bool(PIN_INPUT_PATTERN.match(P))
         vcmd = (self.register(validate_input), "%P")
         self.entry_pin.configure(validate="key", validatecommand=vcmd)
 
+    @traced_action("create_account")
     def create_account(self):
         username = self.entry_username.get().strip()
         pin = self.entry_pin.get().strip()
 
         # Validation
-        if not username or not pin:
-            show_error("Missing Fields", "All fields are required.")
-            return
+        with span("validate", VALIDATE):
+            if not username or not pin:
+                show_error("Missing Fields", "All fields are required.")
+                return
 
-        if not pin.isdigit() or len(pin) != 4:
-            show_error("Invalid PIN", "PIN must be exactly 4 digits long.")
-            return
+            if not is_valid_pin(pin):
+                show_error("Invalid PIN", "PIN must be exactly 4 digits long.")
+                return
 
         # Confirmation before saving
         if not ask_confirm("Confirm", f"Create account for '{username}' with this PIN?"):
             return
 
-        try:
-            response = self.controller.supabase.table("user").insert({
+        set_busy(self.create_button, True, "Creating...")
+        self.controller.worker.submit(
+            lambda: self.controller.supabase.table("user").insert({
                 "user_name": username,
                 "pin": pin
-            }).execute()
-
-            if response.data:
-                show_info("Success", f"Account '{username}' created successfully.")
-                self.entry_username.delete(0, "end")
-                self.entry_pin.delete(0, "end")
-            else:
-                show_error("Failed", "Account could not be created.")
-        except Exception as e:
-            show_error("Database Error", "Unable to connect to the internet")
+            }).execute(),
+            on_success=lambda response: self._on_account_created(response, username),
+            on_error=lambda e: self._on_create_error(e, username, pin),
+            on_done=lambda: set_busy(self.create_button, False),
+            idempotency_key=request_key("user.insert", username, pin)
+        )
+
+    def _on_account_created(self, response, username):
+        if response.data:
+            self.controller.account_store.apply(response.data)
+            show_info("Success", f"Account '{username}' created successfully.")
+            self.entry_username.delete(0, "end")
+            self.entry_pin.delete(0, "end")
+        else:
+            show_error("Failed", "Account could not be created.")
+
+    def _on_create_error(self, e, username, pin):
+        if not is_network_error(e):
+            show_error("Database Error", "Account could not be created.")
+            return
+
+        # Offline: keep the account in the journal and create it when the connection returns
+        self.controller.write_journal.enqueue_insert("user", {"user_name": username, "pin": pin})
+        show_info(
+            "Saved Offline",
+            f"No connection. Account '{username}' was saved and will be created automatically when the connection returns."
+        )
+        self.entry_username.delete(0, "end")
+        self.entry_pin.delete(0, "end")
+
+    # -----------------------------
+    # Bulk import
+    # -----------------------------
+    def bulk_import(self):
+        """Pick a CSV/XLSX file and import it, or cancel the import that is running."""
+        if self.importer is not None:
+            self.importer.cancel()
+            set_busy(self.bulk_button, True, "Cancelling...")
+            return
+
+        path = filedialog.askopenfilename(
+            title="Import Accounts",
+            filetypes=[("Spreadsheets", "*.csv *.xlsx"), ("CSV files", "*.csv"), ("Excel workbooks", "*.xlsx")]
+        )
+        if not path:
+            return
+        try:
+            importer = BulkAccountImporter(
+                path,
+                on_progress=lambda fraction, result: self.controller.worker.call_soon(
+                    self._show_import_progress, fraction, result.inserted, result.errors
+                ),
+                on_batch=self._on_import_batch
+            )
+        except ValueError as e:
+            show_error("Import Failed", str(e))
+            return
+
+        # Hashing the file to look up a previous checkpoint reads it once; keep that off the Tk thread
+        set_busy(self.bulk_button, True, "Reading file...")
+        self.controller.worker.submit(
+            importer.load_checkpoint,
+            on_success=lambda checkpoint: self._start_import(importer, checkpoint),
+            on_error=self._on_import_error,
+            backend=False
+        )
+
+    def _start_import(self, importer, checkpoint):
+        set_busy(self.bulk_button, False)
+        file_name = os.path.basename(importer.path)
+        if checkpoint:
+            resume = ask_confirm(
+                "Resume Import",
+                f"'{file_name}' was partly imported before ({checkpoint['inserted']} accounts created, "
+                f"stopped after row {checkpoint['rows_done']}).\n\nResume from where it stopped?"
+            )
+        else:
+            resume = False
+            if not ask_confirm("Confirm", f"Create accounts for every row in '{file_name}'?"):
+                return
+
+        self.importer = importer
+        self.bulk_button.configure(text="Cancel Import")
+        self.create_button.configure(state="disabled")
+        self.import_progress.set(0)
+        self.import_progress.pack(pady=(10, 0))
+        self.import_label.configure(text="Starting import...")
+        self.import_label.pack(pady=(0, 5))
+
+        self.controller.worker.submit(
+            lambda: importer.run(self.controller.supabase, resume=resume),
+            on_success=self._on_import_finished,
+            on_error=self._on_import_error,
+            on_done=self._end_import,
+            backend=False
+        )
+
+    def _on_import_batch(self, rows):
+        # Worker thread: the store is thread-safe and hands the change to its views on the Tk thread
+        self.controller.account_store.apply(rows)
+
+    def _show_import_progress(self, fraction, inserted, errors):
+        if self.importer is None:
+            return
+        self.import_progress.set(fraction)
+        self.import_label.configure(text=f"{fraction:.0%}  -  {inserted:,} created, {errors:,} rejected")
+
+    def _on_import_finished(self, result):
+        summary = f"{result.inserted:,} accounts created, {result.errors:,} rows rejected."
+        if result.errors:
+            summary += f"\n\nRejected rows are listed in:\n{result.report_path}"
+
+        if result.finished:
+            show_info("Import Complete", summary)
+        elif result.interrupted:
+            show_warning(
+                "Connection Lost",
+                f"The import stopped because the server could not be reached.\n\n{summary}\n\n"
+                "Import the same file again to resume."
+            )
+        else:
+            show_info("Import Paused", f"{summary}\n\nImport the same file again to resume.")
+
+    def _on_import_error(self, e):
+        set_busy(self.bulk_button, False)
+        if isinstance(e, (ValueError, OSError)):
+            show_error("Import Failed", str(e))
+        else:
+            show_error("Import Failed", f"The import stopped unexpectedly: {e}")
+
+    def _end_import(self):
+        self.importer = None
+        set_busy(self.bulk_button, False)
+        self.bulk_button.configure(text="Bulk Import...")
+        self.create_button.configure(state="normal")
+        self.import_progress.pack_forget()
+        self.import_label.pack_forget()
+
+
+def pending_changes_text(pending, conflicts):
+    """Label text for the offline journal counter ('' when there is nothing to report)."""
+    parts = []
+    if pending:
+        parts.append(f"Pending offline changes: {pending}")
+    if conflicts:
+        parts.append(f"Conflicts: {conflicts}")
+    return "  |  ".join(parts)
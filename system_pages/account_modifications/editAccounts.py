@@ -1,125 +1,427 @@
+import time
+import tkinter as tk
 import customtkinter as ctk
+from tkinter import filedialog
 from utils.dialogs import show_info, show_error, ask_confirm
-from utils.ui_styles import COLORS
+from utils.ui_styles import COLORS, FONTS, button_style
+from utils.data_worker import request_key, set_busy, is_busy
+from utils.virtual_list import VirtualList
+from utils.connectivity import is_network_error
+from utils.validation import is_valid_pin
+from utils.table_export import TableExporter
+from utils.tracing import traced_action, span, VALIDATE
+from system_pages.account_modifications.createAccounts import pending_changes_text
+from navigation import go_back
+
+# Rows fetched per request; more are loaded on demand
+PAGE_SIZE = 50
+ACCOUNT_LIST_COLUMNS = "id,user_name"
+# Fixed pixel height of one account card in the list
+ROW_HEIGHT = 104
+# Pause after the last keystroke before the type-ahead filter runs
+TYPEAHEAD_DELAY_MS = 150
+# Export menu entries: label -> (table, default file name prefix)
+EXPORT_CHOICES = {
+    "Mobile app users": ("user", "users"),
+    "Admin accounts": ("admin_accounts", "admin-accounts"),
+}
+
+
+def _escape_like(text):
+    """Escape LIKE wildcards so a search matches them literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 
 class EditAccountsPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
-        self.configure(width=800, height=500, corner_radius=0, fg_color="#f2f6fc")  # light background
+        self.configure(width=800, height=500, corner_radius=0, fg_color=COLORS["background"])
         self.pack_propagate(False)
 
         # Title
         ctk.CTkLabel(
             self, text="Manage Accounts",
-            font=ctk.CTkFont(size=24, weight="bold"),
-            text_color="#1f4e79"  # dark blue title
+            font=FONTS["title"],
+            text_color=COLORS["text"]
         ).pack(pady=10)
 
         # Main two-column layout
-        content_frame = ctk.CTkFrame(self, fg_color="#ffffff")  # white main area
+        content_frame = ctk.CTkFrame(self, fg_color=COLORS["surface"])
         content_frame.pack(fill="both", expand=True, padx=20, pady=10)
         content_frame.columnconfigure(0, weight=2)
         content_frame.columnconfigure(1, weight=1)
 
         # Left: account list with search bar
-        left_frame = ctk.CTkFrame(content_frame, fg_color="#e3edf8", corner_radius=10)  # light blue background
+        left_frame = ctk.CTkFrame(content_frame, fg_color=COLORS["secondary"], corner_radius=10)
         left_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 10))
 
-        header_frame = ctk.CTkFrame(left_frame, fg_color="#e3edf8")
+        header_frame = ctk.CTkFrame(left_frame, fg_color=COLORS["secondary"])
         header_frame.pack(fill="x", padx=10, pady=(10, 5))
 
         ctk.CTkLabel(
-            header_frame, text="Accounts", font=ctk.CTkFont(size=18, weight="bold"), text_color="#1f4e79"
+            header_frame, text="Accounts", font=FONTS["heading"], text_color=COLORS["text"]
         ).pack(side="left", pady=5)
 
         # Search bar
         self.search_entry = ctk.CTkEntry(header_frame, placeholder_text="Search by username", width=160)
         self.search_entry.pack(side="left", padx=10)
-        ctk.CTkButton(header_frame, text="Search", width=70, fg_color="#1f6fbf", hover_color="#155c99",
-                       command=self.search_accounts).pack(side="left")
+        self.search_button = ctk.CTkButton(header_frame, text="Search", width=70,
+                                           **button_style("primary", "small_button"), command=self.search_accounts)
+        self.search_button.pack(side="left")
+        self.export_button = ctk.CTkButton(header_frame, text="Export", width=70,
+                                           **button_style("success", "small_button"), command=self.export_accounts)
+        self.export_button.pack(side="left", padx=(10, 0))
+        self.export_menu = tk.Menu(self, tearoff=0)
+        for label, (table, file_prefix) in EXPORT_CHOICES.items():
+            self.export_menu.add_command(
+                label=f"{label} ({table})...",
+                command=lambda t=table, p=file_prefix: self.export_table(t, p)
+            )
+        self.exporter = None
+
+        # Offline notice (shown while the backend is unreachable)
+        self.status_label = ctk.CTkLabel(left_frame, text="", text_color=COLORS["danger"], height=16)
+        self.status_label.pack(fill="x", padx=10)
+        self.pending_label = ctk.CTkLabel(left_frame, text="", text_color=COLORS["subtext"], height=16)
+        self.pending_label.pack(fill="x", padx=10)
+        self.export_label = ctk.CTkLabel(left_frame, text="", text_color=COLORS["success"], height=16)
+        self.export_label.pack(fill="x", padx=10)
 
-        # Scrollable list area
-        self.scroll_frame = ctk.CTkScrollableFrame(left_frame, fg_color="#e3edf8")
-        self.scroll_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        # Type-ahead filters the local index; Enter/Search also asks the server
+        self._typeahead_id = None
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)
+        self.search_entry.bind("<Return>", lambda e: self.search_accounts())
+
+        # Virtualized list area (row widgets are recycled while scrolling)
+        self.account_list = VirtualList(
+            left_frame,
+            row_height=ROW_HEIGHT,
+            make_row=self._make_account_row,
+            bind_row=self._bind_account_row,
+            on_reach_end=self._on_list_end,
+            fg_color=COLORS["secondary"]
+        )
+        self.account_list.pack(fill="both", expand=True, padx=10, pady=5)
 
         # Right: edit form
-        edit_frame = ctk.CTkFrame(content_frame, fg_color="#ffffff", corner_radius=10, border_width=1, border_color="#cce0ff")
+        edit_frame = ctk.CTkFrame(content_frame, fg_color=COLORS["surface"], corner_radius=10, border_width=1, border_color=COLORS["divider"])
         edit_frame.grid(row=0, column=1, sticky="nsew", padx=(10, 0), pady=5)
         edit_frame.columnconfigure(0, weight=1)
         edit_frame.columnconfigure(1, weight=2)
 
-        ctk.CTkLabel(edit_frame, text="Edit Account", font=ctk.CTkFont(size=18, weight="bold"), text_color="#1f4e79").grid(
+        ctk.CTkLabel(edit_frame, text="Edit Account", font=FONTS["heading"], text_color=COLORS["text"]).grid(
             row=0, column=0, columnspan=2, pady=(15, 10)
         )
 
         # Form fields with spacing
-        ctk.CTkLabel(edit_frame, text="Account ID:", text_color="#1f4e79").grid(row=1, column=0, sticky="e", padx=10, pady=10)
-        self.entry_id = ctk.CTkEntry(edit_frame, width=180, state="disabled", justify="center", fg_color="#f0f4fb")
+        ctk.CTkLabel(edit_frame, text="Account ID:", text_color=COLORS["text"]).grid(row=1, column=0, sticky="e", padx=10, pady=10)
+        self.entry_id = ctk.CTkEntry(edit_frame, width=180, state="disabled", justify="center", fg_color=COLORS["input"])
         self.entry_id.grid(row=1, column=1, padx=10, pady=10, sticky="w")
 
-        ctk.CTkLabel(edit_frame, text="Username:", text_color="#1f4e79").grid(row=2, column=0, sticky="e", padx=10, pady=10)
-        self.entry_username = ctk.CTkEntry(edit_frame, width=180, justify="center", fg_color="#f0f4fb")
+        ctk.CTkLabel(edit_frame, text="Username:", text_color=COLORS["text"]).grid(row=2, column=0, sticky="e", padx=10, pady=10)
+        self.entry_username = ctk.CTkEntry(edit_frame, width=180, justify="center", fg_color=COLORS["input"])
         self.entry_username.grid(row=2, column=1, padx=10, pady=10, sticky="w")
 
-        ctk.CTkLabel(edit_frame, text="PIN (4 digits):", text_color="#1f4e79").grid(row=3, column=0, sticky="e", padx=10, pady=10)
-        self.entry_pin = ctk.CTkEntry(edit_frame, width=180, justify="center", fg_color="#f0f4fb")
+        ctk.CTkLabel(edit_frame, text="PIN (4 digits):", text_color=COLORS["text"]).grid(row=3, column=0, sticky="e", padx=10, pady=10)
+        self.entry_pin = ctk.CTkEntry(edit_frame, width=180, justify="center", fg_color=COLORS["input"])
         self.entry_pin.grid(row=3, column=1, padx=10, pady=10, sticky="w")
 
-        ctk.CTkButton(edit_frame, text="Update Account", width=200, fg_color="#1f6fbf", hover_color="#155c99",
-                       command=self.update_account).grid(row=4, column=0, columnspan=2, pady=20)
+        self.update_button = ctk.CTkButton(edit_frame, text="Update Account", width=200,
+                                           **button_style("primary", "small_button"), command=self.update_account)
+        self.update_button.grid(row=4, column=0, columnspan=2, pady=20)
 
         # Back button
         ctk.CTkButton(
             self, text="Back",
-            fg_color="#34495e", hover_color="#2c3e50",
-            command=lambda: self.controller.show_page("AccountManagerPage")
+            **button_style("back", "small_button"),
+            command=lambda: go_back(self.controller, fallback="AccountManagerPage")
         ).pack(pady=(0, 10))
 
         self.accounts = []
-        self.load_accounts()
+        self._positions = None
+        self.accounts_loaded = False
+        self.syncing = False
+        self.current_query = None
+        self.local_filter = False
+        self.has_more = False
+        self.loading = False
+
+        # Accounts created or edited anywhere are patched into the list as they change
+        controller.account_store.subscribe(self._on_accounts_patched)
+
+    def on_show(self):
+        """
+        Show the cached list at once, then sync it in the background on first
+        display, and again once the cache's TTL calls for a full resync.
+        """
+        if not self.accounts_loaded:
+            self.show_cached_accounts()
+            if not self.syncing:
+                self.sync_cache()
+        elif not self.syncing and self.controller.account_store.needs_full_sync():
+            self.sync_cache()
+
+    def prefetch(self):
+        """Start the first sync before the page is opened (e.g. on hover of its menu button)."""
+        if not self.accounts_loaded and not self.syncing:
+            self.sync_cache()
+
+    def on_connectivity_change(self, online):
+        if online:
+            self.status_label.configure(text="")
+            if self.accounts_loaded or self.accounts:
+                self.sync_cache()
+        else:
+            self.status_label.configure(text="Offline - showing cached accounts")
+
+    def on_pending_changes(self, pending, conflicts):
+        self.pending_label.configure(text=pending_changes_text(pending, conflicts))
 
     # -----------------------------
-    # Account Management Methods (unchanged)
+    # Account list rows
     # -----------------------------
-    def load_accounts(self, query=None):
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
-
-        try:
-            response = self.controller.supabase.table("user").select("*").execute()
-            if not response.data:
-                ctk.CTkLabel(self.scroll_frame, text="No accounts found.", text_color="gray").pack(pady=10)
-                return
+    def _make_account_row(self, parent):
+        # Every font passed explicitly: a CTk widget without one allocates its own
+        row = ctk.CTkFrame(parent, fg_color="transparent", corner_radius=0)
+        card = ctk.CTkFrame(row, fg_color=COLORS["card"], corner_radius=10)
+        card.pack(fill="both", expand=True, pady=6, padx=5)
+
+        row.id_label = ctk.CTkLabel(card, text="", anchor="w", font=FONTS["row_id"], text_color=COLORS["text"])
+        row.id_label.pack(anchor="w", padx=15, pady=(4, 0))
+        row.name_label = ctk.CTkLabel(card, text="", anchor="w", font=FONTS["row_name"], text_color=COLORS["text"])
+        row.name_label.pack(anchor="w", padx=15, pady=(0, 4))
+
+        row.account = None
+        ctk.CTkButton(
+            card, text="Edit Account",
+            width=120, height=30,
+            **button_style("primary", "small_button"),
+            command=lambda: self.load_account_for_edit(row.account) if row.account else None
+        ).pack(anchor="center", pady=(0, 5))
+        return row
+
+    def _bind_account_row(self, row, account):
+        row.account = account
+        row.id_label.configure(text=f"ID: {account['id']}")
+        row.name_label.configure(text=f"Username: {account['user_name']}")
+
+    def _account_positions(self):
+        """id -> index into self.accounts, rebuilt only after the list is replaced."""
+        if self._positions is None:
+            self._positions = {account["id"]: i for i, account in enumerate(self.accounts)}
+        return self._positions
+
+    def _on_accounts_patched(self, records):
+        """
+        Store subscriber: rebind only the rows showing changed accounts, and
+        add new accounts that belong in the current view.
+        """
+        if not self.accounts_loaded:
+            # Not rendered yet; the first render reads the store
+            return
 
-            self.accounts = [
-                acc for acc in response.data
-                if not query or query.lower() in acc["user_name"].lower()
-            ]
+        positions = self._account_positions()
+        added = []
+        for record in records:
+            index = positions.get(record["id"])
+            if index is not None:
+                self.accounts[index] = record
+                self.account_list.refresh_item(index)
+            elif self._belongs_in_view(record):
+                added.append(record)
+        if not added:
+            return
+
+        if self.local_filter:
+            # Type-ahead results are ranked; re-rank locally
+            self.accounts = self.controller.account_store.search(self.current_query)
+        else:
+            # Server and cached lists are ordered by id; new ids mostly land at the end
+            self.accounts.extend(added)
+            self.accounts.sort(key=lambda account: account["id"])
+        self._positions = None
+        self.account_list.set_items(self.accounts, keep_position=True)
+
+    def _belongs_in_view(self, record):
+        if self.current_query and self.current_query.lower() not in record["user_name"].lower():
+            return False
+        # Rows past the last loaded page arrive with that page
+        if self.has_more and self.accounts and record["id"] > self.accounts[-1]["id"]:
+            return False
+        return True
+
+    def _on_list_end(self):
+        """Infinite scroll: fetch the next page when the list nears its end."""
+        if self.has_more and not self.loading:
+            self.load_accounts(append=True)
+
+    # -----------------------------
+    # Local cache
+    # -----------------------------
+    def show_cached_accounts(self, keep_position=True):
+        """Render the unfiltered list straight from the on-disk cache."""
+        self.current_query = None
+        self.local_filter = False
+        self.has_more = False
+        self.accounts = self.controller.account_store.all()
+        self._positions = None
+        if self.accounts:
+            self.account_list.set_items(self.accounts, keep_position=keep_position)
+        else:
+            self.account_list.show_message("Loading accounts...")
+
+    def sync_cache(self):
+        """Sync the cache (new rows, or everything when a full resync is due), then re-render if still unfiltered."""
+        self.syncing = True
+        self.controller.worker.submit(
+            lambda: self.controller.account_store.sync(self.controller.supabase),
+            on_success=lambda fetched: self._on_cache_synced(),
+            on_error=lambda e: self._on_cache_sync_error(e),
+            on_done=self._on_sync_done,
+            key="accounts.sync",
+            share="accounts.sync"
+        )
+
+    def _on_sync_done(self):
+        self.syncing = False
 
+    def _on_cache_synced(self):
+        self.accounts_loaded = True
+        if self.current_query is None:
+            self.show_cached_accounts()
             if not self.accounts:
-                ctk.CTkLabel(self.scroll_frame, text="No matching accounts.", text_color="gray").pack(pady=10)
-                return
+                self.account_list.show_message("No accounts found.")
+
+    def _on_cache_sync_error(self, e):
+        # Cached rows stay readable while offline; only complain if there is nothing to show
+        print("[DEBUG] Account cache sync failed:", e)
+        if self.current_query is None and not self.accounts:
+            self.account_list.show_message("Accounts unavailable.")
+            # A failed prefetch stays quiet; on_show retries and reports it
+            if self.winfo_ismapped():
+                show_error("Database Error", "Unable to connect to the internet")
+
+    # -----------------------------
+    # Type-ahead search
+    # -----------------------------
+    def _on_search_key(self, event):
+        if event.keysym == "Return":
+            return
+        if self._typeahead_id is not None:
+            self.after_cancel(self._typeahead_id)
+        self._typeahead_id = self.after(TYPEAHEAD_DELAY_MS, self.filter_accounts)
+
+    def filter_accounts(self):
+        """Filter the list from the in-memory index without a network round trip."""
+        self._typeahead_id = None
+        query = self.search_entry.get().strip()
+        if not query:
+            if self.current_query is not None:
+                self.show_cached_accounts(keep_position=False)
+            return
+
+        # A pending server search would overwrite these results
+        self.controller.worker.cancel("accounts.load")
+        self._on_load_done()
+        self.current_query = query
+        self.local_filter = True
+        self.has_more = False
+        self.accounts = self.controller.account_store.search(query)
+        self._positions = None
+        if self.accounts:
+            self.account_list.set_items(self.accounts, keep_position=False)
+        else:
+            self.account_list.show_message("No matching accounts.")
 
-            for account in self.accounts:
-                card = ctk.CTkFrame(self.scroll_frame, fg_color="#d9e4f5", corner_radius=10)
-                card.pack(fill="x", pady=6, padx=5, ipady=10)
+    # -----------------------------
+    # Account Management Methods
+    # -----------------------------
+    def load_accounts(self, query=None, append=False):
+        """
+        Fetch accounts (id and username only) from the server.
+        Parameters:
+        query (O): case-insensitive username filter, applied server-side
+        append (O): True to fetch the next page after the rows already shown
+        """
+        if append:
+            # Keyset paging: rows patched into or out of the list cannot shift the next page
+            query = self.current_query
+            after_id = self.accounts[-1]["id"] if self.accounts else None
+        else:
+            self.current_query = query
+            self.local_filter = False
+            after_id = None
+            self.account_list.show_message("Loading accounts...")
+        limit = PAGE_SIZE
+
+        self.loading = True
+        set_busy(self.search_button, True, "...")
+        self.controller.worker.submit(
+            lambda: self._fetch_page(query, after_id, limit),
+            on_success=lambda response: self._on_accounts_loaded(response, append, limit),
+            on_error=lambda e: self._on_accounts_error(query),
+            on_done=self._on_load_done,
+            key="accounts.load",
+            share=("user.page", query, after_id, limit)
+        )
+
+    def _fetch_page(self, query, after_id, limit):
+        """Worker thread: one projected, filtered select of the limit rows after after_id."""
+        request = self.controller.supabase.table("user").select(ACCOUNT_LIST_COLUMNS)
+        if query:
+            request = request.ilike("user_name", f"%{_escape_like(query)}%")
+        if after_id is not None:
+            request = request.gt("id", after_id)
+        return request.order("id").limit(limit).execute()
+
+    def _on_load_done(self):
+        self.loading = False
+        set_busy(self.search_button, False)
+
+    def _on_accounts_error(self, query):
+        # Offline: fall back to searching the local cache
+        cached = self.controller.account_store.search_cached(query)
+        if cached:
+            self.accounts = cached
+            self._positions = None
+            self.has_more = False
+            self.account_list.set_items(self.accounts, keep_position=True)
+            return
+        if not self.accounts:
+            self.account_list.show_message("Accounts unavailable.")
+        show_error("Database Error", "Unable to connect to the internet")
+
+    def _on_accounts_loaded(self, response, append, limit):
+        self.accounts_loaded = True
+        rows = response.data or []
+        self.has_more = len(rows) == limit
+        self.controller.account_store.apply(rows, notify=False)
+
+        if append:
+            self.accounts.extend(rows)
+        else:
+            self.accounts = rows
+        self._positions = None
 
-                ctk.CTkLabel(card, text=f"ID: {account['id']}", anchor="w", font=ctk.CTkFont(size=14), text_color="#1f4e79").pack(anchor="w", padx=15, pady=(0, 2))
-                ctk.CTkLabel(card, text=f"Username: {account['user_name']}", anchor="w", font=ctk.CTkFont(size=16, weight="bold"), text_color="#1f4e79").pack(anchor="w", padx=15, pady=(0, 10))
+        if not self.accounts:
+            self.account_list.show_message("No matching accounts." if self.current_query else "No accounts found.")
+            return
 
-                ctk.CTkButton(
-                    card, text="Edit Account",
-                    width=120, height=30,
-                    fg_color="#1f6fbf", hover_color="#155c99",
-                    command=lambda acc=account: self.load_account_for_edit(acc)
-                ).pack(anchor="center", pady=(0, 5))
-        except Exception as e:
-            show_error("Database Error", "Unable to connect to the internet")
+        # A plain new search starts at the top; appends keep the scroll position
+        self.account_list.set_items(self.accounts, keep_position=append)
 
+    @traced_action("search_accounts")
     def search_accounts(self):
+        if self._typeahead_id is not None:
+            self.after_cancel(self._typeahead_id)
+            self._typeahead_id = None
         query = self.search_entry.get().strip()
-        self.load_accounts(query=query)
+        if query:
+            self.load_accounts(query=query)
+        else:
+            self.show_cached_accounts(keep_position=False)
+            self.sync_cache()
 
     def load_account_for_edit(self, account):
         self.entry_id.configure(state="normal")
@@ -130,33 +432,128 @@ class EditAccountsPage(ctk.CTkFrame):
         self.entry_username.delete(0, "end")
         self.entry_username.insert(0, account["user_name"])
 
+        # The PIN is not part of the list projection; fetch it for this row only
         self.entry_pin.delete(0, "end")
-        self.entry_pin.insert(0, account["pin"])
+        set_busy(self.update_button, True)
+        account_id = account["id"]
+        self.controller.worker.submit(
+            lambda: self.controller.supabase.table("user").select("pin").eq("id", account_id).limit(1).execute(),
+            on_success=self._on_pin_loaded,
+            on_error=lambda e: show_error("Database Error", "Unable to connect to the internet"),
+            on_done=lambda: set_busy(self.update_button, False),
+            key="accounts.pin",
+            share=("user.pin", account_id)
+        )
 
+    def _on_pin_loaded(self, response):
+        self.entry_pin.delete(0, "end")
+        if response.data:
+            self.entry_pin.insert(0, response.data[0]["pin"])
+        else:
+            show_error("Not Found", "Account could not be found.")
+
+    @traced_action("update_account")
     def update_account(self):
+        if is_busy(self.update_button):
+            return
         account_id = self.entry_id.get().strip()
         username = self.entry_username.get().strip()
         pin = self.entry_pin.get().strip()
 
-        if not account_id or not username or not pin:
-            show_error("Missing Fields", "All fields are required.")
-            return
-        if not pin.isdigit() or len(pin) != 4:
-            show_error("Invalid PIN", "PIN must be exactly 4 digits.")
-            return
+        with span("validate", VALIDATE):
+            if not account_id or not username or not pin:
+                show_error("Missing Fields", "All fields are required.")
+                return
+            if not is_valid_pin(pin):
+                show_error("Invalid PIN", "PIN must be exactly 4 digits.")
+                return
         if not ask_confirm("Confirm Update", f"Update account '{username}' (ID: {account_id})?"):
             return
 
-        try:
-            response = self.controller.supabase.table("user").update({
+        set_busy(self.update_button, True, "Updating...")
+        self.controller.worker.submit(
+            lambda: self.controller.supabase.table("user").update({
                 "user_name": username,
                 "pin": pin
-            }).eq("id", account_id).execute()
-
-            if response.data:
-                show_info("Success", "Account updated successfully.")
-                self.load_accounts()
-            else:
-                show_error("Not Found", "Account could not be found or updated.")
-        except Exception as e:
-            show_error("Database Error", "Unable to connect to the internet")
+            }).eq("id", account_id).execute(),
+            on_success=self._on_account_updated,
+            on_error=lambda e: self._on_update_error(e, account_id, username, pin),
+            on_done=lambda: set_busy(self.update_button, False),
+            idempotency_key=request_key("user.update", account_id, username, pin)
+        )
+
+    def _on_account_updated(self, response):
+        if response.data:
+            # The store patches the one row showing this account
+            self.controller.account_store.apply(response.data)
+            show_info("Success", "Account updated successfully.")
+        else:
+            show_error("Not Found", "Account could not be found or updated.")
+
+    def _on_update_error(self, e, account_id, username, pin):
+        if not is_network_error(e):
+            show_error("Database Error", "Account could not be updated.")
+            return
+
+        # Offline: journal the change and show it locally until it is replayed
+        self.controller.write_journal.enqueue_update("user", account_id, {"user_name": username, "pin": pin})
+        local_row = {"id": int(account_id) if account_id.isdigit() else account_id, "user_name": username}
+        self.controller.account_store.apply([local_row])
+        show_info("Saved Offline", "No connection. The update was saved and will be applied when the connection returns.")
+
+    # -----------------------------
+    # Export
+    # -----------------------------
+    def export_accounts(self):
+        """Open the table menu, or cancel the export that is running."""
+        if self.exporter is not None:
+            self.exporter.cancel()
+            set_busy(self.export_button, True, "Stopping")
+            return
+        self.export_menu.tk_popup(
+            self.export_button.winfo_rootx(),
+            self.export_button.winfo_rooty() + self.export_button.winfo_height()
+        )
+
+    def export_table(self, table, file_prefix):
+        path = filedialog.asksaveasfilename(
+            title="Export Accounts",
+            initialfile=f"{file_prefix}-{time.strftime('%Y%m%d')}.csv",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("NDJSON files", "*.ndjson")]
+        )
+        if not path:
+            return
+
+        self.exporter = TableExporter(
+            table, path,
+            on_progress=lambda rows, rate: self.controller.worker.call_soon(self._show_export_progress, table, rows, rate)
+        )
+        self.export_button.configure(text="Cancel")
+        self.export_label.configure(text=f"Exporting {table}...")
+        exporter = self.exporter
+        self.controller.worker.submit(
+            lambda: exporter.run(self.controller.supabase),
+            on_success=self._on_export_finished,
+            on_error=lambda e: show_error("Export Failed", f"The export stopped: {e}"),
+            on_done=self._end_export
+        )
+
+    def _show_export_progress(self, table, rows, rate):
+        if self.exporter is not None:
+            self.export_label.configure(text=f"Exporting {table}: {rows:,} rows ({rate:,.0f} rows/s)")
+
+    def _on_export_finished(self, result):
+        if result.cancelled:
+            return
+        show_info(
+            "Export Complete",
+            f"{result.rows:,} rows from '{result.table}' written in {result.seconds:.1f}s "
+            f"({result.rows_per_second:,.0f} rows/s).\n\n{result.path}"
+        )
+
+    def _end_export(self):
+        self.exporter = None
+        set_busy(self.export_button, False)
+        self.export_button.configure(text="Export")
+        self.export_label.configure(text="")
@@ -2,17 +2,16 @@
 
 import customtkinter as ctk
 from utils.dialogs import show_info, show_error, ask_confirm
-from utils.ui_styles import COLORS, get_fonts
+from utils.ui_styles import COLORS, FONTS
+from utils.data_worker import request_key, set_busy
+from navigation import go_back
 import re
 
-FONTS = get_fonts()
-
 
 class adminConfigureAccountsPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
-        self.supabase = controller.supabase
         self.configure(fg_color=COLORS["background"])
 
         # === Title Section ===
@@ -67,10 +66,15 @@ class adminConfigureAccountsPage(ctk.CTkFrame):
             text="Back",
             fg_color=COLORS["button"],
             hover_color=COLORS["button_hover"],
-            command=lambda: controller.show_page("SystemSettingsPage"),
+            command=lambda: go_back(controller, fallback="SystemSettingsPage"),
             width=120,
         ).pack(side="left", padx=10)
 
+    @property
+    def supabase(self):
+        # Resolved lazily: the client may still be loading while this page is built
+        return self.controller.supabase
+
     # === Popup for password confirmation ===
     def show_confirm_password_popup(self):
         new_username = self.entry_new_username.get().strip()
@@ -103,14 +107,15 @@ class adminConfigureAccountsPage(ctk.CTkFrame):
         self.popup_pass_entry = ctk.CTkEntry(self.popup, width=250, show="•", placeholder_text="Current Password")
         self.popup_pass_entry.pack(pady=(0, 20))
 
-        ctk.CTkButton(
+        self.popup_confirm_button = ctk.CTkButton(
             self.popup,
             text="Confirm",
             fg_color=COLORS["accent"],
             hover_color=COLORS["button_hover"],
             command=lambda: self.update_account(new_username, new_pass),
             width=120
-        ).pack()
+        )
+        self.popup_confirm_button.pack()
 
     # === Apply updates ===
     def update_account(self, new_username, new_pass):
@@ -121,35 +126,48 @@ class adminConfigureAccountsPage(ctk.CTkFrame):
             show_error("Missing", "Current password required.")
             return
 
-        try:
-            auth = self.supabase.auth
-            session = auth.sign_in_with_password({
-                "email": current_email,
-                "password": current_pass,
-            })
-
-            if not session.user:
-                show_error("Authentication Failed", "Incorrect current password.")
-                return
-
-            update_data = {}
-            if new_username:
-                update_data["data"] = {"username": new_username}
-            if new_pass:
-                update_data["password"] = new_pass
-
-            if not update_data:
-                show_error("No Changes", "Nothing to update.")
-                return
-
-            auth.update_user(update_data)
-            self.popup.destroy()
-            show_info("Success", "Account updated successfully.")
-
-            # Clear inputs
-            self.entry_new_username.delete(0, "end")
-            self.entry_new_pass.delete(0, "end")
-            self.entry_confirm_pass.delete(0, "end")
-
-        except Exception as e:
-            show_error("Error", str(e))
+        update_data = {}
+        if new_username:
+            update_data["data"] = {"username": new_username}
+        if new_pass:
+            update_data["password"] = new_pass
+
+        if not update_data:
+            show_error("No Changes", "Nothing to update.")
+            return
+
+        set_busy(self.popup_confirm_button, True, "Updating...")
+        self.controller.worker.submit(
+            lambda: self._apply_update(current_email, current_pass, update_data),
+            on_success=self._on_account_updated,
+            on_error=lambda e: show_error("Error", str(e)),
+            on_done=lambda: set_busy(self.popup_confirm_button, False),
+            idempotency_key=request_key("auth.update_user", current_email, sorted(update_data.items()))
+        )
+
+    def _apply_update(self, current_email, current_pass, update_data):
+        """Worker thread: re-authenticate, then apply the update. Returns False on bad password."""
+        auth = self.supabase.auth
+        session = auth.sign_in_with_password({
+            "email": current_email,
+            "password": current_pass,
+        })
+
+        if not session.user:
+            return False
+
+        auth.update_user(update_data)
+        return True
+
+    def _on_account_updated(self, updated):
+        if not updated:
+            show_error("Authentication Failed", "Incorrect current password.")
+            return
+
+        self.popup.destroy()
+        show_info("Success", "Account updated successfully.")
+
+        # Clear inputs
+        self.entry_new_username.delete(0, "end")
+        self.entry_new_pass.delete(0, "end")
+        self.entry_confirm_pass.delete(0, "end")
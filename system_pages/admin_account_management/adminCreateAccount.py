@@ -2,6 +2,9 @@
 import re
 import customtkinter as ctk
 from utils.dialogs import show_info, show_error, ask_confirm
+from utils.data_worker import request_key, set_busy
+from utils.ui_styles import FONTS, button_style
+from navigation import go_back
 
 
 class AdminCreateAccountPage(ctk.CTkFrame):
@@ -13,7 +16,7 @@ class AdminCreateAccountPage(ctk.CTkFrame):
         # Title
         ctk.CTkLabel(
             self, text="Create Admin Account",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=FONTS["title"]
         ).pack(pady=20)
 
         # Username input
@@ -37,11 +40,12 @@ class AdminCreateAccountPage(ctk.CTkFrame):
         self.entry_confirm.pack(pady=(0, 20))
 
         # Buttons
-        ctk.CTkButton(self, text="Create", command=self.create_admin_account).pack(pady=5)
+        self.create_button = ctk.CTkButton(self, text="Create", command=self.create_admin_account)
+        self.create_button.pack(pady=5)
         ctk.CTkButton(
             self, text="Back",
-            fg_color="#34495e", hover_color="#2c3e50",
-            command=lambda: controller.show_page("SystemSettingsPage")
+            **button_style("back", "small_button"),
+            command=lambda: go_back(controller, fallback="SystemSettingsPage")
         ).pack(pady=5)
 
     def create_admin_account(self):
@@ -71,32 +75,43 @@ class AdminCreateAccountPage(ctk.CTkFrame):
         if not ask_confirm("Confirm", f"Create account for '{email}'?"):
             return
 
-        try:
-            # Create Auth user
-            result = self.controller.supabase.auth.sign_up({
-                "email": email,
-                "password": password,
-                "options": {"data": {"username": username}}
-            })
-
-            if result.user:
-                user_id = result.user.id
-                # Insert into public.admin_accounts
-                self.controller.supabase.table("admin_accounts").insert({
-                    "uuid": user_id,
-                    "username": username,
-                    "email": email
-                }).execute()
-
-                show_info("Success", f"Admin account '{email}' created successfully.")
-
-                # Clear inputs
-                self.entry_username.delete(0, "end")
-                self.entry_email.delete(0, "end")
-                self.entry_password.delete(0, "end")
-                self.entry_confirm.delete(0, "end")
-            else:
-                show_error("Failed", "Account could not be created.")
-
-        except Exception as e:
-            show_error("Error", str(e))
+        set_busy(self.create_button, True, "Creating...")
+        self.controller.worker.submit(
+            lambda: self._register_admin(username, email, password),
+            on_success=lambda created: self._on_admin_created(created, email),
+            on_error=lambda e: show_error("Error", str(e)),
+            on_done=lambda: set_busy(self.create_button, False),
+            idempotency_key=request_key("admin_accounts.insert", username, email, password)
+        )
+
+    def _register_admin(self, username, email, password):
+        """Worker thread: create the Auth user and its admin_accounts row."""
+        # Create Auth user
+        result = self.controller.supabase.auth.sign_up({
+            "email": email,
+            "password": password,
+            "options": {"data": {"username": username}}
+        })
+
+        if not result.user:
+            return False
+
+        # Insert into public.admin_accounts
+        self.controller.supabase.table("admin_accounts").insert({
+            "uuid": result.user.id,
+            "username": username,
+            "email": email
+        }).execute()
+        return True
+
+    def _on_admin_created(self, created, email):
+        if created:
+            show_info("Success", f"Admin account '{email}' created successfully.")
+
+            # Clear inputs
+            self.entry_username.delete(0, "end")
+            self.entry_email.delete(0, "end")
+            self.entry_password.delete(0, "end")
+            self.entry_confirm.delete(0, "end")
+        else:
+            show_error("Failed", "Account could not be created.")
@@ -1,8 +1,8 @@
 import customtkinter as ctk
 from system_pages.account_modifications.createAccounts import CreateAccountsPage
 from system_pages.account_modifications.editAccounts import EditAccountsPage
-from navigation import back_to_main
-from utils.ui_styles import COLORS
+from navigation import back_to_main, bind_prefetch
+from utils.ui_styles import COLORS, FONTS, button_style
 
 
 class AccountManagerPage(ctk.CTkFrame):
@@ -16,14 +16,14 @@ class AccountManagerPage(ctk.CTkFrame):
         # Title
         ctk.CTkLabel(
             self, text="Admin Account Management",
-            font=ctk.CTkFont(size=22, weight="bold")
+            font=FONTS["section_title"]
         ).pack(pady=(40, 10))
 
         # Subtitle
         ctk.CTkLabel(
             self,
             text="Create and manage user accounts for the mobile app.",
-            font=ctk.CTkFont(size=14),
+            font=FONTS["body"],
             text_color="#00bfff",
             wraplength=260,
             justify="center"
@@ -33,21 +33,25 @@ class AccountManagerPage(ctk.CTkFrame):
         ctk.CTkFrame(self, height=2, width=260, fg_color="#2f2f2f").pack(pady=(0, 25))
 
         # Buttons
-        ctk.CTkButton(
+        create_button = ctk.CTkButton(
             self, text="Create New Account", width=220, height=40,
-            font=ctk.CTkFont(size=14),
+            font=FONTS["button"],
             command=lambda: controller.show_page(CreateAccountsPage)
-        ).pack(pady=10)
+        )
+        create_button.pack(pady=10)
+        bind_prefetch(create_button, controller, CreateAccountsPage)
 
-        ctk.CTkButton(
+        edit_button = ctk.CTkButton(
             self, text="View / Edit Accounts", width=220, height=40,
-            font=ctk.CTkFont(size=14),
+            font=FONTS["button"],
             command=lambda: controller.show_page(EditAccountsPage)
-        ).pack(pady=10)
+        )
+        edit_button.pack(pady=10)
+        # Hovering starts the account list download, so the page opens populated
+        bind_prefetch(edit_button, controller, EditAccountsPage)
 
         ctk.CTkButton(
             self, text="Back to Main Menu", width=220, height=40,
-            font=ctk.CTkFont(size=14),
-            fg_color="#34495e", hover_color="#2c3e50",
+            **button_style("back"),
             command=lambda: back_to_main(self.controller)
         ).pack(pady=(30, 0))
@@ -1,10 +1,8 @@
 # File: systemSettings.py
 import customtkinter as ctk
 from utils.dialogs import show_info
-from utils.ui_styles import COLORS, get_fonts, PADDING
-from navigation import go_to_page, back_to_main
-
-FONTS = get_fonts()
+from utils.ui_styles import COLORS, FONTS, PADDING
+from navigation import go_to_page, back_to_main, bind_prefetch
 
 
 class SystemSettingsPage(ctk.CTkFrame):
@@ -44,19 +42,23 @@ class SystemSettingsPage(ctk.CTkFrame):
         # Buttons
         button_width, button_spacing = 250, 15
 
-        ctk.CTkButton(
+        add_button = ctk.CTkButton(
             self,
             text="Add Account",
             width=button_width,
             command=lambda: go_to_page(self.controller, self.AdminCreateAccountPage)
-        ).pack(pady=button_spacing)
+        )
+        add_button.pack(pady=button_spacing)
+        bind_prefetch(add_button, self.controller, self.AdminCreateAccountPage)
 
-        ctk.CTkButton(
+        configure_button = ctk.CTkButton(
             self,
             text="Configure Accounts",
             width=button_width,
             command=lambda: go_to_page(self.controller, self.AdminConfigureAccountPage)
-        ).pack(pady=button_spacing)
+        )
+        configure_button.pack(pady=button_spacing)
+        bind_prefetch(configure_button, self.controller, self.AdminConfigureAccountPage)
 
         ctk.CTkButton(
             self,
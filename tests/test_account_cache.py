@@ -0,0 +1,61 @@
+# File: tests/test_account_cache.py
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.account_cache import AccountCache
+from utils.account_store import AccountStore
+from utils.fake_supabase import FakeSupabase, make_users
+from utils.search_index import AccountSearchIndex
+
+
+class AccountCacheSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.client = FakeSupabase(tables={"user": make_users(30)})
+        self.cache = AccountCache(path=os.path.join(self.folder.name, "cache.db"))
+
+    def tearDown(self):
+        self.cache._db.close()
+        self.folder.cleanup()
+
+    def test_first_sync_is_full_then_delta_fetches_only_new_ids(self):
+        self.assertEqual(self.cache.sync(self.client), 30)
+        self.assertFalse(self.cache.is_stale())
+
+        self.client.table("user").insert({"id": 31, "user_name": "newcomer", "pin": "1234"}).execute()
+        self.assertEqual(self.cache.sync(self.client), 1)
+        self.assertEqual(self.cache.count(), 31)
+
+    def test_full_resync_drops_rows_deleted_on_the_server(self):
+        self.cache.sync(self.client)
+        self.client.table("user").delete().eq("id", 5).execute()
+        self.cache.ttl_seconds = -1
+
+        self.cache.sync(self.client)
+        self.assertNotIn(5, [row["id"] for row in self.cache.search()])
+
+    def test_local_edit_does_not_force_a_full_resync(self):
+        store = AccountStore(self.cache, AccountSearchIndex(), call_soon=lambda callback, *args: callback(*args))
+        store.sync(self.client)
+        patched = []
+        store.subscribe(patched.append)
+
+        response = self.client.table("user").update({"user_name": "renamed"}).eq("id", 7).execute()
+        requests_before = self.client.request_count
+        store.apply(response.data)
+        fetched = store.sync(self.client)
+
+        self.assertEqual(patched, [[{"id": 7, "user_name": "renamed"}]])
+        self.assertFalse(store.needs_full_sync())
+        self.assertEqual(fetched, 0)
+        # One delta request for ids above the watermark, not a paged download of the table
+        self.assertEqual(self.client.request_count - requests_before, 1)
+        self.assertEqual(store.search("renamed"), [{"id": 7, "user_name": "renamed"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
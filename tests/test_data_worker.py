@@ -0,0 +1,125 @@
+# File: tests/test_data_worker.py
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import data_worker
+from utils.data_worker import DataWorker, request_key
+
+
+class FakeRoot:
+    """Stands in for the Tk root: after() callbacks run when pump() is called."""
+
+    def __init__(self):
+        self._pending = {}
+        self._ids = 0
+
+    def after(self, ms, callback):
+        self._ids += 1
+        self._pending[self._ids] = callback
+        return self._ids
+
+    def after_cancel(self, after_id):
+        self._pending.pop(after_id, None)
+
+    def pump(self):
+        pending, self._pending = self._pending, {}
+        for callback in pending.values():
+            callback()
+
+
+class IdempotentMutationTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.worker = DataWorker(self.root, max_workers=2)
+        self.release = threading.Event()
+        self.calls = 0
+        self.successes = []
+        self.done = []
+
+    def tearDown(self):
+        self.release.set()
+        self.worker.shutdown()
+
+    def mutation(self):
+        self.calls += 1
+        self.release.wait(5)
+        return "saved"
+
+    def submit(self, key="save"):
+        return self.worker.submit(
+            self.mutation,
+            on_success=self.successes.append,
+            on_done=lambda: self.done.append(True),
+            key=key,
+            idempotency_key=("user.update", 1)
+        )
+
+    def pump_until(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, "timed out waiting for the worker")
+            self.root.pump()
+            time.sleep(0.01)
+
+    def test_double_submit_runs_once_and_delivers_once(self):
+        first = self.submit()
+        second = self.submit()
+        self.release.set()
+        self.pump_until(lambda: len(self.done) == 2)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.successes, ["saved"])
+
+    def test_repeat_after_success_is_dropped_without_a_second_success(self):
+        self.release.set()
+        self.submit()
+        self.pump_until(lambda: len(self.done) == 1)
+
+        self.submit(key="other")
+        self.pump_until(lambda: len(self.done) == 2)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.successes, ["saved"])
+
+    def test_repeat_while_in_flight_on_another_key_shares_the_result(self):
+        self.submit()
+        self.submit(key="other")
+        self.release.set()
+        self.pump_until(lambda: len(self.done) == 2)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.successes, ["saved", "saved"])
+
+    def test_repeat_after_window_runs_again(self):
+        self.release.set()
+        self.submit()
+        self.pump_until(lambda: len(self.done) == 1)
+
+        original = data_worker.IDEMPOTENCY_WINDOW_S
+        data_worker.IDEMPOTENCY_WINDOW_S = 0
+        try:
+            time.sleep(0.01)
+            self.submit()
+            self.pump_until(lambda: len(self.done) == 2)
+        finally:
+            data_worker.IDEMPOTENCY_WINDOW_S = original
+        self.assertEqual(self.calls, 2)
+
+
+class RequestKeyTest(unittest.TestCase):
+    def test_values_are_digested_not_kept(self):
+        key = request_key("user.update", 7, "alice", "4821")
+        self.assertEqual(key[0], "user.update")
+        self.assertNotIn("4821", repr(key))
+        self.assertEqual(key, request_key("user.update", 7, "alice", "4821"))
+        self.assertNotEqual(key, request_key("user.update", 7, "alice", "4822"))
+
+
+if __name__ == "__main__":
+    unittest.main()
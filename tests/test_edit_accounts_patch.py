@@ -0,0 +1,75 @@
+# File: tests/test_edit_accounts_patch.py
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.account_cache import AccountCache
+from utils.account_store import AccountStore
+from utils.fake_supabase import FakeSupabase, make_users
+from utils.search_index import AccountSearchIndex
+
+
+class CountingList:
+    """Records how the page redraws its virtual list."""
+
+    def __init__(self):
+        self.refreshed = []
+        self.set_items_calls = 0
+
+    def refresh_item(self, index):
+        self.refreshed.append(index)
+
+    def set_items(self, items, keep_position=False):
+        self.set_items_calls += 1
+
+
+@unittest.skipUnless(importlib.util.find_spec("customtkinter"), "customtkinter is not installed")
+class SingleUpdatePatchTest(unittest.TestCase):
+    def setUp(self):
+        from system_pages.account_modifications import editAccounts
+
+        self.module = editAccounts
+        self.folder = tempfile.TemporaryDirectory()
+        self.client = FakeSupabase(tables={"user": make_users(20)})
+        cache = AccountCache(path=os.path.join(self.folder.name, "cache.db"))
+        self.store = AccountStore(cache, AccountSearchIndex(), call_soon=lambda callback, *args: callback(*args))
+        self.store.sync(self.client)
+
+        # The page's state without building its widgets
+        page = editAccounts.EditAccountsPage.__new__(editAccounts.EditAccountsPage)
+        page.controller = SimpleNamespace(account_store=self.store, supabase=self.client)
+        page.accounts = self.store.all()
+        page.accounts_loaded = True
+        page._positions = None
+        page.local_filter = False
+        page.current_query = None
+        page.has_more = False
+        page.syncing = False
+        page.account_list = CountingList()
+        self.store.subscribe(page._on_accounts_patched)
+        self.page = page
+
+    def tearDown(self):
+        self.store.cache._db.close()
+        self.folder.cleanup()
+
+    def test_one_edit_is_one_request_and_one_rebound_row(self):
+        requests_before = self.client.request_count
+        response = self.client.table("user").update({"user_name": "renamed", "pin": "4321"}).eq("id", 4).execute()
+        with mock.patch.object(self.module, "show_info"):
+            self.page._on_account_updated(response)
+
+        self.assertEqual(self.client.request_count - requests_before, 1)
+        self.assertEqual(self.page.account_list.refreshed, [3])
+        self.assertEqual(self.page.account_list.set_items_calls, 0)
+        self.assertEqual(self.page.accounts[3], {"id": 4, "user_name": "renamed"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+# File: tests/test_search_index.py
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.account_cache import AccountCache
+from utils.account_store import AccountStore
+from utils.search_index import AccountSearchIndex
+
+RECORDS = [
+    {"id": 1, "user_name": "annie"},
+    {"id": 2, "user_name": "ann"},
+    {"id": 3, "user_name": "joanne"},
+    {"id": 4, "user_name": "mary-ann"},
+    {"id": 5, "user_name": "anna"},
+    {"id": 12, "user_name": "pierre"},
+]
+
+
+def names(records):
+    return [record["user_name"] for record in records]
+
+
+class AccountSearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = AccountSearchIndex()
+        self.index.rebuild(RECORDS)
+
+    def test_ranking_exact_prefix_word_substring(self):
+        self.assertEqual(names(self.index.search("ann")), ["ann", "anna", "annie", "mary-ann", "joanne"])
+
+    def test_short_queries_match_substrings_like_the_server(self):
+        self.assertEqual(names(self.index.search("ie")), ["pierre", "annie"])
+        self.assertEqual(names(self.index.search("y")), ["mary-ann"])
+
+    def test_digit_queries_also_match_id_prefixes(self):
+        self.assertEqual([record["id"] for record in self.index.search("1")], [1, 12])
+
+    def test_edits_are_reindexed(self):
+        self.index.add({"id": 12, "user_name": "peter"})
+        self.assertEqual(names(self.index.search("ie")), ["annie"])
+        self.assertEqual(names(self.index.search("pete")), ["peter"])
+
+
+class IndexFromCacheTest(unittest.TestCase):
+    def test_index_is_filled_from_the_cache_before_any_sync(self):
+        with tempfile.TemporaryDirectory() as folder:
+            cache = AccountCache(path=os.path.join(folder, "cache.db"))
+            cache.upsert(RECORDS)
+            store = AccountStore(cache, AccountSearchIndex(), call_soon=lambda callback, *args: callback(*args))
+            store.load_index()
+            self.assertEqual(names(store.search("pier")), ["pierre"])
+            cache._db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
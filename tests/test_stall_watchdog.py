@@ -0,0 +1,68 @@
+# File: tests/test_stall_watchdog.py
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.stall_watchdog import StallWatchdog
+
+
+class FakeRoot:
+    """Stands in for the Tk root: after()/after_idle() callbacks run when pump() is called."""
+
+    def __init__(self):
+        self._pending = {}
+        self._ids = 0
+
+    def after(self, ms, callback):
+        self._ids += 1
+        self._pending[self._ids] = callback
+        return self._ids
+
+    def after_idle(self, callback):
+        return self.after(0, callback)
+
+    def after_cancel(self, after_id):
+        self._pending.pop(after_id, None)
+
+    def pump(self):
+        pending, self._pending = self._pending, {}
+        for callback in pending.values():
+            callback()
+
+
+class StartupTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.root = FakeRoot()
+        self.watchdog = StallWatchdog(self.root, threshold_ms=20, log_path=os.path.join(self.folder.name, "stalls.log"))
+
+    def tearDown(self):
+        self.watchdog.stop()
+        if self.watchdog._thread is not None:
+            self.watchdog._thread.join(1)
+        self.folder.cleanup()
+
+    def test_time_before_the_mainloop_runs_is_not_a_stall(self):
+        self.watchdog.start()
+        # Window construction still running: no idle tick yet
+        time.sleep(0.3)
+        self.assertIsNone(self.watchdog._thread)
+        self.assertEqual(self.watchdog.stall_count, 0)
+
+        self.root.pump()
+        self.assertIsNotNone(self.watchdog._thread)
+        self.assertEqual(self.watchdog.stall_count, 0)
+
+    def test_a_blocked_loop_after_startup_is_a_stall(self):
+        self.watchdog.start()
+        self.root.pump()
+        time.sleep(0.3)
+        self.assertEqual(self.watchdog.stall_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
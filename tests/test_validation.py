@@ -0,0 +1,30 @@
+# File: tests/test_validation.py
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.bulk_import import _validate
+from utils.validation import is_valid_pin
+
+
+class PinValidationTest(unittest.TestCase):
+    def test_four_digits(self):
+        self.assertTrue(is_valid_pin("0123"))
+        self.assertFalse(is_valid_pin("123"))
+        self.assertFalse(is_valid_pin("12345"))
+        self.assertFalse(is_valid_pin("12a4"))
+
+    def test_non_ascii_digits_are_rejected(self):
+        self.assertFalse(is_valid_pin("١٢٣٤"))
+        self.assertFalse(is_valid_pin("12²4"))
+
+    def test_non_string_input_is_invalid_not_an_error(self):
+        for pin in (None, 1234, 12.34, b"1234"):
+            self.assertFalse(is_valid_pin(pin))
+        self.assertEqual(_validate("alice", None), "PIN must be exactly 4 digits")
+
+
+if __name__ == "__main__":
+    unittest.main()
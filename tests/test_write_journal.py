@@ -0,0 +1,89 @@
+# File: tests/test_write_journal.py
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fake_supabase import FakeOutage, FakeSupabase, make_users
+from utils.write_journal import ReplayInterrupted, WriteJournal
+
+
+class WriteJournalReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.client = FakeSupabase(tables={"user": make_users(10)})
+        self.journal = WriteJournal(path=os.path.join(self.folder.name, "journal.db"))
+
+    def tearDown(self):
+        self.journal._db.close()
+        self.folder.cleanup()
+
+    def user_names(self):
+        return {row["user_name"] for row in self.client.table("user").select("user_name").execute().data}
+
+    def test_inserts_and_updates_are_applied(self):
+        self.journal.enqueue_insert("user", {"user_name": "offline1", "pin": "1111"})
+        self.journal.enqueue_update("user", 3, {"user_name": "renamed", "pin": "3333"})
+
+        result = self.journal.replay(self.client)
+
+        self.assertEqual([row["user_name"] for row in result.inserted], ["offline1"])
+        self.assertEqual([row["user_name"] for row in result.updated], ["renamed"])
+        self.assertEqual(self.journal.counts(), (0, 0))
+
+    def test_taken_username_is_a_conflict(self):
+        self.journal.enqueue_insert("user", {"user_name": "user000002", "pin": "1111"})
+
+        result = self.journal.replay(self.client)
+
+        self.assertEqual(result.conflicts, [("insert", "user000002", "username already taken")])
+        self.assertEqual(self.journal.counts(), (0, 1))
+
+    def test_rejected_row_does_not_block_the_rest(self):
+        self.journal.enqueue_insert("user", {"user_name": "before", "pin": "1111"})
+        # Passes the username check but violates the primary key on the server
+        self.journal.enqueue_insert("user", {"id": 4, "user_name": "poison", "pin": "2222"})
+        self.journal.enqueue_insert("user", {"user_name": "after", "pin": "3333"})
+
+        result = self.journal.replay(self.client)
+
+        self.assertEqual({row["user_name"] for row in result.inserted}, {"before", "after"})
+        self.assertEqual(len(result.conflicts), 1)
+        self.assertTrue(result.conflicts[0][2].startswith("rejected by the server"))
+        self.assertEqual(self.journal.counts(), (0, 1))
+
+        # The next replay has nothing left to retry
+        self.journal.enqueue_insert("user", {"user_name": "later", "pin": "4444"})
+        self.assertEqual([row["user_name"] for row in self.journal.replay(self.client).inserted], ["later"])
+
+    def test_insert_committed_before_the_connection_dropped_is_not_a_conflict(self):
+        self.journal.enqueue_insert("user", {"user_name": "offline1", "pin": "1111"})
+        original_finish = self.journal._finish
+
+        def drop_connection(seqs):
+            raise FakeOutage("connection lost after the insert was committed")
+        self.journal._finish = drop_connection
+        with self.assertRaises(ReplayInterrupted):
+            self.journal.replay(self.client)
+        self.journal._finish = original_finish
+        self.assertIn("offline1", self.user_names())
+        self.assertEqual(self.journal.counts(), (1, 0))
+
+        result = self.journal.replay(self.client)
+
+        self.assertEqual(result.conflicts, [])
+        self.assertEqual([row["user_name"] for row in result.inserted], ["offline1"])
+        self.assertEqual(self.journal.counts(), (0, 0))
+
+    def test_same_username_with_other_values_is_still_a_conflict(self):
+        self.journal.enqueue_insert("user", {"user_name": "user000002", "pin": "9999"})
+
+        result = self.journal.replay(self.client)
+
+        self.assertEqual([reason for _, _, reason in result.conflicts], ["username already taken"])
+
+
+if __name__ == "__main__":
+    unittest.main()
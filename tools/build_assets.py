@@ -0,0 +1,68 @@
+# File: tools/build_assets.py
+"""
+Pre-render every launcher image at its exact display sizes (all
+ASSET_SCALES, darkened background included) into assets/prerendered.bundle,
+which the launcher memory-maps at start-up.
+
+Run from the repository root before packaging (the PyInstaller spec does
+this automatically):
+    python tools/build_assets.py [--output assets/prerendered.bundle]
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.asset_bundle import (  # noqa: E402
+    ASSET_SCALES, ASSET_SPECS, BUNDLE_MAGIC, BUNDLE_PATH, BUNDLE_VERSION,
+    render_asset, resource_path, scale_label, source_hash, spec_fingerprint,
+)
+
+
+def build(output_path):
+    index, chunks, offset = {}, [], 0
+    for name, spec in ASSET_SPECS.items():
+        source = resource_path(spec["source"])
+        if not os.path.exists(source):
+            print(f"[build_assets] Skipping {name}: {spec['source']} not found")
+            continue
+        src_hash = source_hash(source)
+        for scale in ASSET_SCALES:
+            image = render_asset(name, scale)
+            data = image.tobytes()
+            index.setdefault(name, {})[scale_label(scale)] = {
+                "offset": offset,
+                "length": len(data),
+                "width": image.width,
+                "height": image.height,
+                "source_sha256": src_hash,
+                "spec": spec_fingerprint(name),
+            }
+            chunks.append(data)
+            offset += len(data)
+            print(f"[build_assets] {name} @{scale_label(scale)}x -> {image.width}x{image.height}")
+
+    header = json.dumps({"version": BUNDLE_VERSION, "assets": index}).encode("utf-8")
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for data in chunks:
+            f.write(data)
+    os.replace(tmp_path, output_path)
+    print(f"[build_assets] Wrote {output_path} ({offset / 1e6:.1f} MB of pixels)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the pre-rendered image bundle")
+    parser.add_argument("--output", default=BUNDLE_PATH)
+    args = parser.parse_args()
+    build(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# File: tools/trace_to_chrome.py
+"""
+Convert an interaction trace (ZARRAGA_TRACE=1, one event per line) into a
+Chrome trace JSON file for chrome://tracing, https://ui.perfetto.dev or
+speedscope, and print where the time of each action went.
+
+    python tools/trace_to_chrome.py trace-20250101-120000.jsonl [-o trace.json] [--no-summary]
+
+The summary credits each span with its self time (its duration minus the
+nested spans on the same thread) and totals it per category: validate,
+network, worker, ui (callbacks, page builds), dialog (blocking
+messageboxes) and layout (Tk idle work after a callback). Time inside an
+action that no span covers is shown as waiting.
+"""
+import argparse
+import json
+import os
+from collections import defaultdict
+
+CATEGORIES = ("validate", "network", "worker", "ui", "dialog", "layout", "action", "waiting")
+
+
+def read_events(path):
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A crash can leave the last line half written
+                print(f"[trace_to_chrome] Skipping malformed line {line_number}")
+    return events
+
+
+def self_times(spans):
+    """Self time per span: duration minus time covered by nested spans on the same thread."""
+    children = defaultdict(list)
+    by_id = {s["args"]["span"]: s for s in spans}
+    for s in spans:
+        parent = by_id.get(s["args"].get("parent"))
+        if parent is not None and parent["tid"] == s["tid"]:
+            children[parent["args"]["span"]].append(s)
+    return {
+        span_id: max(0, s["dur"] - sum(c["dur"] for c in children[span_id]))
+        for span_id, s in by_id.items()
+    }
+
+
+def summarize(events):
+    traces = defaultdict(list)
+    for event in events:
+        if event.get("ph") == "X":
+            traces[event["args"]["trace"]].append(event)
+
+    rows = []
+    for spans in traces.values():
+        root = next((s for s in spans if s["args"].get("parent") is None), spans[0])
+        start = min(s["ts"] for s in spans)
+        end = max(s["ts"] + s["dur"] for s in spans)
+        categories = {s["args"]["span"]: s["cat"] for s in spans}
+        per_category = defaultdict(int)
+        for span_id, self_us in self_times(spans).items():
+            per_category[categories[span_id]] += self_us
+        # Time covered by no span: queued behind other work or waiting for the next poll
+        per_category["waiting"] = max(0, end - start - sum(per_category.values()))
+        rows.append((start, root["name"], end - start, per_category))
+    rows.sort()
+
+    header = f"{'action':<24}{'total ms':>10}" + "".join(f"{c:>10}" for c in CATEGORIES)
+    print(header)
+    print("-" * len(header))
+    for _, name, total, per_category in rows:
+        print(f"{name:<24}{total / 1000:>10.1f}" + "".join(f"{per_category.get(c, 0) / 1000:>10.1f}" for c in CATEGORIES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a JSONL interaction trace to Chrome trace JSON")
+    parser.add_argument("trace", help="trace-*.jsonl written with ZARRAGA_TRACE set")
+    parser.add_argument("-o", "--output", help="output file (default: <trace>.json)")
+    parser.add_argument("--no-summary", action="store_true", help="skip the per-action breakdown")
+    args = parser.parse_args()
+
+    events = read_events(args.trace)
+    output = args.output or os.path.splitext(args.trace)[0] + ".json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    print(f"[trace_to_chrome] Wrote {len(events)} events to {output}")
+
+    if not args.no_summary:
+        summarize(events)
+
+
+if __name__ == "__main__":
+    main()
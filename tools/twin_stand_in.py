@@ -0,0 +1,74 @@
+# File: tools/twin_stand_in.py
+"""
+Local stand-in for "Zarraga Flood Simulation.exe" so the launcher's
+Digital Twin handshake can be exercised on Linux (or without the build).
+
+Point the launcher at it with:
+    ZARRAGA_DIGITAL_TWIN=tools/twin_stand_in.py python launcher.py
+
+(a relative path is resolved against the directory the launcher is started from)
+
+Options:
+    --load-seconds N   simulated start-up time before READY (default 2)
+    --run-seconds N    how long to stay alive after READY (default: until killed)
+    --legacy           only use the file protocol (create ready.txt)
+    --crash            exit with code 1 instead of reporting ready
+"""
+import argparse
+import os
+import socket
+import sys
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Digital Twin stand-in")
+    parser.add_argument("--load-seconds", type=float, default=2.0)
+    parser.add_argument("--run-seconds", type=float, default=None)
+    parser.add_argument("--legacy", action="store_true")
+    parser.add_argument("--crash", action="store_true")
+    args = parser.parse_args()
+
+    auth_file = os.getenv("ZARRAGA_AUTH_FILE")
+    ready_file = os.getenv("ZARRAGA_READY_FILE")
+    port = os.getenv("ZARRAGA_HANDSHAKE_PORT")
+    token = os.getenv("ZARRAGA_HANDSHAKE_TOKEN")
+
+    if not auth_file or not os.path.exists(auth_file):
+        print("[stand-in] No session_auth.txt, refusing to start", file=sys.stderr)
+        return 2
+    with open(auth_file, encoding="utf-8") as f:
+        if f.read().strip() != "AUTHORIZED":
+            print("[stand-in] Invalid auth token", file=sys.stderr)
+            return 2
+
+    conn = None
+    if port and not args.legacy:
+        conn = socket.create_connection(("127.0.0.1", int(port)), timeout=5)
+
+    steps = 5
+    for i in range(1, steps + 1):
+        time.sleep(args.load_seconds / steps)
+        if conn:
+            conn.sendall(f"PROGRESS {i * 100 // steps} Loading scene {i}/{steps}\n".encode())
+
+    if args.crash:
+        print("[stand-in] Simulated crash", file=sys.stderr)
+        return 1
+
+    if conn:
+        conn.sendall(f"READY {token}\n".encode())
+        conn.close()
+    else:
+        with open(ready_file, "w", encoding="utf-8") as f:
+            f.write("READY")
+
+    if args.run_seconds is None:
+        while True:
+            time.sleep(3600)
+    time.sleep(args.run_seconds)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
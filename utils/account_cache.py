@@ -0,0 +1,170 @@
+# File: utils/account_cache.py
+import sqlite3
+import threading
+import time
+
+from utils.app_paths import app_data_path
+
+CACHE_FILENAME = "account_cache.db"
+# Rows older than this trigger a full resync (catches edits and deletions)
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+# Oldest-synced rows beyond this count are evicted
+DEFAULT_MAX_ROWS = 200_000
+SYNC_PAGE_SIZE = 1000
+CACHED_COLUMNS = "id,user_name"
+
+
+class AccountCache:
+    """
+    On-disk SQLite copy of the mobile-app `user` table (id and username only;
+    PINs are never written to disk).
+
+    sync() fetches only rows with an id above the cached watermark, which
+    misses edits and deletions made elsewhere (edits made here are written
+    through AccountStore.apply). A full paged resync replaces the cache
+    instead once it is older than ttl_seconds.
+    Safe to use from the Tk thread and worker threads.
+    """
+
+    def __init__(self, path=None, ttl_seconds=DEFAULT_TTL_SECONDS, max_rows=DEFAULT_MAX_ROWS):
+        self.path = path or app_data_path(CACHE_FILENAME)
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS accounts ("
+            " id PRIMARY KEY,"
+            " user_name TEXT NOT NULL,"
+            " synced_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS accounts_synced_at ON accounts (synced_at)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+
+    # ---------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------
+    def search(self, query=None, limit=None):
+        """Return cached accounts as dicts ordered by id, optionally filtered by username."""
+        sql = "SELECT id, user_name FROM accounts"
+        params = []
+        if query:
+            sql += " WHERE user_name LIKE ? ESCAPE '\\'"
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        sql += " ORDER BY id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [{"id": row[0], "user_name": row[1]} for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+
+    def watermark(self):
+        """Highest cached id, or None when the cache is empty."""
+        with self._lock:
+            return self._db.execute("SELECT MAX(id) FROM accounts").fetchone()[0]
+
+    def is_stale(self):
+        last_full = self._get_meta("last_full_sync")
+        return last_full is None or time.time() - float(last_full) > self.ttl_seconds
+
+    # ---------------------------------------------------------
+    # Writes
+    # ---------------------------------------------------------
+    def upsert(self, rows):
+        """Insert or update account rows (extra columns such as pin are ignored)."""
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO accounts (id, user_name, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET user_name = excluded.user_name, synced_at = excluded.synced_at",
+                [(row["id"], row["user_name"], now) for row in rows]
+            )
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM accounts")
+            self._db.execute("DELETE FROM meta")
+            self._db.commit()
+
+    def evict(self):
+        """Drop the oldest-synced rows beyond max_rows."""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM accounts WHERE id IN ("
+                " SELECT id FROM accounts ORDER BY synced_at DESC, id DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,)
+            )
+            self._db.commit()
+
+    # ---------------------------------------------------------
+    # Sync (call from a worker thread)
+    # ---------------------------------------------------------
+    def sync(self, supabase):
+        """
+        Bring the cache up to date with the server.
+        Returns:
+        int: number of rows downloaded
+        """
+        if self.is_stale():
+            fetched = self._full_sync(supabase)
+        else:
+            fetched = self._delta_sync(supabase)
+        self.evict()
+        return fetched
+
+    def _delta_sync(self, supabase):
+        fetched = 0
+        while True:
+            request = supabase.table("user").select(CACHED_COLUMNS)
+            watermark = self.watermark()
+            if watermark is not None:
+                request = request.gt("id", watermark)
+            rows = request.order("id").limit(SYNC_PAGE_SIZE).execute().data or []
+            self.upsert(rows)
+            fetched += len(rows)
+            if len(rows) < SYNC_PAGE_SIZE:
+                return fetched
+
+    def _full_sync(self, supabase):
+        started = time.time()
+        fetched = 0
+        while True:
+            rows = (
+                supabase.table("user").select(CACHED_COLUMNS)
+                .order("id").range(fetched, fetched + SYNC_PAGE_SIZE - 1)
+                .execute().data or []
+            )
+            self.upsert(rows)
+            fetched += len(rows)
+            if len(rows) < SYNC_PAGE_SIZE:
+                break
+
+        # Anything not seen during this pass was deleted on the server
+        with self._lock:
+            self._db.execute("DELETE FROM accounts WHERE synced_at < ?", (started,))
+            self._db.commit()
+        self._set_meta("last_full_sync", str(started))
+        return fetched
+
+    def _get_meta(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+            self._db.commit()
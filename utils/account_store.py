@@ -0,0 +1,113 @@
+# File: utils/account_store.py
+import threading
+
+
+def project(row):
+    """The account fields the list views show (extra columns such as pin are dropped)."""
+    return {"id": row["id"], "user_name": row["user_name"]}
+
+
+class AccountStore:
+    """
+    Shared, observable view of the mobile-app accounts, owned by MainFrame.
+
+    Wraps the on-disk AccountCache and the in-memory AccountSearchIndex so
+    both are written together, and tells subscribed views exactly which
+    records changed. A view patches only those rows instead of reloading
+    the list. apply() may be called from any thread; subscribers are always
+    called on the Tk thread.
+    """
+
+    def __init__(self, cache, index, call_soon):
+        """
+        Parameters:
+        cache (R): AccountCache
+        index (R): AccountSearchIndex
+        call_soon (R): thread-safe scheduler onto the Tk thread (DataWorker.call_soon)
+        """
+        self.cache = cache
+        self.index = index
+        self._call_soon = call_soon
+        self._subscribers = []
+
+    # ---------------------------------------------------------
+    # Subscriptions (Tk thread)
+    # ---------------------------------------------------------
+    def subscribe(self, callback):
+        """Register callback(records), called with the records inserted or changed."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    # ---------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------
+    def all(self):
+        """Every stored account, ordered by id."""
+        return self.cache.search()
+
+    def search(self, query):
+        """Ranked type-ahead matches from the in-memory index."""
+        return self.index.search(query)
+
+    def search_cached(self, query):
+        """Username matches from the on-disk cache (offline fallback for server searches)."""
+        return self.cache.search(query)
+
+    # ---------------------------------------------------------
+    # Writes (any thread)
+    # ---------------------------------------------------------
+    def apply(self, rows, notify=True):
+        """
+        Insert or patch the given account rows.
+        Parameters:
+        rows (R): rows with at least id and user_name
+        notify (O): False for rows a view just read from the server and renders itself
+        """
+        records = [project(row) for row in rows]
+        if not records:
+            return
+        self.cache.upsert(records)
+        for record in records:
+            self.index.add(record)
+        if notify:
+            self._publish(records)
+
+    def load_index(self):
+        """Worker thread: fill the search index from the on-disk cache (before the first sync)."""
+        self.index.rebuild(self.cache.search())
+
+    def needs_full_sync(self):
+        """True once the cache's TTL has run out (the next sync() downloads everything)."""
+        return self.cache.is_stale()
+
+    def sync(self, supabase):
+        """
+        Worker thread: bring the cache up to date, then rebuild the index from
+        it (even if the sync failed, so offline type-ahead still works).
+        Returns:
+        int: number of rows downloaded
+        """
+        try:
+            return self.cache.sync(supabase)
+        finally:
+            self.index.rebuild(self.cache.search())
+
+    # ---------------------------------------------------------
+    # Delivery
+    # ---------------------------------------------------------
+    def _publish(self, records):
+        if threading.current_thread() is threading.main_thread():
+            self._deliver(records)
+        else:
+            self._call_soon(self._deliver, records)
+
+    def _deliver(self, records):
+        for callback in list(self._subscribers):
+            try:
+                callback(records)
+            except Exception as e:
+                print("[DEBUG] Account store subscriber failed:", e)
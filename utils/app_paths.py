@@ -0,0 +1,20 @@
+# File: utils/app_paths.py
+import os
+
+APP_DIR_NAME = "ZarragaFloodMonitoring"
+
+
+def app_data_dir() -> str:
+    """
+    Return the per-user app-data directory, creating it if needed.
+    Uses %APPDATA% on Windows and the home directory elsewhere.
+    """
+    appdata = os.getenv("APPDATA") or os.path.expanduser("~")
+    path = os.path.join(appdata, APP_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def app_data_path(filename: str) -> str:
+    """Return the full path of a file inside the app-data directory."""
+    return os.path.join(app_data_dir(), filename)
@@ -0,0 +1,209 @@
+# File: utils/asset_bundle.py
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+
+from PIL import Image
+
+from utils.app_paths import app_data_path
+
+# Pre-rendered images, built by tools/build_assets.py and shipped with the assets
+BUNDLE_PATH = "assets/prerendered.bundle"
+BUNDLE_MAGIC = b"ZFMASSET"
+BUNDLE_VERSION = 1
+# Fallback renders (bundle missing or stale) are kept here, keyed on source hash
+CACHE_DIR = "asset_cache"
+
+# Display scalings rendered ahead of time (Windows 100/125/150/200 %)
+ASSET_SCALES = (1.0, 1.25, 1.5, 2.0)
+
+# Every image the launcher draws, at its exact display size in logical pixels
+ASSET_SPECS = {
+    "background": {"source": "assets/jalaur.png", "size": (900, 550), "darken": 150},
+    "right_panel": {"source": "assets/wide-logo.png", "size": (300, 300)},
+    "menu_logo": {"source": "assets/icon-logo.png", "size": (120, 120)},
+}
+
+
+def resource_path(relative_path: str) -> str:
+    base_path = getattr(sys, "_MEIPASS", os.path.abspath("."))
+    return os.path.join(base_path, relative_path)
+
+
+# ---------------------------------------------------------
+# Rendering (build tool and runtime fallback)
+# ---------------------------------------------------------
+def scale_label(scale) -> str:
+    return f"{scale:g}"
+
+
+def pixel_size(name, scale):
+    width, height = ASSET_SPECS[name]["size"]
+    return round(width * scale), round(height * scale)
+
+
+def display_size(name):
+    """Logical size to pass to CTkImage(size=...)."""
+    return tuple(ASSET_SPECS[name]["size"])
+
+
+def pick_scale(scaling):
+    """Closest pre-rendered scale at or above the widget scaling (largest if none is)."""
+    for scale in ASSET_SCALES:
+        if scale >= scaling - 0.01:
+            return scale
+    return ASSET_SCALES[-1]
+
+
+def source_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def spec_fingerprint(name):
+    return hashlib.sha256(json.dumps(ASSET_SPECS[name], sort_keys=True).encode()).hexdigest()[:16]
+
+
+def render_asset(name, scale):
+    """Render one asset at one scale from its source file. Returns an RGBA image."""
+    spec = ASSET_SPECS[name]
+    with Image.open(resource_path(spec["source"])) as source:
+        image = source.convert("RGBA").resize(pixel_size(name, scale), Image.LANCZOS)
+    if spec.get("darken"):
+        overlay = Image.new("RGBA", image.size, (0, 0, 0, spec["darken"]))
+        image = Image.alpha_composite(image, overlay)
+    return image
+
+
+def _image_from_buffer(buffer, size):
+    """Wrap raw RGBA bytes without copying them."""
+    return Image.frombuffer("RGBA", size, buffer, "raw", "RGBA", 0, 1)
+
+
+# ---------------------------------------------------------
+# Bundle
+# ---------------------------------------------------------
+class AssetBundle:
+    """
+    Memory-mapped bundle of pre-rendered RGBA images.
+
+    Layout: BUNDLE_MAGIC, little-endian uint32 index length, JSON index,
+    then raw pixel data. The index maps name -> scale -> offset/size plus
+    the source hash and spec it was rendered from. Loading an image only
+    wraps the mapped bytes (no decode, no resampling).
+
+    An entry whose source file or spec has changed since the build is
+    stale. It is rendered on the fly instead, and the result is cached as
+    raw RGBA in the app-data directory under a key made from the source
+    hash, so the next start maps it like a bundle entry.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or resource_path(BUNDLE_PATH)
+        self.index = {}
+        self._data_start = 0
+        self._mmap = None
+        self._hashes = {}
+        self._lock = threading.Lock()
+        self._open()
+
+    def _open(self):
+        try:
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            header = len(BUNDLE_MAGIC) + 4
+            if self._mmap[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+                raise ValueError("not an asset bundle")
+            (index_length,) = struct.unpack("<I", self._mmap[len(BUNDLE_MAGIC):header])
+            index = json.loads(self._mmap[header:header + index_length].decode("utf-8"))
+            if index.get("version") != BUNDLE_VERSION:
+                raise ValueError(f"bundle version {index.get('version')}")
+            self.index = index["assets"]
+            self._data_start = header + index_length
+        except (OSError, ValueError) as e:
+            print(f"[DEBUG] Asset bundle unavailable ({e}); rendering images on the fly")
+            self.index = {}
+
+    def _source_hash(self, name):
+        """sha256 of the asset's source file, or None if it is not shipped."""
+        with self._lock:
+            if name not in self._hashes:
+                path = resource_path(ASSET_SPECS[name]["source"])
+                self._hashes[name] = source_hash(path) if os.path.exists(path) else None
+            return self._hashes[name]
+
+    def load(self, name, scale=1.0):
+        """
+        Return the asset as an RGBA image of exactly pixel_size(name, scale).
+        Parameters:
+        name (R): key of ASSET_SPECS
+        scale (O): one of ASSET_SCALES (see pick_scale)
+        """
+        src_hash = self._source_hash(name)
+        entry = self.index.get(name, {}).get(scale_label(scale))
+        if (
+            entry is not None and self._mmap is not None
+            and entry["spec"] == spec_fingerprint(name)
+            # Without the source there is nothing to compare against; trust the build
+            and (src_hash is None or entry["source_sha256"] == src_hash)
+        ):
+            start = self._data_start + entry["offset"]
+            view = memoryview(self._mmap)[start:start + entry["length"]]
+            return _image_from_buffer(view, (entry["width"], entry["height"]))
+
+        if src_hash is None:
+            raise FileNotFoundError(resource_path(ASSET_SPECS[name]["source"]))
+        return _cached_render(name, scale, src_hash)
+
+
+def _cached_render(name, scale, src_hash):
+    """Render into (or map from) the app-data disk cache."""
+    key = hashlib.sha256(f"{spec_fingerprint(name)}:{src_hash}".encode()).hexdigest()[:16]
+    prefix = f"{name}@{scale_label(scale)}x-"
+    folder = app_data_path(CACHE_DIR)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{prefix}{key}.rgba")
+    size = pixel_size(name, scale)
+
+    try:
+        if os.path.getsize(path) == size[0] * size[1] * 4:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return _image_from_buffer(memoryview(mapped), size)
+    except OSError:
+        pass
+
+    print(f"[DEBUG] Rendering {name} @{scale_label(scale)}x (bundle missing or stale)")
+    image = render_asset(name, scale)
+    try:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(image.tobytes())
+        os.replace(tmp_path, path)
+        # Drop renders of older versions of this source
+        for old in os.listdir(folder):
+            if old.startswith(prefix) and old != os.path.basename(path):
+                os.remove(os.path.join(folder, old))
+    except OSError as e:
+        print("[DEBUG] Could not cache rendered asset:", e)
+    return image
+
+
+_bundle = None
+_bundle_lock = threading.Lock()
+
+
+def load_asset(name, scale=1.0):
+    """Load a pre-rendered asset from the shared bundle (opened on first use)."""
+    global _bundle
+    with _bundle_lock:
+        if _bundle is None:
+            _bundle = AssetBundle()
+    return _bundle.load(name, scale)
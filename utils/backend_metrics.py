@@ -0,0 +1,374 @@
+# File: utils/backend_metrics.py
+import bisect
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.app_paths import app_data_path
+from utils.connectivity import is_network_error
+
+# Opt-in Prometheus endpoint: http://127.0.0.1:<port>/metrics
+METRICS_PORT_ENV = "ZARRAGA_METRICS_PORT"
+# Opt-in JSON dumps: seconds between them (0, the default, disables them)
+METRICS_DUMP_ENV = "ZARRAGA_METRICS_DUMP_S"
+DEFAULT_DUMP_INTERVAL_S = 0
+# One JSON line per dump, in a file per day; older files are deleted at start
+METRICS_DIR = "metrics"
+METRICS_KEEP_DAYS = 14
+
+# Response sizes are measured by serializing the data again (the client does not
+# expose the HTTP body length), so only every Nth response of an operation is sized
+RESPONSE_SIZE_SAMPLE_EVERY = 10
+
+LATENCY_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Query-builder methods that name the operation (user.select, user.insert, ...)
+TABLE_OPERATIONS = {"select", "insert", "upsert", "update", "delete"}
+# Arguments of these operations are the request payload
+PAYLOAD_OPERATIONS = {"insert", "upsert", "update"}
+
+
+def _payload_size(value):
+    if value is None:
+        return 0
+    try:
+        return len(json.dumps(value, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+class _Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def cumulative(self):
+        running, out = 0, []
+        for count in self.counts:
+            running += count
+            out.append(running)
+        return out
+
+    def snapshot(self):
+        return {
+            "buckets": dict(zip([str(b) for b in self.bounds] + ["+Inf"], self.cumulative())),
+            "sum": self.total,
+            "count": sum(self.counts),
+        }
+
+
+class _OperationStats:
+    def __init__(self):
+        self.latency = _Histogram(LATENCY_BUCKETS_S)
+        self.response_bytes = _Histogram(SIZE_BUCKETS_BYTES)
+        self.request_bytes = 0
+        self.errors = {}
+
+
+class BackendMetrics:
+    """
+    Thread-safe per-operation counters for backend calls: latency and
+    response size histograms, request payload bytes and errors by kind
+    ("network" or "api"). Operations are named "<table>.<op>" or "auth.<method>".
+    The response size histogram holds a sample (see should_size_response).
+    """
+
+    def __init__(self, response_sample_every=RESPONSE_SIZE_SAMPLE_EVERY):
+        self.started = time.time()
+        self.response_sample_every = max(1, response_sample_every)
+        self._lock = threading.Lock()
+        self._ops = {}
+        self._responses_seen = {}
+        self._version = 0
+
+    def should_size_response(self, operation):
+        """True for the first and then every response_sample_every-th response of an operation."""
+        with self._lock:
+            seen = self._responses_seen.get(operation, 0)
+            self._responses_seen[operation] = seen + 1
+        return seen % self.response_sample_every == 0
+
+    def record(self, operation, seconds, request_bytes=0, response_bytes=None, error=None):
+        with self._lock:
+            stats = self._ops.get(operation)
+            if stats is None:
+                stats = self._ops[operation] = _OperationStats()
+            stats.latency.observe(seconds)
+            stats.request_bytes += request_bytes
+            if response_bytes is not None:
+                stats.response_bytes.observe(response_bytes)
+            if error is not None:
+                kind = "network" if is_network_error(error) else "api"
+                stats.errors[kind] = stats.errors.get(kind, 0) + 1
+            self._version += 1
+
+    @property
+    def version(self):
+        """Increases with every recorded call (lets dumps skip idle intervals)."""
+        return self._version
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "started": self.started,
+                "time": time.time(),
+                "operations": {
+                    name: {
+                        "latency_seconds": stats.latency.snapshot(),
+                        "response_bytes": stats.response_bytes.snapshot(),
+                        "request_bytes": stats.request_bytes,
+                        "errors": dict(stats.errors),
+                    }
+                    for name, stats in sorted(self._ops.items())
+                },
+            }
+
+    def prometheus_text(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            ops = sorted(self._ops.items())
+            families = (
+                ("zarraga_backend_request_duration_seconds", "Backend call latency.",
+                 lambda s: s.latency),
+                ("zarraga_backend_response_bytes", "Size of backend response data (sampled).",
+                 lambda s: s.response_bytes),
+            )
+            for metric, help_text, pick in families:
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+                for name, stats in ops:
+                    histogram = pick(stats)
+                    bounds = [f"{b:g}" for b in histogram.bounds] + ["+Inf"]
+                    for le, count in zip(bounds, histogram.cumulative()):
+                        lines.append(f'{metric}_bucket{{op="{name}",le="{le}"}} {count}')
+                    lines.append(f'{metric}_sum{{op="{name}"}} {histogram.total:g}')
+                    lines.append(f'{metric}_count{{op="{name}"}} {sum(histogram.counts)}')
+
+            metric = "zarraga_backend_request_bytes_total"
+            lines += [f"# HELP {metric} Request payload bytes sent.", f"# TYPE {metric} counter"]
+            lines += [f'{metric}{{op="{name}"}} {stats.request_bytes}' for name, stats in ops]
+
+            metric = "zarraga_backend_errors_total"
+            lines += [f"# HELP {metric} Failed backend calls.", f"# TYPE {metric} counter"]
+            for name, stats in ops:
+                lines += [f'{metric}{{op="{name}",kind="{kind}"}} {n}' for kind, n in sorted(stats.errors.items())]
+        return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------
+# Client wrapper
+# ---------------------------------------------------------
+class _InstrumentedQuery:
+    """Wraps a query builder chain; execute() is timed under the operation picked in the chain."""
+
+    def __init__(self, builder, table, metrics, operation=None, request_bytes=0):
+        self._builder = builder
+        self._table = table
+        self._metrics = metrics
+        self._operation = operation
+        self._request_bytes = request_bytes
+
+    def __getattr__(self, name):
+        attribute = getattr(self._builder, name)
+        if not callable(attribute):
+            # e.g. the not_ modifier, which is itself a builder
+            if hasattr(attribute, "execute"):
+                return _InstrumentedQuery(attribute, self._table, self._metrics, self._operation, self._request_bytes)
+            return attribute
+
+        def call(*args, **kwargs):
+            result = attribute(*args, **kwargs)
+            if not hasattr(result, "execute"):
+                return result
+            operation, request_bytes = self._operation, self._request_bytes
+            if name in TABLE_OPERATIONS:
+                operation = name
+                if name in PAYLOAD_OPERATIONS and args:
+                    request_bytes = _payload_size(args[0])
+            return _InstrumentedQuery(result, self._table, self._metrics, operation, request_bytes)
+        return call
+
+    def execute(self, *args, **kwargs):
+        operation = f"{self._table}.{self._operation or 'query'}"
+        start = time.perf_counter()
+        try:
+            response = self._builder.execute(*args, **kwargs)
+        except Exception as e:
+            self._metrics.record(operation, time.perf_counter() - start, self._request_bytes, error=e)
+            raise
+        seconds = time.perf_counter() - start
+        response_bytes = None
+        if self._metrics.should_size_response(operation):
+            response_bytes = _payload_size(getattr(response, "data", None))
+        self._metrics.record(operation, seconds, self._request_bytes, response_bytes=response_bytes)
+        return response
+
+
+class _InstrumentedAuth:
+    """Times every auth method call as auth.<method>."""
+
+    def __init__(self, auth, metrics):
+        self._auth = auth
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        attribute = getattr(self._auth, name)
+        if not callable(attribute) or name.startswith("_"):
+            return attribute
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = attribute(*args, **kwargs)
+            except Exception as e:
+                self._metrics.record(f"auth.{name}", time.perf_counter() - start, error=e)
+                raise
+            self._metrics.record(f"auth.{name}", time.perf_counter() - start)
+            return result
+        return call
+
+
+class InstrumentedClient:
+    """Supabase client proxy recording every table and auth call in a BackendMetrics."""
+
+    def __init__(self, client, metrics):
+        self._client = client
+        self.metrics = metrics
+        self.auth = _InstrumentedAuth(client.auth, metrics)
+
+    def table(self, name):
+        return _InstrumentedQuery(self._client.table(name), name, self.metrics)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+# ---------------------------------------------------------
+# Exporters
+# ---------------------------------------------------------
+class _MetricsHandler(BaseHTTPRequestHandler):
+    metrics = None
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.metrics.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(metrics, port):
+    """Serve /metrics on 127.0.0.1:port from a daemon thread. Returns the server."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"metrics": metrics})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    print(f"[DEBUG] Backend metrics at http://127.0.0.1:{server.server_address[1]}/metrics")
+    return server
+
+
+class MetricsDumper:
+    """
+    Appends a JSON snapshot to metrics/backend-<date>.jsonl every interval
+    (only if there were calls). Files older than METRICS_KEEP_DAYS are
+    deleted when it starts.
+    """
+
+    def __init__(self, metrics, interval_s, folder=None):
+        self.metrics = metrics
+        self.interval_s = interval_s
+        self.folder = folder or app_data_path(METRICS_DIR)
+        self._dumped_version = 0
+        self._stop = threading.Event()
+
+    def start(self):
+        self.prune()
+        threading.Thread(target=self._run, name="metrics-dump", daemon=True).start()
+
+    def prune(self, keep_days=METRICS_KEEP_DAYS):
+        """Delete dump files older than keep_days."""
+        cutoff = time.time() - keep_days * 86400
+        try:
+            names = os.listdir(self.folder)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.folder, name)
+            if not (name.startswith("backend-") and name.endswith(".jsonl")):
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError as e:
+                print("[DEBUG] Could not remove old metrics file:", e)
+
+    def stop(self):
+        """Stop the timer and write a final snapshot."""
+        self._stop.set()
+        self.dump()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.dump()
+
+    def dump(self):
+        version = self.metrics.version
+        if version == self._dumped_version:
+            return
+        self._dumped_version = version
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            path = os.path.join(self.folder, f"backend-{time.strftime('%Y-%m-%d')}.jsonl")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.metrics.snapshot()) + "\n")
+        except OSError as e:
+            print("[DEBUG] Could not write backend metrics:", e)
+
+
+METRICS = BackendMetrics()
+_dumper = None
+
+
+def instrument(client, metrics=METRICS):
+    """
+    Wrap a Supabase client so its calls are measured, and start the exporters
+    configured in the environment (ZARRAGA_METRICS_PORT, ZARRAGA_METRICS_DUMP_S).
+    """
+    global _dumper
+    if _dumper is None:
+        try:
+            interval = float(os.getenv(METRICS_DUMP_ENV, DEFAULT_DUMP_INTERVAL_S))
+        except ValueError:
+            interval = DEFAULT_DUMP_INTERVAL_S
+        if interval > 0:
+            _dumper = MetricsDumper(metrics, interval)
+            _dumper.start()
+
+        port = os.getenv(METRICS_PORT_ENV)
+        if port:
+            try:
+                start_metrics_server(metrics, int(port))
+            except (OSError, ValueError) as e:
+                print(f"[DEBUG] Metrics endpoint not started ({METRICS_PORT_ENV}={port!r}): {e}")
+    return InstrumentedClient(client, metrics)
+
+
+def flush_metrics():
+    """Write a last JSON snapshot (call on shutdown)."""
+    if _dumper is not None:
+        _dumper.stop()
@@ -0,0 +1,370 @@
+# File: utils/bulk_import.py
+import csv
+import hashlib
+import json
+import os
+import threading
+
+from utils.app_paths import app_data_path
+from utils.connectivity import is_network_error
+from utils.validation import PIN_LENGTH, is_valid_pin
+
+# Rows sent per insert request
+BULK_IMPORT_BATCH_SIZE = 500
+# Progress is reported at least this often (in rows) between batches
+PROGRESS_EVERY_ROWS = 200
+CHECKPOINT_DIR = "import_checkpoints"
+TARGET_TABLE = "user"
+
+# Accepted header spellings (compared lower-cased, spaces/dashes ignored)
+USERNAME_HEADERS = {"username", "user_name", "user", "name"}
+PIN_HEADERS = {"pin", "pincode", "pin_code"}
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx")
+
+
+class ImportResult:
+    """Outcome of one import pass."""
+
+    def __init__(self):
+        self.rows_read = 0       # data rows processed in this pass
+        self.resumed_from = 0    # source row the pass started after (0 = from the top)
+        self.inserted = 0        # total accounts created, including earlier passes
+        self.errors = 0          # total rejected rows, including earlier passes
+        self.report_path = None
+        self.cancelled = False
+        self.interrupted = False  # backend became unreachable; the checkpoint was kept
+        self.finished = False
+
+
+class BulkAccountImporter:
+    """
+    Streams accounts from a CSV or XLSX file into the `user` table.
+
+    Rows are validated with the same PIN rule as the Create Account form,
+    checked against usernames already on the server, and inserted
+    batch_size rows per request. Rejected rows are written to a CSV error
+    report next to the source file.
+
+    After every batch a checkpoint (keyed on the file's content hash) is
+    saved in the app-data directory, so an interrupted or cancelled import
+    resumes after the last committed row instead of starting over.
+    run() blocks; call it from a worker thread.
+    """
+
+    def __init__(self, path, batch_size=BULK_IMPORT_BATCH_SIZE, on_progress=None, on_batch=None):
+        """
+        Parameters:
+        path (R): .csv or .xlsx file with username and PIN columns
+        batch_size (O): rows per insert request
+        on_progress (O): called from the worker as on_progress(fraction, result)
+        on_batch (O): called from the worker with the rows the server returned for each batch
+        """
+        if not path.lower().endswith(SUPPORTED_EXTENSIONS):
+            raise ValueError("Only .csv and .xlsx files can be imported.")
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        self.on_progress = on_progress
+        self.on_batch = on_batch
+        self.fraction = 0.0
+        self._cancel = threading.Event()
+        self._file_hash = None
+
+    # ---------------------------------------------------------
+    # Checkpoints
+    # ---------------------------------------------------------
+    def file_hash(self):
+        if self._file_hash is None:
+            digest = hashlib.sha256()
+            with open(self.path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            self._file_hash = digest.hexdigest()
+        return self._file_hash
+
+    def _checkpoint_path(self):
+        folder = app_data_path(CHECKPOINT_DIR)
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, f"{self.file_hash()}.json")
+
+    def load_checkpoint(self):
+        """Return the saved progress for this file ({rows_done, inserted, errors, report}) or None."""
+        try:
+            with open(self._checkpoint_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_checkpoint(self, rows_done, result):
+        state = {
+            "source": self.path,
+            "rows_done": rows_done,
+            "inserted": result.inserted,
+            "errors": result.errors,
+            "report": result.report_path,
+        }
+        tmp_path = self._checkpoint_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self._checkpoint_path())
+
+    def clear_checkpoint(self):
+        try:
+            os.remove(self._checkpoint_path())
+        except OSError:
+            pass
+
+    def cancel(self):
+        """Stop after the current row; progress up to the last batch is kept."""
+        self._cancel.set()
+
+    # ---------------------------------------------------------
+    # Import
+    # ---------------------------------------------------------
+    def run(self, supabase, resume=True):
+        """
+        Import the file.
+        Parameters:
+        supabase (R): Supabase client
+        resume (O): continue from the saved checkpoint if there is one
+        Returns:
+        ImportResult
+        Raises:
+        ValueError if the file has no recognisable username/PIN columns
+        """
+        result = ImportResult()
+        checkpoint = self.load_checkpoint() if resume else None
+        if checkpoint:
+            result.resumed_from = checkpoint["rows_done"]
+            result.inserted = checkpoint["inserted"]
+            result.errors = checkpoint["errors"]
+            result.report_path = checkpoint.get("report")
+        else:
+            self.clear_checkpoint()
+        if not result.report_path:
+            result.report_path = _report_path_for(self.path)
+        if not checkpoint:
+            _start_report(result.report_path)
+
+        batch, rejected = [], []
+        seen = {}
+        last_row = result.resumed_from
+        rows_done = result.resumed_from
+        columns = None
+
+        for row_number, cells in self._records():
+            if columns is None:
+                columns = _find_columns(cells)
+                continue
+            if row_number <= result.resumed_from:
+                continue
+            if self._cancel.is_set():
+                result.cancelled = True
+                break
+
+            last_row = row_number
+            user_name, pin = _row_values(cells, columns)
+            if not user_name and not pin:
+                continue  # blank line
+            result.rows_read += 1
+
+            error = _validate(user_name, pin)
+            if error is None and user_name in seen:
+                error = f"username repeated in file (row {seen[user_name]})"
+            if error:
+                rejected.append((row_number, user_name, error))
+            else:
+                seen[user_name] = row_number
+                batch.append((row_number, {"user_name": user_name, "pin": pin}))
+
+            if len(batch) >= self.batch_size:
+                if not self._flush(supabase, batch, rejected, last_row, result):
+                    break
+                rows_done = last_row
+                batch, rejected = [], []
+            elif result.rows_read % PROGRESS_EVERY_ROWS == 0:
+                self._report_progress(result)
+
+        if columns is None:
+            raise ValueError("The file is empty.")
+
+        if not result.cancelled and not result.interrupted:
+            if self._flush(supabase, batch, rejected, last_row, result):
+                rows_done = last_row
+                result.finished = True
+                self.clear_checkpoint()
+                self.fraction = 1.0
+        self._report_progress(result)
+        print(f"[DEBUG] Bulk import stopped after row {rows_done}: "
+              f"{result.inserted} inserted, {result.errors} rejected")
+        return result
+
+    def _flush(self, supabase, batch, rejected, last_row, result):
+        """Insert one batch and commit its errors and checkpoint. False if the backend went away."""
+        try:
+            inserted, failed = self._insert_batch(supabase, batch)
+        except Exception as e:
+            if not is_network_error(e):
+                raise
+            result.interrupted = True
+            return False
+
+        rejected = sorted(rejected + failed)
+        _append_report(result.report_path, rejected)
+        result.inserted += len(inserted)
+        result.errors += len(rejected)
+        if inserted and self.on_batch:
+            try:
+                self.on_batch(inserted)
+            except Exception as e:
+                print("[DEBUG] Bulk import batch listener failed:", e)
+        self._save_checkpoint(last_row, result)
+        self._report_progress(result)
+        return True
+
+    def _insert_batch(self, supabase, batch):
+        """Return (rows the server created, [(row_number, user_name, error)])."""
+        if not batch:
+            return [], []
+        names = [payload["user_name"] for _, payload in batch]
+        response = supabase.table(TARGET_TABLE).select("user_name").in_("user_name", names).execute()
+        taken = {row["user_name"] for row in response.data or []}
+
+        failed = [(number, payload["user_name"], "username already exists")
+                  for number, payload in batch if payload["user_name"] in taken]
+        fresh = [(number, payload) for number, payload in batch if payload["user_name"] not in taken]
+        if not fresh:
+            return [], failed
+
+        try:
+            response = supabase.table(TARGET_TABLE).insert([payload for _, payload in fresh]).execute()
+            return response.data or [], failed
+        except Exception as e:
+            if is_network_error(e):
+                raise
+            print("[DEBUG] Batch insert rejected, retrying rows one by one:", e)
+
+        # The server refused the batch (e.g. a username created meanwhile): find the bad rows
+        inserted = []
+        for number, payload in fresh:
+            try:
+                response = supabase.table(TARGET_TABLE).insert(payload).execute()
+                inserted.extend(response.data or [])
+            except Exception as e:
+                if is_network_error(e):
+                    raise
+                failed.append((number, payload["user_name"], f"rejected by server: {e}"))
+        return inserted, failed
+
+    def _report_progress(self, result):
+        if self.on_progress:
+            try:
+                self.on_progress(self.fraction, result)
+            except Exception as e:
+                print("[DEBUG] Bulk import progress listener failed:", e)
+
+    # ---------------------------------------------------------
+    # Streaming readers (yield (row_number, cells))
+    # ---------------------------------------------------------
+    def _records(self):
+        if self.path.lower().endswith(".xlsx"):
+            return self._xlsx_records()
+        return self._csv_records()
+
+    def _csv_records(self):
+        size = os.path.getsize(self.path) or 1
+        with open(self.path, "rb") as f:
+            def lines():
+                for raw in f:
+                    self.fraction = f.tell() / size
+                    try:
+                        yield raw.decode("utf-8-sig")
+                    except UnicodeDecodeError:
+                        # Excel on Windows saves CSV in the ANSI code page
+                        yield raw.decode("cp1252", errors="replace")
+
+            reader = csv.reader(lines())
+            for cells in reader:
+                yield reader.line_num, cells
+
+    def _xlsx_records(self):
+        try:
+            import openpyxl
+        except ImportError:
+            raise ValueError("Reading .xlsx files needs the openpyxl package. Save the sheet as CSV instead.")
+
+        workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            total = sheet.max_row or 0
+            for number, cells in enumerate(sheet.iter_rows(values_only=True), start=1):
+                self.fraction = number / total if total else 0.0
+                yield number, list(cells)
+        finally:
+            workbook.close()
+
+
+# ---------------------------------------------------------
+# Row helpers
+# ---------------------------------------------------------
+def _normalise_header(value):
+    return str(value or "").strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def _find_columns(header):
+    """Return (username_index, pin_index) from the header row."""
+    names = [_normalise_header(cell) for cell in header]
+    user_col = next((i for i, name in enumerate(names) if name in USERNAME_HEADERS), None)
+    pin_col = next((i for i, name in enumerate(names) if name in PIN_HEADERS), None)
+    if user_col is None or pin_col is None:
+        raise ValueError("The first row must name a 'username' column and a 'pin' column.")
+    return user_col, pin_col
+
+
+def _row_values(cells, columns):
+    user_col, pin_col = columns
+    user_name = cells[user_col] if user_col < len(cells) else None
+    pin = cells[pin_col] if pin_col < len(cells) else None
+    return str(user_name or "").strip(), _pin_text(pin)
+
+
+def _pin_text(value):
+    """Spreadsheets store PINs like 0123 as the number 123; restore the leading zeros."""
+    if isinstance(value, bool) or value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, int):
+        return str(value).zfill(PIN_LENGTH) if value >= 0 else str(value)
+    return str(value).strip()
+
+
+def _validate(user_name, pin):
+    if not user_name:
+        return "missing username"
+    if not is_valid_pin(pin):
+        return f"PIN must be exactly {PIN_LENGTH} digits"
+    return None
+
+
+# ---------------------------------------------------------
+# Error report
+# ---------------------------------------------------------
+def _report_path_for(source_path):
+    """<source>.errors.csv next to the source file, or in app-data if that folder is read-only."""
+    stem = os.path.splitext(source_path)[0]
+    path = f"{stem}.errors.csv"
+    if os.access(os.path.dirname(os.path.abspath(path)), os.W_OK):
+        return path
+    return app_data_path(os.path.basename(path))
+
+
+def _start_report(path):
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        csv.writer(f).writerow(["row", "user_name", "error"])
+
+
+def _append_report(path, rows):
+    if not rows:
+        return
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
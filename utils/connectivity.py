@@ -0,0 +1,179 @@
+# File: utils/connectivity.py
+import threading
+import time
+
+# Consecutive network failures before the breaker opens
+FAILURE_THRESHOLD = 2
+# An open breaker lets one trial call through after this long, even without a probe
+RESET_TIMEOUT_S = 30.0
+# Probe cadence while online, and the backoff range while offline
+ONLINE_PROBE_INTERVAL_S = 60.0
+MIN_BACKOFF_S = 1.0
+MAX_BACKOFF_S = 60.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# httpx / httpcore transport errors raised by the Supabase client
+_NETWORK_ERROR_NAMES = {
+    "TransportError", "NetworkError", "ConnectError", "ConnectTimeout",
+    "TimeoutException", "ReadTimeout", "WriteTimeout", "PoolTimeout",
+    "RemoteProtocolError", "ReadError", "WriteError",
+}
+
+
+class BackendUnavailable(ConnectionError):
+    """Raised without touching the network while the backend is known to be unreachable."""
+
+
+def is_network_error(error) -> bool:
+    """True if error means the backend could not be reached (not an API-level error)."""
+    if isinstance(error, (OSError, TimeoutError)):
+        return True
+    return any(cls.__name__ in _NETWORK_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class CircuitBreaker:
+    """
+    Fails backend calls fast once the backend is known to be unreachable.
+
+    closed: calls go through; FAILURE_THRESHOLD consecutive network errors open it.
+    open: calls raise BackendUnavailable at once until reset() or RESET_TIMEOUT_S.
+    half_open: one trial call is let through; its outcome closes or re-opens it.
+    """
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT_S):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.on_state_change = None
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, task):
+        """Run task() through the breaker."""
+        self.before_call()
+        try:
+            result = task()
+        except Exception as e:
+            if is_network_error(e):
+                self.record_failure()
+            else:
+                # The server answered, so it is reachable
+                self.record_success()
+            raise
+        self.record_success()
+        return result
+
+    def before_call(self):
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise BackendUnavailable("Backend unreachable (circuit open)")
+                self._set_state(HALF_OPEN)
+            elif self.state == HALF_OPEN:
+                raise BackendUnavailable("Backend unreachable (trial call in progress)")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open()
+
+    def trip(self):
+        """Open the breaker now (e.g. a connectivity probe failed)."""
+        with self._lock:
+            if self.state != OPEN:
+                self._open()
+
+    def reset(self):
+        """Close the breaker (e.g. a connectivity probe succeeded)."""
+        self.record_success()
+
+    @property
+    def is_open(self):
+        return self.state != CLOSED
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self._set_state(OPEN)
+
+    def _set_state(self, state):
+        self.state = state
+        if self.on_state_change:
+            self.on_state_change(state)
+
+
+class ConnectivityMonitor:
+    """
+    Background prober that keeps the circuit breaker in sync with reality.
+
+    Probes every ONLINE_PROBE_INTERVAL_S while online. While offline it
+    retries with exponential backoff between MIN_BACKOFF_S and
+    MAX_BACKOFF_S. When the breaker opens, the monitor probes at once.
+    on_change(online) runs on the monitor thread whenever reachability flips.
+    """
+
+    def __init__(self, probe, breaker, on_change=None):
+        self.probe = probe
+        self.breaker = breaker
+        self.on_change = on_change
+        self.online = True
+        self._backoff = MIN_BACKOFF_S
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        breaker.on_state_change = self._on_breaker_state
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="connectivity-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self):
+        """Probe now instead of waiting for the next interval."""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                reachable = self.probe()
+            except Exception:
+                reachable = False
+
+            if reachable:
+                self.breaker.reset()
+                self._backoff = MIN_BACKOFF_S
+                interval = ONLINE_PROBE_INTERVAL_S
+            else:
+                self.breaker.trip()
+                interval = self._backoff
+                self._backoff = min(self._backoff * 2, MAX_BACKOFF_S)
+
+            # Ignore the wake-up caused by our own trip() above
+            self._wake.clear()
+            self._wake.wait(interval)
+
+    def _on_breaker_state(self, state):
+        online = state == CLOSED
+        if state == OPEN:
+            self.wake()
+        if state == HALF_OPEN or online == self.online:
+            return
+        self.online = online
+        if self.on_change:
+            try:
+                self.on_change(online)
+            except Exception as e:
+                print("[DEBUG] Connectivity listener failed:", e)
@@ -0,0 +1,294 @@
+# File: utils/data_worker.py
+import hashlib
+import hmac
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import tracing
+
+# How often the Tk thread drains finished requests
+POLL_INTERVAL_MS = 30
+MAX_WORKERS = 4
+# A mutation repeated this soon after it succeeded is treated as a duplicate (and dropped)
+IDEMPOTENCY_WINDOW_S = 2.0
+# Keys request_key() digests with; random per process, so a digest of a short PIN
+# cannot be reversed by hashing every candidate
+_REQUEST_KEY_SECRET = os.urandom(16)
+
+
+def request_key(operation, *values):
+    """
+    Share / idempotency key for submit() that does not hold the values themselves.
+    Keys live as long as the request (and are printed when a repeat is dropped),
+    so passwords and PINs must not appear in them.
+    Parameters:
+    operation (R): readable name of the request, kept as is (e.g. "user.update")
+    values (O): everything that identifies the request; reduced to an HMAC-SHA256 digest
+    Returns:
+    (operation, hex digest)
+    """
+    digest = hmac.new(_REQUEST_KEY_SECRET, repr(values).encode("utf-8"), hashlib.sha256).hexdigest()
+    return operation, digest
+
+
+class DataWorker:
+    """
+    Runs blocking data-access calls (Supabase, disk) on a small thread pool
+    and hands the results back to the Tk mainloop through after() callbacks.
+
+    Requests submitted with the same key replace each other: only the most
+    recent one delivers its callbacks, older ones are cancelled or dropped.
+    Identical reads (same share signature) in flight at the same time run
+    once and every submitter gets the result. A mutation repeated with the
+    same idempotency key is not sent again. While the first is in flight, a
+    repeat on another key shares its result and a repeat on the same key
+    leaves the first to deliver it. A repeat within IDEMPOTENCY_WINDOW_S
+    after the first succeeded is dropped: its task never ran, so it only
+    gets on_done, never a success it did not cause.
+    Backend tasks go through the optional circuit breaker, so they fail in
+    milliseconds while the backend is known to be unreachable.
+    When tracing is on, the task and its callbacks run in the submitter's
+    context, so their spans join the trace of the action that submitted them.
+    """
+
+    def __init__(self, root, max_workers=MAX_WORKERS, breaker=None):
+        self.root = root
+        self.breaker = breaker
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="data-worker")
+        self._results = queue.Queue()
+        # Re-entrant: a future that is already done runs its done callbacks inside submit()
+        self._lock = threading.RLock()
+        self._generations = {}
+        self._futures = {}
+        self._reads = {}
+        self._mutations = {}
+        self._shared = set()
+        self._closed = False
+        self._pump_id = self.root.after(POLL_INTERVAL_MS, self._pump)
+
+    # ---------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------
+    def submit(self, task, on_success=None, on_error=None, on_done=None, key=None, backend=True,
+               share=None, idempotency_key=None):
+        """
+        Run task() on a worker thread.
+        Parameters:
+        task (R): callable doing the blocking work, its return value goes to on_success
+        on_success (O): called on the Tk thread with the task result
+        on_error (O): called on the Tk thread with the raised exception
+        on_done (O): called on the Tk thread after either of the above
+        key (O): request channel, a newer submit with the same key makes this one stale
+        backend (O): False for purely local work that should bypass the circuit breaker
+        share (O): signature of a read (hashable, see request_key); joins an identical read already in flight
+        idempotency_key (O): identity of a mutation (hashable, see request_key); a repeat while it is in
+            flight shares its result, one within IDEMPOTENCY_WINDOW_S of its success is dropped
+            (only on_done runs)
+        Returns:
+        Future for the task, or None if the worker has been shut down
+        """
+        if self._closed:
+            return None
+
+        with self._lock:
+            future = None
+            if idempotency_key is not None:
+                future = self._duplicate_mutation(idempotency_key)
+                if future is not None:
+                    print(f"[DEBUG] Not repeating request {idempotency_key!r}")
+                    if future.done():
+                        # Already delivered to its own submitter: the repeat only finishes its busy state
+                        self._results.put((None, None, future, None, None, on_done, None))
+                        return future
+                    if key is not None and self._futures.get(key) is future:
+                        # Same channel, not delivered yet: the first submission still reports
+                        # the result, so the repeat must not make it stale
+                        generation = self._generations[key]
+                        future.add_done_callback(
+                            lambda f: self._results.put((key, generation, f, None, None, on_done, None))
+                        )
+                        return future
+            if future is None and share is not None:
+                future = self._reads.get(share)
+
+            generation = self._generations.get(key, 0) + 1
+            if key is not None:
+                self._generations[key] = generation
+                previous = self._futures.get(key)
+                if previous is not None and previous is not future and previous not in self._shared:
+                    previous.cancel()
+
+            context = tracing.capture()
+            if future is None:
+                if backend and self.breaker is not None:
+                    breaker, local_task = self.breaker, task
+                    task = lambda: breaker.call(local_task)
+                if context is not None:
+                    task = self._traced_task(task, context, key, backend)
+                future = self._executor.submit(task)
+                if share is not None or idempotency_key is not None:
+                    self._track_shared(future, share, idempotency_key)
+            if key is not None:
+                self._futures[key] = future
+
+        future.add_done_callback(
+            lambda f: self._results.put((key, generation, f, on_success, on_error, on_done, context))
+        )
+        return future
+
+    def _duplicate_mutation(self, idempotency_key):
+        """The earlier future for this mutation if a repeat should be dropped (lock held)."""
+        now = time.monotonic()
+        for stale in [k for k, (_, done_at) in self._mutations.items()
+                      if done_at is not None and now - done_at > IDEMPOTENCY_WINDOW_S]:
+            del self._mutations[stale]
+        entry = self._mutations.get(idempotency_key)
+        if entry is None:
+            return None
+        future = entry[0]
+        if future.done() and (future.cancelled() or future.exception() is not None):
+            # Failed but not forgotten yet: the repeat runs for real
+            return None
+        return future
+
+    def _track_shared(self, future, share, idempotency_key):
+        """Register a shareable future and forget it once it is no longer reusable (lock held)."""
+        self._shared.add(future)
+        if share is not None:
+            self._reads[share] = future
+        if idempotency_key is not None:
+            self._mutations[idempotency_key] = (future, None)
+
+        def finished(f):
+            with self._lock:
+                self._shared.discard(f)
+                if share is not None and self._reads.get(share) is f:
+                    del self._reads[share]
+                if idempotency_key is not None and self._mutations.get(idempotency_key, (None,))[0] is f:
+                    if f.cancelled() or f.exception() is not None:
+                        # Failed mutations may be retried at once
+                        del self._mutations[idempotency_key]
+                    else:
+                        self._mutations[idempotency_key] = (f, time.monotonic())
+        future.add_done_callback(finished)
+
+    @staticmethod
+    def _traced_task(task, context, key, backend):
+        submitted = time.perf_counter()
+
+        def run():
+            queued_ms = round((time.perf_counter() - submitted) * 1000, 1)
+            category = tracing.NETWORK if backend else tracing.WORKER
+            with tracing.span(f"worker: {key or 'task'}", category, queued_ms=queued_ms):
+                return task()
+        return lambda: tracing.run_in(context, run)
+
+    def cancel(self, key):
+        """Mark the in-flight request on key as stale so its callbacks never run."""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            previous = self._futures.pop(key, None)
+            shared = previous in self._shared
+        if previous is not None and not shared:
+            previous.cancel()
+
+    def call_soon(self, callback, *args):
+        """Thread-safe: run callback(*args) on the Tk thread at the next poll."""
+        self._results.put((None, None, None, lambda _: callback(*args), None, None, None))
+
+    def shutdown(self):
+        """Stop polling and drop queued work; running calls finish in the background."""
+        self._closed = True
+        if self._pump_id is not None:
+            try:
+                self.root.after_cancel(self._pump_id)
+            except Exception:
+                pass
+            self._pump_id = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------------------------------------------------------
+    # Tk-side delivery
+    # ---------------------------------------------------------
+    def _is_stale(self, key, generation):
+        if key is None:
+            return False
+        with self._lock:
+            if self._generations.get(key) != generation:
+                return True
+            self._futures.pop(key, None)
+        return False
+
+    def _pump(self):
+        while True:
+            try:
+                key, generation, future, on_success, on_error, on_done, context = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if future is None:
+                # call_soon work belongs to no action, even inside a dialog's nested loop
+                tracing.run_in(None, self._run_callback, on_success, None)
+                continue
+            if future.cancelled() or self._is_stale(key, generation):
+                continue
+            tracing.run_in(context, self._deliver, future, on_success, on_error, on_done)
+
+        if not self._closed:
+            self._pump_id = self.root.after(POLL_INTERVAL_MS, self._pump)
+
+    def _deliver(self, future, on_success, on_error, on_done):
+        error = future.exception()
+        if error is None:
+            self._run_callback(on_success, future.result())
+        else:
+            self._run_callback(on_error, error)
+        self._run_callback(on_done)
+        # Widgets rebuilt by the callbacks are laid out and redrawn when Tk is next idle
+        tracing.settle(self.root)
+
+    @staticmethod
+    def _run_callback(callback, *args):
+        if callback is None:
+            return
+        try:
+            with tracing.span(f"callback: {getattr(callback, '__qualname__', callback)}", tracing.UI):
+                callback(*args)
+        except Exception as e:
+            print("[DEBUG] Data worker callback failed:", e)
+
+
+# ---------------------------------------------------------
+# In-widget busy state
+# ---------------------------------------------------------
+def set_busy(widget, busy, busy_text=None):
+    """
+    Disable a button while its request is in flight and restore it afterwards.
+    Parameters:
+    widget (R): CTkButton (or any widget supporting state/text)
+    busy (R): True to enter the busy state, False to leave it
+    busy_text (O): text shown on the widget while busy
+    """
+    try:
+        widget._busy = busy
+        if busy:
+            if busy_text and not hasattr(widget, "_idle_text"):
+                widget._idle_text = widget.cget("text")
+                widget.configure(text=busy_text)
+            widget.configure(state="disabled")
+        else:
+            if hasattr(widget, "_idle_text"):
+                widget.configure(text=widget._idle_text)
+                del widget._idle_text
+            widget.configure(state="normal")
+    except Exception:
+        # Widget destroyed while the request was running
+        pass
+
+
+def is_busy(widget):
+    """True while set_busy() holds the widget disabled (guards keyboard shortcuts that bypass it)."""
+    return getattr(widget, "_busy", False)
@@ -1,6 +1,7 @@
 # dialogs.py
 import customtkinter as ctk
 from tkinter import messagebox
+from utils.tracing import span, detached, DIALOG
 
 def show_info(title: str, message: str):
     """
@@ -9,7 +10,9 @@ def show_info(title: str, message: str):
     title (R): string shown in the popup title bar
     message (R): main text content of the info dialog
     """
-    messagebox.showinfo(title, message)
+    # The dialog runs a nested event loop; callbacks it dispatches are not part of this action
+    with span(f"dialog: {title}", DIALOG), detached():
+        messagebox.showinfo(title, message)
 
 
 def show_warning(title: str, message: str):
@@ -19,7 +22,8 @@ def show_warning(title: str, message: str):
     title (R): string shown in the popup title bar
     message (R): warning text to alert the user
     """
-    messagebox.showwarning(title, message)
+    with span(f"dialog: {title}", DIALOG), detached():
+        messagebox.showwarning(title, message)
 
 
 def show_error(title: str, message: str):
@@ -29,7 +33,8 @@ def show_error(title: str, message: str):
     title (R): string shown in the popup title bar
     message (R): error text explaining what went wrong
     """
-    messagebox.showerror(title, message)
+    with span(f"dialog: {title}", DIALOG), detached():
+        messagebox.showerror(title, message)
 
 
 def ask_confirm(title: str, message: str) -> bool:
@@ -41,7 +46,8 @@ def ask_confirm(title: str, message: str) -> bool:
     Returns:
     bool: True if user clicks 'Yes', False otherwise
     """
-    return messagebox.askyesno(title, message)
+    with span(f"dialog: {title}", DIALOG), detached():
+        return messagebox.askyesno(title, message)
 
 
 def ask_okcancel(title: str, message: str) -> bool:
@@ -53,4 +59,5 @@ def ask_okcancel(title: str, message: str) -> bool:
     Returns:
     bool: True if user clicks 'OK', False otherwise
     """
-    return messagebox.askokcancel(title, message)
+    with span(f"dialog: {title}", DIALOG), detached():
+        return messagebox.askokcancel(title, message)
@@ -0,0 +1,669 @@
+# File: utils/fake_supabase.py
+import base64
+import bisect
+import copy
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import random
+import secrets
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+# Columns that must stay unique per table (mirrors the hosted project's constraints)
+UNIQUE_COLUMNS = {
+    "user": ("user_name",),
+    "admin_accounts": ("email",),
+}
+# Primary key per table ("id" is auto-numbered when an insert leaves it out)
+PRIMARY_KEYS = {
+    "admin_accounts": "uuid",
+}
+
+# Admin seeded by create_fake_client() so the login screen can be passed
+FAKE_ADMIN_EMAIL = "admin@fake.local"
+FAKE_ADMIN_PASSWORD = "admin123"
+FAKE_ADMIN_USERNAME = "fakeadmin"
+SESSION_LIFETIME_S = 3600
+REFRESH_TOKEN_LIFETIME_S = 30 * 24 * 3600
+# Tokens are signed, not stored, so a saved session survives restarting the stand-in
+FAKE_TOKEN_SECRET = b"zarraga-fake-backend"
+
+# Environment knobs read by create_fake_client()
+ENV_USERS = "ZARRAGA_FAKE_USERS"                # rows in the user table (default DEFAULT_FAKE_USERS)
+ENV_LATENCY_MS = "ZARRAGA_FAKE_LATENCY_MS"      # added to every request
+ENV_JITTER_MS = "ZARRAGA_FAKE_JITTER_MS"        # +/- random spread around the latency
+ENV_RATE_LIMIT = "ZARRAGA_FAKE_RATE_LIMIT"      # requests per second, 0 = unlimited
+ENV_THROTTLE = "ZARRAGA_FAKE_THROTTLE"          # "delay" (queue excess requests) or "reject" (HTTP 429)
+ENV_FAILURE_RATE = "ZARRAGA_FAKE_FAILURE_RATE"  # fraction of requests failing with a network error
+ENV_OUTAGE = "ZARRAGA_FAKE_OUTAGE"              # "EVERY:FOR" seconds, e.g. "60:15"
+DEFAULT_FAKE_USERS = 500
+DEFAULT_FAKE_LATENCY_MS = 50
+
+
+class APIError(Exception):
+    """Server-side rejection (same role as postgrest's APIError; not a network error)."""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class AuthApiError(APIError):
+    """Auth rejection (bad credentials, duplicate e-mail, no session)."""
+
+
+class FakeOutage(ConnectionError):
+    """Injected outage or network failure; is_network_error() treats it like a dropped connection."""
+
+
+def _sign_token(kind, email, expires_at):
+    claims = {"kind": kind, "email": email, "exp": expires_at, "nonce": secrets.token_hex(4)}
+    body = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    mac = hmac.new(FAKE_TOKEN_SECRET, body.encode(), hashlib.sha256).hexdigest()
+    return f"{body}.{mac}"
+
+
+def _read_token(token, kind):
+    """Claims of a token issued by _sign_token, or None if it is forged, expired or of another kind."""
+    body, _, mac = str(token or "").rpartition(".")
+    expected = hmac.new(FAKE_TOKEN_SECRET, body.encode(), hashlib.sha256).hexdigest()
+    if not body or not hmac.compare_digest(mac, expected):
+        return None
+    claims = json.loads(base64.urlsafe_b64decode(body + "=" * (-len(body) % 4)))
+    if claims.get("kind") != kind or claims.get("exp", 0) <= time.time():
+        return None
+    return claims
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+def make_users(count, start_id=1):
+    """Rows for the mobile-app `user` table: user000001 / 0001, user000002 / 0002, ..."""
+    return [
+        {"id": i, "user_name": f"user{i:06d}", "pin": f"{i % 10000:04d}"}
+        for i in range(start_id, start_id + count)
+    ]
+
+
+# ---------------------------------------------------------
+# Tables
+# ---------------------------------------------------------
+class _Table:
+    """Rows kept in primary-key order so id-ordered pages are slices, not sorts."""
+
+    def __init__(self, name, rows=()):
+        self.name = name
+        self.pk = PRIMARY_KEYS.get(name, "id")
+        self.rows = []
+        self.ids = []
+        self.next_id = 1
+        self.unique = UNIQUE_COLUMNS.get(name, ())
+        self._unique_values = {column: {} for column in self.unique}
+        for row in rows:
+            self.add(dict(row))
+
+    def add(self, row):
+        if self.pk == "id" and row.get("id") is None:
+            row["id"] = self.next_id
+        if self.find(row.get(self.pk)) is not None:
+            raise APIError(f'duplicate key value violates unique constraint "{self.name}_pkey"', code="23505")
+        self._check_unique(row)
+        key = row.get(self.pk)
+        if isinstance(key, int):
+            self.next_id = max(self.next_id, key + 1)
+        if not self.ids or key > self.ids[-1]:
+            self.rows.append(row)
+            self.ids.append(key)
+        else:
+            position = bisect.bisect_left(self.ids, key)
+            self.rows.insert(position, row)
+            self.ids.insert(position, key)
+        for column in self.unique:
+            self._unique_values[column][row.get(column)] = row
+        return row
+
+    def update(self, row, values):
+        self._check_unique(values, ignore=row)
+        for column in self.unique:
+            if column in values:
+                self._unique_values[column].pop(row.get(column), None)
+                self._unique_values[column][values[column]] = row
+        row.update(values)
+        return row
+
+    def remove(self, row):
+        position = self.rows.index(row)
+        del self.rows[position]
+        del self.ids[position]
+        for column in self.unique:
+            self._unique_values[column].pop(row.get(column), None)
+
+    def find(self, key):
+        if key is None:
+            return None
+        position = bisect.bisect_left(self.ids, key)
+        if position < len(self.ids) and self.ids[position] == key:
+            return self.rows[position]
+        return None
+
+    def _check_unique(self, row, ignore=None):
+        for column in self.unique:
+            if column not in row:
+                continue
+            owner = self._unique_values[column].get(row[column])
+            if owner is not None and owner is not ignore:
+                raise APIError(
+                    f'duplicate key value violates unique constraint "{self.name}_{column}_key"', code="23505"
+                )
+
+
+# ---------------------------------------------------------
+# Query builder
+# ---------------------------------------------------------
+def _like_matcher(pattern, case_insensitive):
+    """Translate a LIKE pattern (% and _ wildcards, backslash escapes) to a predicate."""
+    import re
+    out, escaped = [], False
+    for ch in pattern:
+        if escaped:
+            out.append(re.escape(ch))
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch == "%":
+            out.append(".*")
+        elif ch == "_":
+            out.append(".")
+        else:
+            out.append(re.escape(ch))
+    regex = re.compile("".join(out) + r"\Z", re.DOTALL | (re.IGNORECASE if case_insensitive else 0))
+    return lambda value: value is not None and regex.match(str(value)) is not None
+
+
+_COMPARISONS = {
+    "eq": lambda a, b: a is not None and str(a) == str(b),
+    "neq": lambda a, b: a is None or str(a) != str(b),
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+}
+
+
+class FakeQuery:
+    """Chainable subset of the postgrest request builder used by the launcher."""
+
+    def __init__(self, client, table):
+        self._client = client
+        self._table = table
+        self._op = "select"
+        self._columns = "*"
+        self._payload = None
+        self._on_conflict = "id"
+        self._filters = []       # (column, predicate)
+        self._key_floors = []    # (column, op, value) for gt/gte: a floor on the primary key skips ahead
+        self._order = None       # (column, desc)
+        self._offset = 0
+        self._limit = None
+
+    # Operations
+    def select(self, columns="*", count=None):
+        self._op, self._columns = "select", columns
+        return self
+
+    def insert(self, rows, **kwargs):
+        self._op, self._payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict="id", **kwargs):
+        self._op, self._payload, self._on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def update(self, values, **kwargs):
+        self._op, self._payload = "update", values
+        return self
+
+    def delete(self, **kwargs):
+        self._op = "delete"
+        return self
+
+    # Filters
+    def _compare(self, op, column, value):
+        if op in ("gt", "gte"):
+            self._key_floors.append((column, op, value))
+        compare = _COMPARISONS[op]
+        self._filters.append((column, lambda v: compare(v, value)))
+        return self
+
+    def eq(self, column, value):
+        return self._compare("eq", column, value)
+
+    def neq(self, column, value):
+        return self._compare("neq", column, value)
+
+    def gt(self, column, value):
+        return self._compare("gt", column, value)
+
+    def gte(self, column, value):
+        return self._compare("gte", column, value)
+
+    def lt(self, column, value):
+        return self._compare("lt", column, value)
+
+    def lte(self, column, value):
+        return self._compare("lte", column, value)
+
+    def like(self, column, pattern):
+        self._filters.append((column, _like_matcher(pattern, False)))
+        return self
+
+    def ilike(self, column, pattern):
+        self._filters.append((column, _like_matcher(pattern, True)))
+        return self
+
+    def in_(self, column, values):
+        wanted = {str(v) for v in values}
+        self._filters.append((column, lambda v: v is not None and str(v) in wanted))
+        return self
+
+    # Shaping
+    def order(self, column, desc=False, **kwargs):
+        self._order = (column, desc)
+        return self
+
+    def limit(self, size, **kwargs):
+        self._limit = size
+        return self
+
+    def range(self, start, end, **kwargs):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    def execute(self):
+        return self._client._execute(self)
+
+    # Evaluation (called under the client lock)
+    def _matches(self, row):
+        return all(predicate(row.get(column)) for column, predicate in self._filters)
+
+    def _key_start(self, table):
+        """Index of the first row allowed by gt/gte filters on the primary key, and how many such filters there were."""
+        start, floors = 0, 0
+        for column, op, value in self._key_floors:
+            if column == table.pk:
+                floors += 1
+                try:
+                    start = max(start, (bisect.bisect_right if op == "gt" else bisect.bisect_left)(table.ids, value))
+                except TypeError:
+                    pass
+        return start, floors
+
+    def _candidates(self, table):
+        start, _ = self._key_start(table)
+        return (row for row in itertools.islice(table.rows, start, None) if self._matches(row))
+
+    def _selected_rows(self, table):
+        column, desc = self._order or (table.pk, False)
+        start, floors = self._key_start(table)
+        if column == table.pk and not desc and floors == len(self._filters):
+            # Plain key-ordered page: a slice, however deep the offset
+            start += self._offset
+            stop = None if self._limit is None else start + self._limit
+            return table.rows[start:stop]
+
+        rows = self._candidates(table)
+        if column != table.pk or desc:
+            rows = sorted(rows, key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        stop = None if self._limit is None else self._offset + self._limit
+        return list(itertools.islice(rows, self._offset, stop))
+
+    def _project(self, row):
+        if self._columns.strip() == "*":
+            return dict(row)
+        return {column.strip(): row.get(column.strip()) for column in self._columns.split(",")}
+
+
+# ---------------------------------------------------------
+# Client
+# ---------------------------------------------------------
+class FakeSupabase:
+    """
+    In-process stand-in for the Supabase client, for benchmarks and
+    load tests without a network. Tables and auth users live in memory.
+
+    Every request (table execute() or auth call) first goes through the
+    fault injection below, in this order:
+    outage: scheduled (outage_every/outage_for) or forced with set_outage();
+    raises FakeOutage
+    failure_rate: random fraction of requests raising FakeOutage
+    rate_limit: requests per second with a burst allowance; excess requests
+    wait ("delay") or fail with a 429 APIError ("reject")
+    latency +/- jitter: sleep before answering
+    Thread-safe.
+    """
+
+    def __init__(self, tables=None, latency=0.0, jitter=0.0, rate_limit=0.0, burst=10,
+                 throttle="delay", failure_rate=0.0, outage_every=0.0, outage_for=0.0):
+        """
+        Parameters:
+        tables (O): {table name: [row dicts]} initial contents
+        latency (O): seconds added to every request
+        jitter (O): seconds of uniform random spread around latency
+        rate_limit (O): requests per second before throttling, 0 disables it
+        burst (O): requests allowed back to back before the rate limit applies
+        throttle (O): "delay" or "reject"
+        failure_rate (O): probability (0-1) that a request fails with a network error
+        outage_every, outage_for (O): the backend is down for the last outage_for seconds of every outage_every
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.burst = max(1, burst)
+        self.throttle = throttle
+        self.failure_rate = failure_rate
+        self.outage_every = outage_every
+        self.outage_for = outage_for
+        self.request_count = 0
+        self.rejected_count = 0
+        self._forced_outage = None
+        self._started = time.monotonic()
+        self._throttle_lock = threading.Lock()
+        self._theoretical_arrival = 0.0
+        self._lock = threading.Lock()
+        self._tables = {name: _Table(name, rows) for name, rows in (tables or {}).items()}
+        self.auth = FakeAuth(self)
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rows(self, name):
+        """Copy of a table's rows (for assertions)."""
+        with self._lock:
+            return copy.deepcopy(self._get_table(name).rows)
+
+    def _get_table(self, name):
+        if name not in self._tables:
+            self._tables[name] = _Table(name)
+        return self._tables[name]
+
+    # ---------------------------------------------------------
+    # Fault injection
+    # ---------------------------------------------------------
+    def set_outage(self, down):
+        """Force the backend down (True) or up (False); None returns to the schedule."""
+        self._forced_outage = down
+
+    def in_outage(self):
+        if self._forced_outage is not None:
+            return self._forced_outage
+        if self.outage_every <= 0 or self.outage_for <= 0:
+            return False
+        phase = (time.monotonic() - self._started) % self.outage_every
+        return phase >= self.outage_every - self.outage_for
+
+    def _throttle_wait(self):
+        """Seconds this request must wait under the rate limit (GCRA), 0 if it may go now."""
+        if self.rate_limit <= 0:
+            return 0.0
+        interval = 1.0 / self.rate_limit
+        with self._throttle_lock:
+            now = time.monotonic()
+            arrival = max(self._theoretical_arrival, now)
+            wait = arrival - now - (self.burst - 1) * interval
+            if wait > 0 and self.throttle == "reject":
+                return wait
+            self._theoretical_arrival = arrival + interval
+            return max(0.0, wait)
+
+    def _before_request(self):
+        delay = self.latency
+        if self.jitter:
+            delay += random.uniform(-self.jitter, self.jitter)
+        delay = max(0.0, delay)
+
+        if self.in_outage():
+            time.sleep(delay)
+            raise FakeOutage("Simulated outage: backend unreachable")
+        if self.failure_rate and random.random() < self.failure_rate:
+            time.sleep(delay)
+            raise FakeOutage("Simulated network failure")
+
+        wait = self._throttle_wait()
+        if wait and self.throttle == "reject":
+            self.rejected_count += 1
+            raise APIError("Too Many Requests", code="429")
+        if delay + wait > 0:
+            time.sleep(delay + wait)
+
+    def _execute(self, query):
+        self._before_request()
+        with self._lock:
+            self.request_count += 1
+            table = self._get_table(query._table)
+            op = query._op
+
+            if op == "select":
+                return FakeResponse([query._project(row) for row in query._selected_rows(table)])
+
+            if op == "insert":
+                payload = query._payload if isinstance(query._payload, list) else [query._payload]
+                # All-or-nothing, like a single INSERT statement
+                for row in payload:
+                    if table.find(row.get(table.pk)) is not None:
+                        raise APIError(f'duplicate key value violates unique constraint "{table.name}_pkey"',
+                                       code="23505")
+                    table._check_unique(row)
+                seen = set()
+                for row in payload:
+                    for column in table.unique:
+                        if (column, row.get(column)) in seen:
+                            raise APIError(f'duplicate key value violates unique constraint "{table.name}_{column}_key"',
+                                           code="23505")
+                        seen.add((column, row.get(column)))
+                return FakeResponse([dict(table.add(dict(row))) for row in payload])
+
+            if op == "upsert":
+                payload = query._payload if isinstance(query._payload, list) else [query._payload]
+                key = query._on_conflict
+                out = []
+                for row in payload:
+                    existing = table.find(row.get(key)) if key == table.pk else next(
+                        (r for r in table.rows if r.get(key) == row.get(key)), None)
+                    out.append(dict(table.update(existing, row) if existing else table.add(dict(row))))
+                return FakeResponse(out)
+
+            matching = [row for row in query._candidates(table)]
+            if op == "update":
+                return FakeResponse([dict(table.update(row, query._payload)) for row in matching])
+            if op == "delete":
+                for row in matching:
+                    table.remove(row)
+                return FakeResponse([dict(row) for row in matching])
+            raise APIError(f"Unsupported operation: {op}")
+
+
+# ---------------------------------------------------------
+# Auth
+# ---------------------------------------------------------
+class FakeAuth:
+    """Subset of the gotrue client used by the launcher (same call shapes and result attributes)."""
+
+    def __init__(self, client):
+        self._client = client
+        self._lock = threading.RLock()
+        self._users = {}         # email -> {"user": user, "password": str}
+        self._session = None
+        self._revoked = set()
+        self.reset_requests = []
+
+    def add_user(self, email, password, metadata=None):
+        """Create an auth user directly (no latency or fault injection). Returns the user."""
+        user = SimpleNamespace(
+            id=str(uuid.uuid4()),
+            email=email,
+            user_metadata=dict(metadata or {}),
+            created_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        )
+        with self._lock:
+            self._users[email.lower()] = {"user": user, "password": password}
+        return user
+
+    def _new_session(self, user):
+        now = int(time.time())
+        return SimpleNamespace(
+            access_token=_sign_token("access", user.email, now + SESSION_LIFETIME_S),
+            refresh_token=_sign_token("refresh", user.email, now + REFRESH_TOKEN_LIFETIME_S),
+            token_type="bearer",
+            expires_in=SESSION_LIFETIME_S,
+            expires_at=now + SESSION_LIFETIME_S,
+            user=user,
+        )
+
+    def _user_for(self, claims):
+        entry = self._users.get(str(claims["email"]).lower()) if claims else None
+        return entry["user"] if entry else None
+
+    def sign_in_with_password(self, credentials):
+        self._client._before_request()
+        with self._lock:
+            entry = self._users.get(str(credentials.get("email", "")).lower())
+            if entry is None or entry["password"] != credentials.get("password"):
+                raise AuthApiError("Invalid login credentials", code="400")
+            self._session = self._new_session(entry["user"])
+            return SimpleNamespace(user=entry["user"], session=self._session)
+
+    def sign_up(self, credentials):
+        self._client._before_request()
+        email = str(credentials.get("email", ""))
+        if len(credentials.get("password") or "") < 6:
+            raise AuthApiError("Password should be at least 6 characters.", code="422")
+        with self._lock:
+            if email.lower() in self._users:
+                raise AuthApiError("User already registered", code="422")
+            metadata = (credentials.get("options") or {}).get("data")
+            user = self.add_user(email, credentials["password"], metadata)
+        return SimpleNamespace(user=user, session=None)
+
+    def update_user(self, attributes):
+        self._client._before_request()
+        with self._lock:
+            if self._session is None:
+                raise AuthApiError("Auth session missing!", code="401")
+            user = self._session.user
+            entry = self._users[user.email.lower()]
+            if "password" in attributes:
+                entry["password"] = attributes["password"]
+            if "data" in attributes:
+                user.user_metadata.update(attributes["data"])
+            if "email" in attributes:
+                self._users.pop(user.email.lower())
+                user.email = attributes["email"]
+                self._users[user.email.lower()] = entry
+            return SimpleNamespace(user=user)
+
+    def sign_out(self, options=None):
+        self._client._before_request()
+        with self._lock:
+            if self._session is not None:
+                self._revoked.add(self._session.refresh_token)
+            self._session = None
+
+    def set_session(self, access_token, refresh_token):
+        """Adopt a saved session; refreshes it when the access token has expired."""
+        self._client._before_request()
+        with self._lock:
+            claims = _read_token(access_token, "access")
+            user = self._user_for(claims)
+            if user is None or refresh_token in self._revoked:
+                return self._refresh(refresh_token)
+            self._session = SimpleNamespace(
+                access_token=access_token,
+                refresh_token=refresh_token,
+                token_type="bearer",
+                expires_in=int(claims["exp"] - time.time()),
+                expires_at=claims["exp"],
+                user=user,
+            )
+            return SimpleNamespace(user=user, session=self._session)
+
+    def refresh_session(self, refresh_token=None):
+        self._client._before_request()
+        with self._lock:
+            if refresh_token is None:
+                if self._session is None:
+                    raise AuthApiError("Auth session missing!", code="401")
+                refresh_token = self._session.refresh_token
+            return self._refresh(refresh_token)
+
+    def _refresh(self, refresh_token):
+        # Refresh tokens are single use, as on the hosted project
+        user = self._user_for(_read_token(refresh_token, "refresh"))
+        if user is None or refresh_token in self._revoked:
+            raise AuthApiError("Invalid Refresh Token: Refresh Token Not Found", code="400")
+        self._revoked.add(refresh_token)
+        self._session = self._new_session(user)
+        return SimpleNamespace(user=user, session=self._session)
+
+    def reset_password_for_email(self, email, options=None):
+        self._client._before_request()
+        self.reset_requests.append((email, dict(options or {})))
+
+    def get_session(self):
+        return self._session
+
+    def get_user(self, jwt=None):
+        return SimpleNamespace(user=self._session.user) if self._session else None
+
+
+# ---------------------------------------------------------
+# Start-up selection (supabase_init with ZARRAGA_BACKEND=fake)
+# ---------------------------------------------------------
+def _env_float(name, default=0.0):
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        print(f"[DEBUG] Ignoring invalid {name}={os.getenv(name)!r}")
+        return float(default)
+
+
+def create_fake_client():
+    """
+    Build a FakeSupabase configured from the ZARRAGA_FAKE_* environment
+    variables, seeded with ZARRAGA_FAKE_USERS mobile-app accounts and one
+    admin (FAKE_ADMIN_EMAIL / FAKE_ADMIN_PASSWORD).
+    """
+    outage_every, outage_for = 0.0, 0.0
+    outage = os.getenv(ENV_OUTAGE, "")
+    if outage:
+        try:
+            outage_every, outage_for = (float(part) for part in outage.split(":", 1))
+        except ValueError:
+            print(f"[DEBUG] Ignoring invalid {ENV_OUTAGE}={outage!r} (expected EVERY:FOR seconds)")
+
+    client = FakeSupabase(
+        tables={"user": make_users(int(_env_float(ENV_USERS, DEFAULT_FAKE_USERS)))},
+        latency=_env_float(ENV_LATENCY_MS, DEFAULT_FAKE_LATENCY_MS) / 1000,
+        jitter=_env_float(ENV_JITTER_MS) / 1000,
+        rate_limit=_env_float(ENV_RATE_LIMIT),
+        throttle=os.getenv(ENV_THROTTLE, "delay"),
+        failure_rate=_env_float(ENV_FAILURE_RATE),
+        outage_every=outage_every,
+        outage_for=outage_for,
+    )
+    admin = client.auth.add_user(FAKE_ADMIN_EMAIL, FAKE_ADMIN_PASSWORD, {"username": FAKE_ADMIN_USERNAME})
+    client._get_table("admin_accounts").add(
+        {"uuid": admin.id, "username": FAKE_ADMIN_USERNAME, "email": FAKE_ADMIN_EMAIL}
+    )
+    print(f"[DEBUG] Using fake Supabase backend ({len(client._get_table('user').rows)} users, "
+          f"latency {client.latency * 1000:.0f}ms, admin {FAKE_ADMIN_EMAIL})")
+    return client
@@ -0,0 +1,164 @@
+# File: utils/search_index.py
+import bisect
+import heapq
+import threading
+
+DEFAULT_RESULT_LIMIT = 500
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class AccountSearchIndex:
+    """
+    In-memory username/id index for instant type-ahead over the account list.
+
+    Queries match anywhere in the username, like the server search: three
+    or more characters through a trigram lookup, shorter ones by scanning
+    the names. Digit-only queries also match id prefixes. Results are ranked:
+    exact > prefix > start of a word > substring, then shorter names first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = {}
+        self._names = {}
+        self._trigrams = {}
+        self._sorted_names = []
+        self._sorted_ids = []
+
+    # ---------------------------------------------------------
+    # Maintenance
+    # ---------------------------------------------------------
+    def rebuild(self, records):
+        """Replace the index contents (safe to call from a worker thread)."""
+        built = AccountSearchIndex()
+        for record in records:
+            built._add(record)
+        built._sorted_names.sort()
+        built._sorted_ids.sort()
+
+        with self._lock:
+            self._records = built._records
+            self._names = built._names
+            self._trigrams = built._trigrams
+            self._sorted_names = built._sorted_names
+            self._sorted_ids = built._sorted_ids
+
+    def add(self, record):
+        """Insert a new record or re-index an edited one."""
+        with self._lock:
+            self._remove(record["id"])
+            self._add(record, keep_sorted=True)
+
+    def remove(self, record_id):
+        with self._lock:
+            self._remove(record_id)
+
+    def __len__(self):
+        return len(self._records)
+
+    def _add(self, record, keep_sorted=False):
+        record_id = record["id"]
+        name = (record.get("user_name") or "").lower()
+        self._records[record_id] = {"id": record_id, "user_name": record.get("user_name") or ""}
+        self._names[record_id] = name
+        for gram in _trigrams(name):
+            self._trigrams.setdefault(gram, set()).add(record_id)
+
+        if keep_sorted:
+            bisect.insort(self._sorted_names, (name, record_id))
+            bisect.insort(self._sorted_ids, (str(record_id), record_id))
+        else:
+            self._sorted_names.append((name, record_id))
+            self._sorted_ids.append((str(record_id), record_id))
+
+    def _remove(self, record_id):
+        name = self._names.pop(record_id, None)
+        if name is None:
+            return
+        del self._records[record_id]
+        for gram in _trigrams(name):
+            ids = self._trigrams.get(gram)
+            if ids is not None:
+                ids.discard(record_id)
+                if not ids:
+                    del self._trigrams[gram]
+        self._discard_sorted(self._sorted_names, (name, record_id))
+        self._discard_sorted(self._sorted_ids, (str(record_id), record_id))
+
+    @staticmethod
+    def _discard_sorted(entries, entry):
+        i = bisect.bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+
+    # ---------------------------------------------------------
+    # Lookup
+    # ---------------------------------------------------------
+    def search(self, query, limit=DEFAULT_RESULT_LIMIT):
+        """
+        Return up to limit ranked records matching query.
+        Parameters:
+        query (R): text typed by the user
+        limit (O): maximum number of results
+        """
+        q = query.strip().lower()
+        if not q:
+            return []
+
+        with self._lock:
+            if len(q) >= 3:
+                candidates = self._prefix_ids(self._sorted_names, q) | self._substring_ids(q)
+            else:
+                # No trigrams to look up; a scan of the cached names is cheap enough
+                candidates = {rid for rid, name in self._names.items() if q in name}
+            if q.isdigit():
+                candidates |= self._prefix_ids(self._sorted_ids, q, cap=limit)
+
+            ranked = heapq.nsmallest(limit, candidates, key=lambda rid: self._rank(rid, q))
+            return [self._records[rid] for rid in ranked]
+
+    @staticmethod
+    def _prefix_ids(entries, prefix, cap=None):
+        ids = set()
+        i = bisect.bisect_left(entries, (prefix,))
+        while i < len(entries) and entries[i][0].startswith(prefix):
+            if cap is not None and len(ids) >= cap:
+                break
+            ids.add(entries[i][1])
+            i += 1
+        return ids
+
+    def _substring_ids(self, q):
+        postings = []
+        for gram in _trigrams(q):
+            ids = self._trigrams.get(gram)
+            if not ids:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                return candidates
+        # Trigrams can match out of order; confirm the real substring
+        return {rid for rid in candidates if q in self._names[rid]}
+
+    def _rank(self, record_id, q):
+        name = self._names[record_id]
+        position = name.find(q)
+        if name == q or str(record_id) == q:
+            tier = 0
+        elif position == 0:
+            tier = 1
+        elif position > 0 and not name[position - 1].isalnum():
+            tier = 2
+        elif position > 0:
+            tier = 3
+        else:
+            tier = 4  # id-prefix match only
+        return (tier, position, len(name), name)
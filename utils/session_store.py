@@ -0,0 +1,279 @@
+# File: utils/session_store.py
+import json
+import os
+import sys
+import threading
+import time
+
+from utils.app_paths import app_data_path
+from utils.connectivity import is_network_error
+
+KEYRING_SERVICE = "ZarragaFloodMonitoring"
+KEYRING_ENTRY = "supabase_session"
+# DPAPI-encrypted copy (Windows without keyring)
+DPAPI_FILENAME = "session.dat"
+# Unencrypted copy written by earlier builds; only ever deleted now
+PLAIN_FILENAME = "session.json"
+
+# Refresh this long before the access token expires
+REFRESH_MARGIN_S = 5 * 60
+# Retry delay after a refresh failed for lack of a connection
+REFRESH_RETRY_S = 30
+# Longest single sleep of the refresh thread (re-checks the wall clock after suspend/resume)
+MAX_SLEEP_S = 60
+
+
+def session_to_dict(session):
+    """The fields of a Supabase session needed to restore and refresh it."""
+    expires_at = getattr(session, "expires_at", None)
+    if not expires_at:
+        expires_at = int(time.time()) + int(getattr(session, "expires_in", 3600) or 3600)
+    user = getattr(session, "user", None)
+    return {
+        "access_token": session.access_token,
+        "refresh_token": session.refresh_token,
+        "expires_at": int(expires_at),
+        "user_id": getattr(user, "id", None),
+        "email": getattr(user, "email", None),
+    }
+
+
+# ---------------------------------------------------------
+# Windows DPAPI (per-user encryption, no key to manage)
+# ---------------------------------------------------------
+def _dpapi(data, protect):
+    import ctypes
+    from ctypes import wintypes
+
+    class DataBlob(ctypes.Structure):
+        _fields_ = [("cbData", wintypes.DWORD), ("pbData", ctypes.POINTER(ctypes.c_char))]
+
+    CRYPTPROTECT_UI_FORBIDDEN = 0x1
+    buffer = ctypes.create_string_buffer(data, len(data))
+    blob_in = DataBlob(len(data), ctypes.cast(buffer, ctypes.POINTER(ctypes.c_char)))
+    blob_out = DataBlob()
+    crypt32 = ctypes.windll.crypt32
+    if protect:
+        ok = crypt32.CryptProtectData(
+            ctypes.byref(blob_in), ctypes.c_wchar_p(KEYRING_SERVICE), None, None, None,
+            CRYPTPROTECT_UI_FORBIDDEN, ctypes.byref(blob_out)
+        )
+    else:
+        ok = crypt32.CryptUnprotectData(
+            ctypes.byref(blob_in), None, None, None, None, CRYPTPROTECT_UI_FORBIDDEN, ctypes.byref(blob_out)
+        )
+    if not ok:
+        raise ctypes.WinError()
+    try:
+        return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+    finally:
+        ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+
+
+def _write_private(path, data):
+    """Write bytes readable by the current user only, replacing path atomically."""
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SessionStore:
+    """
+    Keeps the signed-in Supabase session between launches.
+
+    Stored in the OS credential store through the optional keyring package.
+    Without it the session is DPAPI-encrypted into the app-data directory on
+    Windows; elsewhere it is not kept at all (the refresh token is never
+    written to disk unencrypted), so the user logs in on every launch.
+    All methods block (keyring may talk to a system service); call them off
+    the Tk thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.dpapi_path = app_data_path(DPAPI_FILENAME)
+        self.plain_path = app_data_path(PLAIN_FILENAME)
+
+    @staticmethod
+    def _keyring():
+        try:
+            import keyring
+            return keyring
+        except Exception:
+            return None
+
+    def load(self):
+        """Return the saved session dict, or None."""
+        with self._lock:
+            _remove(self.plain_path)
+            for read in (self._load_keyring, self._load_dpapi):
+                try:
+                    raw = read()
+                except Exception as e:
+                    print(f"[DEBUG] Saved session unreadable ({read.__name__}): {e}")
+                    continue
+                if raw:
+                    try:
+                        session = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if session.get("refresh_token"):
+                        return session
+            return None
+
+    def save(self, session):
+        """
+        Save a session dict in the OS credential store, or DPAPI-encrypted on Windows.
+        Returns:
+        bool: False if no secure store is available (nothing was saved)
+        """
+        raw = json.dumps(session)
+        with self._lock:
+            _remove(self.plain_path)
+            keyring = self._keyring()
+            if keyring is not None:
+                try:
+                    keyring.set_password(KEYRING_SERVICE, KEYRING_ENTRY, raw)
+                    _remove(self.dpapi_path)
+                    return True
+                except Exception as e:
+                    print("[DEBUG] Keyring unavailable:", e)
+            if sys.platform == "win32":
+                try:
+                    _write_private(self.dpapi_path, _dpapi(raw.encode("utf-8"), protect=True))
+                    return True
+                except OSError as e:
+                    print("[DEBUG] DPAPI unavailable:", e)
+            print("[DEBUG] No secure storage available, the session is not kept between launches")
+            return False
+
+    def clear(self):
+        with self._lock:
+            keyring = self._keyring()
+            if keyring is not None:
+                try:
+                    keyring.delete_password(KEYRING_SERVICE, KEYRING_ENTRY)
+                except Exception:
+                    pass
+            _remove(self.dpapi_path)
+            _remove(self.plain_path)
+
+    def _load_keyring(self):
+        keyring = self._keyring()
+        return keyring.get_password(KEYRING_SERVICE, KEYRING_ENTRY) if keyring is not None else None
+
+    def _load_dpapi(self):
+        if sys.platform != "win32" or not os.path.exists(self.dpapi_path):
+            return None
+        with open(self.dpapi_path, "rb") as f:
+            return _dpapi(f.read(), protect=False).decode("utf-8")
+
+
+
+# ---------------------------------------------------------
+# Background refresh
+# ---------------------------------------------------------
+class SessionRefresher:
+    """
+    Refreshes the access token REFRESH_MARGIN_S before it expires, on its
+    own thread, and saves each new session. The first API call after the app
+    sat idle then never waits for a token refresh.
+
+    A refresh that fails for lack of a connection is retried every
+    REFRESH_RETRY_S. One the server rejects (refresh token revoked or
+    expired) clears the saved session and calls on_expired().
+    """
+
+    def __init__(self, get_client, store, on_refreshed=None, on_expired=None):
+        """
+        Parameters:
+        get_client (R): callable returning the Supabase client (may block until it exists)
+        store (R): SessionStore the refreshed sessions are saved to
+        on_refreshed (O): called from the refresh thread with each new session dict
+        on_expired (O): called from the refresh thread when the session can no longer be refreshed
+        """
+        self.get_client = get_client
+        self.store = store
+        self.on_refreshed = on_refreshed
+        self.on_expired = on_expired
+        self._session = None
+        self._retry_at = 0.0
+        self._wake = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def start(self, session):
+        """Track (or replace) the session to keep fresh."""
+        with self._wake:
+            self._session = session
+            self._retry_at = 0.0
+            self._wake.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="session-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop refreshing (e.g. on logout); start() resumes."""
+        with self._wake:
+            self._session = None
+            self._wake.notify()
+
+    def shutdown(self):
+        with self._wake:
+            self._closed = True
+            self._session = None
+            self._wake.notify()
+
+    def _run(self):
+        while True:
+            with self._wake:
+                if self._closed:
+                    return
+                session = self._session
+                if session is None:
+                    self._wake.wait()
+                    continue
+                due = max(session["expires_at"] - REFRESH_MARGIN_S, self._retry_at)
+                delay = due - time.time()
+                if delay > 0:
+                    self._wake.wait(min(delay, MAX_SLEEP_S))
+                    continue
+            self._refresh(session)
+
+    def _refresh(self, session):
+        try:
+            response = self.get_client().auth.refresh_session(session["refresh_token"])
+            fresh = session_to_dict(response.session)
+        except Exception as e:
+            with self._wake:
+                if self._session is not session:
+                    return
+                if is_network_error(e):
+                    print("[DEBUG] Session refresh postponed (offline):", e)
+                    self._retry_at = time.time() + REFRESH_RETRY_S
+                    return
+                self._session = None
+            print("[DEBUG] Session could not be refreshed:", e)
+            self.store.clear()
+            if self.on_expired:
+                self.on_expired()
+            return
+
+        with self._wake:
+            if self._session is not session:
+                # Logged out or replaced while the request was running
+                return
+            self._session = fresh
+            self._retry_at = 0.0
+        self.store.save(fresh)
+        if self.on_refreshed:
+            self.on_refreshed(fresh)
@@ -0,0 +1,185 @@
+# File: utils/stall_watchdog.py
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+
+from utils.app_paths import app_data_path
+
+# Milliseconds the mainloop may go without running the heartbeat before it counts as stalled
+# (0 turns the watchdog off)
+STALL_THRESHOLD_ENV = "ZARRAGA_STALL_THRESHOLD_MS"
+DEFAULT_STALL_THRESHOLD_MS = 500
+HEARTBEAT_INTERVAL_MS = 100
+# How often the side thread looks at the heartbeat
+CHECK_INTERVAL_S = 0.05
+
+STALL_LOG_FILENAME = "stalls.log"
+STALL_LOG_MAX_BYTES = 1_000_000
+STALL_LOG_BACKUPS = 3
+# Innermost frames kept in a logged stack
+MAX_STACK_FRAMES = 40
+
+
+def _stall_logger(path):
+    logger = logging.getLogger("zarraga.stalls")
+    if not logger.handlers:
+        handler = RotatingFileHandler(
+            path, maxBytes=STALL_LOG_MAX_BYTES, backupCount=STALL_LOG_BACKUPS, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def _is_tkinter_frame(frame):
+    parts = os.path.normpath(frame.filename).split(os.sep)
+    return "tkinter" in parts or "customtkinter" in parts
+
+
+def offending_callback(stack):
+    """
+    Best guess at the application callback that is blocking: the first
+    application frame entered from tkinter's dispatch (command, binding or
+    after() callback), else the innermost application frame.
+    """
+    for outer, inner in zip(stack, stack[1:]):
+        if _is_tkinter_frame(outer) and not _is_tkinter_frame(inner):
+            return f"{inner.name} ({os.path.basename(inner.filename)}:{inner.lineno})"
+    for frame in reversed(stack):
+        if not _is_tkinter_frame(frame):
+            return f"{frame.name} ({os.path.basename(frame.filename)}:{frame.lineno})"
+    return None
+
+
+class StallWatchdog:
+    """
+    Detects Tk mainloop stalls and records what the Tk thread was doing.
+
+    The Tk thread reschedules a heartbeat with after() every
+    HEARTBEAT_INTERVAL_MS. Nothing is watched until the first after_idle()
+    tick, i.e. until the mainloop is running, so window construction
+    before mainloop() is not reported as a stall. A side thread checks how long ago it last ran.
+    Once that exceeds the threshold, it samples the Tk thread's Python
+    stack with sys._current_frames(). It then writes a "stall" event
+    straight away, so a hang that never recovers is still logged. When
+    the heartbeat returns it writes a "stall_end" event with the full
+    duration. Events are JSON lines in a rotating log in the app-data
+    directory.
+    """
+
+    def __init__(self, root, page_name=None, threshold_ms=None, log_path=None):
+        """
+        Parameters:
+        root (R): Tk root; must be created on the calling thread
+        page_name (O): callable returning the name of the page on screen (read from the side thread)
+        threshold_ms (O): stall threshold, default from ZARRAGA_STALL_THRESHOLD_MS
+        log_path (O): stall log file, default stalls.log in the app-data directory
+        """
+        if threshold_ms is None:
+            try:
+                threshold_ms = int(os.getenv(STALL_THRESHOLD_ENV, DEFAULT_STALL_THRESHOLD_MS))
+            except ValueError:
+                threshold_ms = DEFAULT_STALL_THRESHOLD_MS
+        self.root = root
+        self.page_name = page_name
+        self.threshold = threshold_ms / 1000
+        self.log_path = log_path or app_data_path(STALL_LOG_FILENAME)
+        self.enabled = threshold_ms > 0
+        self.stall_count = 0
+
+        self._tk_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._after_id = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._logger = None
+
+    def start(self):
+        """Arm the watchdog; the heartbeat and the side thread begin on the mainloop's first idle tick."""
+        if not self.enabled or self._logger is not None:
+            return
+        self._logger = _stall_logger(self.log_path)
+        self._after_id = self.root.after_idle(self._first_beat)
+
+    def stop(self):
+        self._stop.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    # ---------------------------------------------------------
+    # Tk thread
+    # ---------------------------------------------------------
+    def _first_beat(self):
+        if self._stop.is_set():
+            return
+        self._beat()
+        self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def _beat(self):
+        self._last_beat = time.monotonic()
+        if not self._stop.is_set():
+            self._after_id = self.root.after(HEARTBEAT_INTERVAL_MS, self._beat)
+
+    # ---------------------------------------------------------
+    # Side thread
+    # ---------------------------------------------------------
+    def _watch(self):
+        stall = None
+        while not self._stop.wait(CHECK_INTERVAL_S):
+            # Heartbeats are HEARTBEAT_INTERVAL_MS apart even when the loop is idle
+            last_beat = self._last_beat
+            late = time.monotonic() - last_beat - HEARTBEAT_INTERVAL_MS / 1000
+
+            if stall is not None and last_beat != stall["last_beat"]:
+                gap = last_beat - stall["last_beat"] - HEARTBEAT_INTERVAL_MS / 1000
+                self._write("stall_end", stall, duration=gap)
+                stall = None
+            if stall is None and late > self.threshold:
+                stall = self._capture(last_beat)
+                self._write("stall", stall, duration=late)
+
+    def _capture(self, last_beat):
+        frame = sys._current_frames().get(self._tk_thread_id)
+        stack = traceback.extract_stack(frame) if frame is not None else []
+        try:
+            page = self.page_name() if self.page_name else None
+        except Exception:
+            page = None
+        self.stall_count += 1
+        return {
+            "id": self.stall_count,
+            "last_beat": last_beat,
+            "page": page,
+            "callback": offending_callback(stack),
+            "stack": traceback.format_list(stack[-MAX_STACK_FRAMES:]),
+        }
+
+    def _write(self, event, stall, duration):
+        record = {
+            "event": event,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "stall_id": stall["id"],
+            "duration_ms": round(duration * 1000),
+            "threshold_ms": round(self.threshold * 1000),
+            "page": stall["page"],
+            "callback": stall["callback"],
+        }
+        if event == "stall":
+            record["stack"] = stall["stack"]
+        print(f"[DEBUG] Mainloop {event}: {record['duration_ms']} ms in {record['callback']} (page {record['page']})")
+        try:
+            self._logger.info(json.dumps(record))
+        except Exception as e:
+            print("[DEBUG] Could not write stall log:", e)
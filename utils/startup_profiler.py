@@ -0,0 +1,158 @@
+# File: utils/startup_profiler.py
+import builtins
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+PROFILE_FLAG = "--profile-startup"
+# "1" writes to the app-data directory, any other value is used as the report path
+PROFILE_ENV = "ZARRAGA_PROFILE_STARTUP"
+REPORT_FILENAME = "startup_profile.json"
+# Slowest imports kept in the report
+TOP_IMPORTS = 40
+
+
+class StartupProfiler:
+    """
+    Times launcher start-up: named phases, per-module import time and time
+    to first paint. Does nothing unless enabled with --profile-startup or
+    ZARRAGA_PROFILE_STARTUP; phase() and mark() are cheap no-ops otherwise.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.output_path = None
+        self.t0 = time.perf_counter()
+        self.phases = []
+        self.marks = {}
+        self.imports = []
+        self._local = threading.local()
+        self._original_import = None
+        self._open_step = None
+        self._written = False
+
+    # ---------------------------------------------------------
+    # Setup
+    # ---------------------------------------------------------
+    def configure(self, argv=None):
+        """Enable profiling if requested on the command line or in the environment."""
+        argv = sys.argv if argv is None else argv
+        env_value = os.getenv(PROFILE_ENV, "")
+        if PROFILE_FLAG not in argv and not env_value:
+            return
+        if PROFILE_FLAG in argv:
+            argv.remove(PROFILE_FLAG)
+        self.output_path = env_value if env_value not in ("", "1") else None
+        self.enabled = True
+        self._install_import_hook()
+
+    def _install_import_hook(self):
+        self._original_import = builtins.__import__
+        original = self._original_import
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules:
+                return original(name, globals, locals, fromlist, level)
+            depth = getattr(self._local, "depth", 0)
+            self._local.depth = depth + 1
+            start = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                self._local.depth = depth
+                self.imports.append({
+                    "module": name,
+                    "depth": depth,
+                    "thread": threading.current_thread().name,
+                    "ms": round((time.perf_counter() - start) * 1000, 3),
+                })
+
+        builtins.__import__ = timed_import
+
+    def _remove_import_hook(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    # ---------------------------------------------------------
+    # Recording
+    # ---------------------------------------------------------
+    def _now_ms(self):
+        return round((time.perf_counter() - self.t0) * 1000, 3)
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as a named start-up phase."""
+        if not self.enabled:
+            yield
+            return
+        start = self._now_ms()
+        try:
+            yield
+        finally:
+            self.phases.append({"phase": name, "start_ms": start, "ms": round(self._now_ms() - start, 3)})
+
+    def step(self, name=None):
+        """
+        Close the current sequential phase and open the next one.
+        Parameters:
+        name (O): phase to start; None only closes the current one
+        """
+        if not self.enabled:
+            return
+        now = self._now_ms()
+        if self._open_step is not None:
+            step_name, start = self._open_step
+            self.phases.append({"phase": step_name, "start_ms": start, "ms": round(now - start, 3)})
+        self._open_step = (name, now) if name else None
+
+    def mark(self, name):
+        """Record a point in time (e.g. first_paint) relative to process start."""
+        if self.enabled and name not in self.marks:
+            self.marks[name] = self._now_ms()
+
+    # ---------------------------------------------------------
+    # Report
+    # ---------------------------------------------------------
+    def finish(self):
+        """Stop import tracing and write the JSON report (once)."""
+        if not self.enabled or self._written:
+            return None
+        self._written = True
+        self.step(None)
+        self._remove_import_hook()
+
+        path = self.output_path
+        if path is None:
+            from utils.app_paths import app_data_path
+            path = app_data_path(REPORT_FILENAME)
+
+        top_level = [entry for entry in self.imports if entry["depth"] == 0]
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "frozen": hasattr(sys, "_MEIPASS"),
+            "total_ms": self._now_ms(),
+            "marks": self.marks,
+            "phases": self.phases,
+            "imports": {
+                "top_level_ms": round(sum(entry["ms"] for entry in top_level), 3),
+                "top_level": sorted(top_level, key=lambda entry: -entry["ms"]),
+                "slowest": sorted(self.imports, key=lambda entry: -entry["ms"])[:TOP_IMPORTS],
+            },
+        }
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"[DEBUG] Startup profile written to {path}")
+        except OSError as e:
+            print("[DEBUG] Could not write startup profile:", e)
+        return path
+
+
+PROFILER = StartupProfiler()
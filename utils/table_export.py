@@ -0,0 +1,156 @@
+# File: utils/table_export.py
+import csv
+import json
+import os
+import threading
+import time
+
+# Rows fetched per request
+EXPORT_PAGE_SIZE = 1000
+# Exportable tables and the unique column used to page through them
+EXPORT_TABLES = {
+    "user": "id",
+    "admin_accounts": "uuid",
+}
+# Columns every export of the table has (the CSV header, even for an empty table);
+# other columns the server returns follow them
+EXPORT_COLUMNS = {
+    "user": ("id", "user_name", "pin"),
+    "admin_accounts": ("uuid", "username", "email"),
+}
+CSV = "csv"
+NDJSON = "ndjson"
+
+
+class ExportResult:
+    """Outcome of one export."""
+
+    def __init__(self, table, path):
+        self.table = table
+        self.path = path
+        self.rows = 0
+        self.seconds = 0.0
+        self.cancelled = False
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def format_for_path(path):
+    """NDJSON for .ndjson/.jsonl files, CSV otherwise."""
+    return NDJSON if path.lower().endswith((".ndjson", ".jsonl")) else CSV
+
+
+class TableExporter:
+    """
+    Streams a whole table to a CSV or NDJSON file.
+
+    The table is read page_size rows at a time with keyset paging on its
+    unique column (rows after the last key seen), so memory stays flat and
+    later pages cost the same as the first. Rows are written as soon as a
+    page arrives into <path>.part, which replaces path only when the export
+    completes. run() blocks; call it from a worker thread.
+    """
+
+    def __init__(self, table, path, page_size=EXPORT_PAGE_SIZE, on_progress=None):
+        """
+        Parameters:
+        table (R): one of EXPORT_TABLES
+        path (R): output file; the extension picks the format (see format_for_path)
+        page_size (O): rows per request
+        on_progress (O): called from the worker as on_progress(rows, rows_per_second)
+        """
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Table '{table}' cannot be exported.")
+        self.table = table
+        self.key = EXPORT_TABLES[table]
+        self.path = path
+        self.format = format_for_path(path)
+        self.page_size = max(1, int(page_size))
+        self.on_progress = on_progress
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Stop after the current page; the partial file is removed."""
+        self._cancel.set()
+
+    def run(self, supabase):
+        """
+        Export the table.
+        Parameters:
+        supabase (R): Supabase client
+        Returns:
+        ExportResult
+        """
+        result = ExportResult(self.table, self.path)
+        part_path = self.path + ".part"
+        start = time.perf_counter()
+        try:
+            with open(part_path, "w", newline="", encoding="utf-8") as f:
+                writer = None
+                for page in self._pages(supabase):
+                    if self._cancel.is_set():
+                        result.cancelled = True
+                        break
+                    if self.format == CSV:
+                        if writer is None:
+                            writer = self._csv_writer(f, page[0])
+                        writer.writerows(page)
+                    else:
+                        f.writelines(json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in page)
+
+                    result.rows += len(page)
+                    result.seconds = time.perf_counter() - start
+                    self._report_progress(result)
+                if self.format == CSV and writer is None and not result.cancelled:
+                    # Empty table: still say which columns the export has
+                    self._csv_writer(f, {})
+        except BaseException:
+            _remove(part_path)
+            raise
+
+        result.seconds = time.perf_counter() - start
+        if result.cancelled:
+            _remove(part_path)
+        else:
+            os.replace(part_path, self.path)
+        print(f"[DEBUG] Exported {result.rows} rows from {self.table} in {result.seconds:.2f}s "
+              f"({result.rows_per_second:.0f} rows/s)")
+        return result
+
+    def _csv_writer(self, f, first_row):
+        """DictWriter with the header already written: the known columns, then any others in first_row."""
+        known = EXPORT_COLUMNS.get(self.table, ())
+        fieldnames = list(known) + [column for column in first_row if column not in known]
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        return writer
+
+    def _pages(self, supabase):
+        last_key = None
+        while True:
+            request = supabase.table(self.table).select("*")
+            if last_key is not None:
+                request = request.gt(self.key, last_key)
+            rows = request.order(self.key).limit(self.page_size).execute().data or []
+            if not rows:
+                return
+            yield rows
+            if len(rows) < self.page_size:
+                return
+            last_key = rows[-1][self.key]
+
+    def _report_progress(self, result):
+        if self.on_progress:
+            try:
+                self.on_progress(result.rows, result.rows_per_second)
+            except Exception as e:
+                print("[DEBUG] Export progress listener failed:", e)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,211 @@
+# File: utils/tracing.py
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.app_paths import app_data_path
+
+# "1" writes traces/trace-<timestamp>.jsonl in the app-data directory, any other value is the file path
+TRACE_ENV = "ZARRAGA_TRACE"
+TRACE_DIR = "traces"
+
+# Span categories (the "cat" field; tools/trace_to_chrome.py totals time per category)
+ACTION = "action"
+VALIDATE = "validate"
+NETWORK = "network"
+WORKER = "worker"
+UI = "ui"
+DIALOG = "dialog"
+LAYOUT = "layout"
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+_ids = itertools.count(1)
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "category", "start", "args")
+
+    def __init__(self, name, category, parent, args):
+        self.span_id = next(_ids)
+        self.trace_id = parent.trace_id if parent else self.span_id
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.category = category
+        self.start = time.perf_counter()
+        self.args = args
+
+
+class TraceWriter:
+    """
+    Appends spans to a JSONL file, one Chrome trace "complete" event per line
+    (ph "X", microsecond timestamps), so the file survives a crash.
+    tools/trace_to_chrome.py wraps it into a file the trace viewers open.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._named_threads = set()
+        self._pid = os.getpid()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, span, end):
+        thread = threading.current_thread()
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": round(span.start * 1e6),
+            "dur": round((end - span.start) * 1e6),
+            "pid": self._pid,
+            "tid": thread.ident,
+            "args": {"trace": span.trace_id, "span": span.span_id, "parent": span.parent_id, **span.args},
+        }
+        with self._lock:
+            if thread.ident not in self._named_threads:
+                self._named_threads.add(thread.ident)
+                self._file.write(json.dumps({
+                    "name": "thread_name", "ph": "M", "pid": self._pid, "tid": thread.ident,
+                    "args": {"name": thread.name},
+                }) + "\n")
+            self._file.write(json.dumps(event, default=str) + "\n")
+            self._file.flush()
+
+
+def _open_writer():
+    value = os.getenv(TRACE_ENV, "")
+    if not value:
+        return None
+    path = value if value != "1" else os.path.join(
+        app_data_path(TRACE_DIR), f"trace-{time.strftime('%Y%m%d-%H%M%S')}.jsonl"
+    )
+    try:
+        writer = TraceWriter(path)
+    except OSError as e:
+        print(f"[DEBUG] Tracing disabled, cannot write {path}: {e}")
+        return None
+    print(f"[DEBUG] Writing interaction traces to {path}")
+    return writer
+
+
+_writer = _open_writer()
+
+
+def enabled():
+    return _writer is not None
+
+
+# ---------------------------------------------------------
+# Spans
+# ---------------------------------------------------------
+@contextmanager
+def span(name, category=UI, **args):
+    """Time the block as a child of the current span; nothing is recorded outside a traced action."""
+    parent = _current_span.get() if _writer is not None else None
+    if parent is None:
+        yield None
+        return
+    current = Span(name, category, parent, args)
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        _current_span.reset(token)
+        _writer.write(current, time.perf_counter())
+
+
+@contextmanager
+def action(name, **args):
+    """Start a new trace for a user action (button press, Enter key, ...)."""
+    if _writer is None:
+        yield None
+        return
+    root = Span(name, ACTION, None, args)
+    token = _current_span.set(root)
+    try:
+        yield root
+    finally:
+        _current_span.reset(token)
+        _writer.write(root, time.perf_counter())
+
+
+def traced_action(name):
+    """Decorator for widget callbacks: each call starts a new trace."""
+    def decorate(callback):
+        @functools.wraps(callback)
+        def wrapper(*args, **kwargs):
+            with action(name):
+                return callback(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def record(name, start, category=UI, context=None, **args):
+    """
+    Write a span that started at perf_counter() time start and ends now,
+    e.g. a wait measured across callbacks. context (from capture()) sets its parent.
+    """
+    if _writer is None:
+        return
+    parent = context.get(_current_span) if context is not None else _current_span.get()
+    if parent is None:
+        return
+    finished = Span(name, category, parent, args)
+    finished.start = start
+    _writer.write(finished, time.perf_counter())
+
+
+# ---------------------------------------------------------
+# Propagation across threads and Tk callbacks
+# ---------------------------------------------------------
+def capture():
+    """Snapshot the current context to continue its trace elsewhere (None outside a traced action)."""
+    if _writer is None or _current_span.get() is None:
+        return None
+    return contextvars.copy_context()
+
+
+@contextmanager
+def detached():
+    """
+    Run the block outside any trace. Used around modal dialogs: their nested
+    event loop runs unrelated callbacks, which must not join the action that
+    opened the dialog.
+    """
+    if _current_span.get() is None:
+        yield
+        return
+    token = _current_span.set(None)
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+
+
+def run_in(context, callback, *args):
+    """
+    Run callback(*args) inside a context from capture(). With None it runs
+    outside any trace, whatever span happens to be current on this thread.
+    """
+    if context is None:
+        with detached():
+            return callback(*args)
+    return context.copy().run(callback, *args)
+
+
+def settle(root, context=None):
+    """
+    Record the Tk work queued by the current callback (geometry and redraw
+    run as idle tasks) as a layout span ending when the idle queue reaches it.
+    """
+    context = context or capture()
+    if context is None:
+        return
+    start = time.perf_counter()
+    root.after_idle(lambda: record("tk idle (layout/redraw)", start, LAYOUT, context))
@@ -0,0 +1,237 @@
+# File: utils/twin_handshake.py
+import ctypes
+import ctypes.util
+import json
+import os
+import secrets
+import selectors
+import socket
+import struct
+import sys
+import time
+
+from utils.app_paths import app_data_dir, app_data_path
+
+AUTH_FILENAME = "session_auth.txt"
+READY_FILENAME = "ready.txt"
+LAUNCH_LOG_FILENAME = "twin_launch_log.jsonl"
+
+# How often the wait loop wakes to check the process (event sources wake it sooner)
+PROCESS_CHECK_S = 0.25
+# Fallback ready-file check where inotify is unavailable (legacy twins only)
+FILE_CHECK_S = 0.1
+
+# Linux inotify flags
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def _open_inotify(directory):
+    """Return an inotify fd watching directory, or None if unsupported."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        wd = libc.inotify_add_watch(fd, os.fsencode(directory), IN_CREATE | IN_MOVED_TO | IN_CLOSE_WRITE)
+        if wd < 0:
+            os.close(fd)
+            return None
+        return fd
+    except Exception:
+        return None
+
+
+def _inotify_names(fd):
+    """Drain pending inotify events and return the file names they mention."""
+    names = []
+    try:
+        data = os.read(fd, 4096)
+    except BlockingIOError:
+        return names
+    offset = 0
+    while offset + _INOTIFY_EVENT.size <= len(data):
+        _, _, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+        offset += _INOTIFY_EVENT.size
+        names.append(data[offset:offset + length].rstrip(b"\0").decode(errors="replace"))
+        offset += length
+    return names
+
+
+class TwinHandshake:
+    """
+    Launch-to-ready handshake with the Digital Twin.
+
+    The launcher listens on a localhost socket and passes its port and a
+    one-time token to the twin through the environment. The twin connects
+    and sends newline-separated messages:
+        PROGRESS <percent> <text>
+        READY <token>
+    Twins that only know the legacy protocol still work: they read
+    session_auth.txt and create ready.txt. The ready file is watched with
+    inotify on Linux and checked every FILE_CHECK_S elsewhere.
+
+    The auth token stays on disk until the twin reports ready or exits.
+    """
+
+    def __init__(self):
+        self.auth_dir = app_data_dir()
+        self.auth_file = os.path.join(self.auth_dir, AUTH_FILENAME)
+        self.ready_file = os.path.join(self.auth_dir, READY_FILENAME)
+        self.token = secrets.token_hex(16)
+        self.started_at = None
+        # Launch-to-ready latency; stays None when the twin exits before it is ready
+        self.ready_after = None
+        self.exited_after = None
+
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(1)
+        self._listener.setblocking(False)
+        self.port = self._listener.getsockname()[1]
+
+    # ---------------------------------------------------------
+    # Launch side
+    # ---------------------------------------------------------
+    def prepare(self):
+        """Write the auth token (and clear any stale ready file) before launching."""
+        self._remove(self.ready_file)
+        with open(self.auth_file, "w", encoding="utf-8") as f:
+            f.write("AUTHORIZED")
+
+    def env(self):
+        """Environment variables that tell the twin how to report readiness."""
+        return {
+            "ZARRAGA_HANDSHAKE_PORT": str(self.port),
+            "ZARRAGA_HANDSHAKE_TOKEN": self.token,
+            "ZARRAGA_AUTH_FILE": self.auth_file,
+            "ZARRAGA_READY_FILE": self.ready_file,
+        }
+
+    def mark_launched(self):
+        self.started_at = time.monotonic()
+
+    # ---------------------------------------------------------
+    # Waiting (run on a background thread)
+    # ---------------------------------------------------------
+    def wait(self, process, on_progress=None):
+        """
+        Block until the twin is ready or its process exits.
+        Parameters:
+        process (R): Popen handle of the twin
+        on_progress (O): called with (percent or None, text) for twin progress messages
+        Returns:
+        (outcome, via): outcome is "ready" or "exited", via names the signal source
+        """
+        selector = selectors.DefaultSelector()
+        selector.register(self._listener, selectors.EVENT_READ, "listener")
+        inotify_fd = _open_inotify(self.auth_dir)
+        if inotify_fd is not None:
+            selector.register(inotify_fd, selectors.EVENT_READ, "inotify")
+        timeout = PROCESS_CHECK_S if inotify_fd is not None else FILE_CHECK_S
+        buffers = {}
+
+        try:
+            # The file may have appeared before the watch was in place
+            if os.path.exists(self.ready_file):
+                return self._finish("ready", "file")
+
+            while True:
+                for key, _ in selector.select(timeout):
+                    if key.data == "listener":
+                        conn, _ = self._listener.accept()
+                        conn.setblocking(False)
+                        buffers[conn] = b""
+                        selector.register(conn, selectors.EVENT_READ, "conn")
+                    elif key.data == "inotify":
+                        if READY_FILENAME in _inotify_names(inotify_fd):
+                            return self._finish("ready", "inotify")
+                    else:
+                        if self._read_messages(key.fileobj, buffers, selector, on_progress):
+                            return self._finish("ready", "socket")
+
+                if inotify_fd is None and os.path.exists(self.ready_file):
+                    return self._finish("ready", "file")
+                if process.poll() is not None:
+                    return self._finish("exited", f"exit code {process.returncode}")
+        finally:
+            selector.close()
+            for conn in buffers:
+                conn.close()
+            if inotify_fd is not None:
+                os.close(inotify_fd)
+
+    def _read_messages(self, conn, buffers, selector, on_progress):
+        """Handle protocol lines from one connection. Returns True on a valid READY."""
+        try:
+            chunk = conn.recv(4096)
+        except (BlockingIOError, ConnectionError):
+            chunk = b""
+        if not chunk:
+            selector.unregister(conn)
+            buffers.pop(conn, None)
+            conn.close()
+            return False
+
+        buffers[conn] += chunk
+        *lines, buffers[conn] = buffers[conn].split(b"\n")
+        for raw in lines:
+            parts = raw.decode(errors="replace").strip().split(" ", 2)
+            if parts[0] == "READY" and len(parts) > 1 and secrets.compare_digest(parts[1], self.token):
+                return True
+            if parts[0] == "PROGRESS" and on_progress:
+                try:
+                    percent = float(parts[1]) if len(parts) > 1 else None
+                except ValueError:
+                    percent = None
+                on_progress(percent, parts[2] if len(parts) > 2 else "")
+        return False
+
+    def _finish(self, outcome, via):
+        if self.started_at is not None:
+            elapsed = time.monotonic() - self.started_at
+            if outcome == "ready":
+                self.ready_after = elapsed
+            else:
+                self.exited_after = elapsed
+        self._record(outcome, via)
+        self.cleanup()
+        return outcome, via
+
+    def _record(self, outcome, via):
+        """Append the measured launch-to-ready latency to the launch log."""
+        entry = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "outcome": outcome,
+            "via": via,
+            "seconds": round(self.ready_after, 3) if self.ready_after is not None else None,
+            "exited_after_s": round(self.exited_after, 3) if self.exited_after is not None else None,
+        }
+        try:
+            with open(app_data_path(LAUNCH_LOG_FILENAME), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print("[DEBUG] Could not write twin launch log:", e)
+
+    # ---------------------------------------------------------
+    # Cleanup
+    # ---------------------------------------------------------
+    def cleanup(self):
+        """Remove the token files and stop listening."""
+        for path in (self.auth_file, self.ready_file):
+            self._remove(path)
+        try:
+            self._listener.close()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
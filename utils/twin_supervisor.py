@@ -0,0 +1,305 @@
+# File: utils/twin_supervisor.py
+import ctypes
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from utils.twin_handshake import TwinHandshake
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Resource sampling period while the twin runs
+SAMPLE_INTERVAL_S = 2.0
+DEFAULT_MAX_RESTARTS = 3
+# Delay before restarting a crashed twin, doubled on each further crash
+RESTART_BACKOFF_S = 2.0
+
+# Lifecycle states
+IDLE = "idle"
+STARTING = "starting"
+RUNNING = "running"
+RESTARTING = "restarting"
+EXITED = "exited"
+CRASHED = "crashed"
+
+
+# ---------------------------------------------------------
+# Process resource sampling
+# ---------------------------------------------------------
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_win32 = None
+
+
+def _win32_api():
+    """kernel32/psapi with argtypes and restype declared (HANDLEs are 64-bit on Win64)."""
+    global _win32
+    if _win32 is None:
+        from ctypes import wintypes
+
+        class MemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        psapi = ctypes.WinDLL("psapi", use_last_error=True)
+        kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        filetime = ctypes.POINTER(wintypes.FILETIME)
+        kernel32.GetProcessTimes.argtypes = (wintypes.HANDLE, filetime, filetime, filetime, filetime)
+        kernel32.GetProcessTimes.restype = wintypes.BOOL
+        kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+        kernel32.CloseHandle.restype = wintypes.BOOL
+        psapi.GetProcessMemoryInfo.argtypes = (wintypes.HANDLE, ctypes.POINTER(MemoryCounters), wintypes.DWORD)
+        psapi.GetProcessMemoryInfo.restype = wintypes.BOOL
+        _win32 = (kernel32, psapi, MemoryCounters)
+    return _win32
+
+
+class _ProcessSampler:
+    """
+    CPU and resident-memory readings for one pid. Uses psutil when it is
+    installed, otherwise /proc on Linux or the Win32 API on Windows.
+    CPU percent is relative to the whole machine (all cores).
+    """
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.cpu_count = os.cpu_count() or 1
+        self._last = None
+        self._proc = psutil.Process(pid) if psutil else None
+        self._handle = None
+        if not self._proc and os.name == "nt":
+            kernel32, _, _ = _win32_api()
+            self._handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+
+    def sample(self):
+        """Return (cpu_percent or None, rss_bytes or None)."""
+        try:
+            cpu_seconds, rss = self._read()
+        except Exception:
+            return None, None
+
+        now = time.monotonic()
+        cpu_percent = None
+        if self._last is not None and cpu_seconds is not None:
+            last_wall, last_cpu = self._last
+            wall = now - last_wall
+            if wall > 0:
+                cpu_percent = max(0.0, (cpu_seconds - last_cpu) / wall * 100.0 / self.cpu_count)
+        self._last = (now, cpu_seconds)
+        return cpu_percent, rss
+
+    def _read(self):
+        if self._proc:
+            times = self._proc.cpu_times()
+            return times.user + times.system, self._proc.memory_info().rss
+        if sys.platform.startswith("linux"):
+            return self._read_proc()
+        if self._handle:
+            return self._read_win32()
+        return None, None
+
+    def _read_proc(self):
+        with open(f"/proc/{self.pid}/stat", "rb") as f:
+            # Fields after the parenthesised command name; utime/stime are 14/15 overall
+            fields = f.read().rsplit(b")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / ticks
+        with open(f"/proc/{self.pid}/statm", "rb") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        return cpu_seconds, rss
+
+    def _read_win32(self):
+        from ctypes import wintypes
+
+        kernel32, psapi, MemoryCounters = _win32_api()
+        creation, exit_, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        if not kernel32.GetProcessTimes(
+            self._handle, ctypes.byref(creation), ctypes.byref(exit_), ctypes.byref(kernel), ctypes.byref(user)
+        ):
+            raise ctypes.WinError(ctypes.get_last_error())
+        to_seconds = lambda ft: ((ft.dwHighDateTime << 32) | ft.dwLowDateTime) / 1e7
+        counters = MemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        if not psapi.GetProcessMemoryInfo(self._handle, ctypes.byref(counters), counters.cb):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return to_seconds(kernel) + to_seconds(user), counters.WorkingSetSize
+
+    def close(self):
+        if self._handle:
+            _win32_api()[0].CloseHandle(self._handle)
+            self._handle = None
+
+
+# ---------------------------------------------------------
+# Supervisor
+# ---------------------------------------------------------
+class TwinSupervisor:
+    """
+    Owns the Digital Twin process: launches it with the readiness
+    handshake, samples CPU/RSS/runtime every sample_interval seconds on a
+    background thread, and optionally restarts it after a crash.
+
+    on_event(kind, snapshot) is called from the supervisor thread with kind
+    one of "progress", "ready", "sample", "exited", "crashed",
+    "restarting" or "failed"; marshal it to the Tk thread before touching widgets.
+    """
+
+    def __init__(self, command, cwd=None, on_event=None, sample_interval=SAMPLE_INTERVAL_S,
+                 restart_on_crash=False, max_restarts=DEFAULT_MAX_RESTARTS):
+        self.command = command
+        self.cwd = cwd
+        self.on_event = on_event
+        self.sample_interval = sample_interval
+        self.restart_on_crash = restart_on_crash
+        self.max_restarts = max_restarts
+
+        self.state = IDLE
+        self.process = None
+        self.handshake = None
+        self.restarts = 0
+        self.started_at = None
+        self.cpu_percent = None
+        self.rss_bytes = None
+        self.progress_text = ""
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def is_active(self):
+        """True while the twin runs or a restart is pending (start() would launch a second one)."""
+        return self.is_running() or (self._thread is not None and self._thread.is_alive() and not self._stop.is_set())
+
+    def start(self):
+        """Launch the twin (raises if it cannot be started) and begin supervising it."""
+        if self.is_active():
+            raise RuntimeError("Digital Twin is already running")
+        self._stop.clear()
+        self.restarts = 0
+        self._launch()
+        self._thread = threading.Thread(target=self._supervise, name="twin-supervisor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop supervising and terminate the twin."""
+        self._stop.set()
+        if self.is_running():
+            self.process.terminate()
+
+    def snapshot(self):
+        return {
+            "state": self.state,
+            "pid": self.process.pid if self.process else None,
+            "cpu_percent": self.cpu_percent,
+            "rss_bytes": self.rss_bytes,
+            "runtime_s": time.monotonic() - self.started_at if self.started_at else 0.0,
+            "ready_after_s": self.handshake.ready_after if self.handshake else None,
+            "exited_after_s": self.handshake.exited_after if self.handshake else None,
+            "restarts": self.restarts,
+            "progress_text": self.progress_text,
+        }
+
+    # ---------------------------------------------------------
+    # Lifecycle (supervisor thread)
+    # ---------------------------------------------------------
+    def _launch(self):
+        handshake = TwinHandshake()
+        handshake.prepare()
+        try:
+            creationflags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+            self.process = subprocess.Popen(
+                self.command,
+                shell=False,
+                creationflags=creationflags,
+                cwd=self.cwd,
+                env={**os.environ, **handshake.env()}
+            )
+        except Exception:
+            handshake.cleanup()
+            raise
+        handshake.mark_launched()
+        self.handshake = handshake
+        self.started_at = time.monotonic()
+        self.cpu_percent = self.rss_bytes = None
+        self.progress_text = "Starting..."
+        self.state = STARTING
+
+    def _supervise(self):
+        while True:
+            returncode = self._run_once()
+            if self._stop.is_set():
+                self.state = EXITED
+                self._emit("exited")
+                return
+
+            crashed = returncode != 0
+            if not crashed or not self.restart_on_crash or self.restarts >= self.max_restarts:
+                self.state = CRASHED if crashed else EXITED
+                self._emit(self.state)
+                return
+
+            self.state = RESTARTING
+            self._emit("restarting")
+            if self._stop.wait(RESTART_BACKOFF_S * (2 ** self.restarts)):
+                return
+            self.restarts += 1
+            try:
+                self._launch()
+            except Exception as e:
+                self.state = CRASHED
+                self.progress_text = str(e)
+                self._emit("failed")
+                return
+
+    def _run_once(self):
+        """Wait for readiness, then sample until the process exits. Returns its exit code."""
+        process = self.process
+        sampler = _ProcessSampler(process.pid)
+        try:
+            outcome, _ = self.handshake.wait(process, on_progress=self._on_progress)
+            if outcome == "ready":
+                self.state = RUNNING
+                self._emit("ready")
+
+            while process.poll() is None:
+                self.cpu_percent, self.rss_bytes = sampler.sample()
+                self._emit("sample")
+                try:
+                    process.wait(timeout=self.sample_interval)
+                except subprocess.TimeoutExpired:
+                    pass
+            return process.returncode
+        finally:
+            sampler.close()
+
+    def _on_progress(self, percent, text):
+        if text:
+            self.progress_text = text
+        self._emit("progress", percent=percent)
+
+    def _emit(self, kind, **extra):
+        if self.on_event:
+            try:
+                self.on_event(kind, {**self.snapshot(), **extra})
+            except Exception as e:
+                print("[DEBUG] Twin supervisor listener failed:", e)
@@ -1,9 +1,12 @@
 import customtkinter as ctk
+from collections.abc import Mapping
 
 # === Colors ===
 PRIMARY_COLOR = "#0078ff"        # Accent blue (bright blue)
 BACKGROUND_COLOR = "#f2f6fc"     # Main light background
 SECONDARY_BG = "#e3edf8"         # Light frame / panel background
+SURFACE_COLOR = "#ffffff"        # White content area / form card
+INPUT_BG = "#f0f4fb"             # Entry field background
 TEXT_COLOR = "#1f4e79"           # Dark blue text
 SUBTEXT_COLOR = "#6f7b86"        # Soft grey subtext
 DANGER_COLOR = "#d9534f"         # Light-theme friendly danger red
@@ -16,27 +19,70 @@ BUTTON_HOVER = "#155c99"         # Darker blue hover
 # Divider
 DIVIDER_COLOR = "#cce0ff"        # Light blue divider / borders
 
-# === Fonts ===
+# Cards, secondary actions
+CARD_COLOR = "#d9e4f5"           # Account list cards
+BACK_BUTTON = "#34495e"          # "Back" buttons
+BACK_BUTTON_HOVER = "#2c3e50"
+SUCCESS_COLOR = "#16a085"        # Import / export actions
+SUCCESS_HOVER = "#138d75"
+
+# === Fonts (interned: one CTkFont per distinct spec, shared by all pages) ===
+_font_cache = {}
+
+def font(size=13, weight="normal", slant="roman", family=None):
+    """
+    Return the shared CTkFont for this spec, creating it on first use.
+    Returns None (Tk default font) if called before the Tk root exists.
+    """
+    key = (family, size, weight, slant)
+    cached = _font_cache.get(key)
+    if cached is None:
+        try:
+            cached = ctk.CTkFont(family=family, size=size, weight=weight, slant=slant)
+        except RuntimeError:
+            return None
+        _font_cache[key] = cached
+    return cached
+
 def title_font(size=24):
     """Return a bold CTkFont for titles."""
-    try:
-        return ctk.CTkFont(size=size, weight="bold")
-    except RuntimeError:
-        return None
+    return font(size=size, weight="bold")
 
 def label_font(size=16):
     """Return a normal CTkFont for general labels."""
-    try:
-        return ctk.CTkFont(size=size)
-    except RuntimeError:
-        return None
+    return font(size=size)
 
 def small_font(size=12):
     """Return a smaller CTkFont for status or sublabels."""
-    try:
-        return ctk.CTkFont(size=size)
-    except RuntimeError:
-        return None
+    return font(size=size)
+
+# Named font roles used by the pages
+FONT_ROLES = {
+    "title": {"size": 24, "weight": "bold"},
+    "section_title": {"size": 22, "weight": "bold"},
+    "heading": {"size": 18, "weight": "bold"},
+    "label_font": {"size": 16},
+    "water_level": {"size": 16},
+    "body": {"size": 14},
+    "button": {"size": 14},
+    "small_button": {"size": 13},
+    "row_id": {"size": 14},
+    "row_name": {"size": 16, "weight": "bold"},
+}
+
+class _FontRegistry(Mapping):
+    """FONTS["title"] etc.: role lookups resolved lazily, so modules can import FONTS before the root exists."""
+
+    def __getitem__(self, role):
+        return font(**FONT_ROLES[role])
+
+    def __iter__(self):
+        return iter(FONT_ROLES)
+
+    def __len__(self):
+        return len(FONT_ROLES)
+
+FONTS = _FontRegistry()
 
 # === Buttons ===
 def styled_button(master, text, command, color=BUTTON_NORMAL,
@@ -48,16 +94,32 @@ def styled_button(master, text, command, color=BUTTON_NORMAL,
         width=width,
         fg_color=color,
         hover_color=hover_color,
-        font=label_font(16) or ("Arial", 14),
+        font=FONTS["label_font"] or ("Arial", 14),
         text_color="black",
         command=command
     )
 
+BUTTON_STYLES = {
+    "primary": {"fg_color": BUTTON_NORMAL, "hover_color": BUTTON_HOVER},
+    "back": {"fg_color": BACK_BUTTON, "hover_color": BACK_BUTTON_HOVER},
+    "danger": {"fg_color": DANGER_COLOR, "hover_color": BUTTON_HOVER_DANGER},
+    "success": {"fg_color": SUCCESS_COLOR, "hover_color": SUCCESS_HOVER},
+}
+
+def button_style(name="primary", font_role="button"):
+    """
+    CTkButton keyword arguments for a named style, with a shared font.
+    Usage: ctk.CTkButton(parent, text="Back", **button_style("back"), command=...)
+    """
+    return {**BUTTON_STYLES[name], "font": FONTS[font_role]}
+
 # === Color map ===
 COLORS = {
     "accent": PRIMARY_COLOR,
     "background": BACKGROUND_COLOR,
     "secondary": SECONDARY_BG,
+    "surface": SURFACE_COLOR,
+    "input": INPUT_BG,
     "text": TEXT_COLOR,
     "subtext": SUBTEXT_COLOR,
     "danger": DANGER_COLOR,
@@ -65,15 +127,22 @@ COLORS = {
     "button": BUTTON_NORMAL,
     "button_hover": BUTTON_HOVER,
     "divider": DIVIDER_COLOR,
+    "card": CARD_COLOR,
+    "back": BACK_BUTTON,
+    "back_hover": BACK_BUTTON_HOVER,
+    "success": SUCCESS_COLOR,
+    "success_hover": SUCCESS_HOVER,
 }
 
 # === Font map (lazy creation) ===
 def get_fonts():
-    return {
-        "title": title_font(24),
-        "water_level": label_font(16),
-        "label_font": label_font(16),
-    }
+    """Return the shared font registry (kept for older callers; prefer importing FONTS)."""
+    return FONTS
+
+def init_styles():
+    """Create every role font once, right after the Tk root exists."""
+    for role in FONT_ROLES:
+        FONTS[role]
 
 # === Padding ===
 PADDING = {
@@ -0,0 +1,13 @@
+# File: utils/validation.py
+import re
+
+PIN_LENGTH = 4
+# Accepts partial input while typing (used as a Tk validatecommand)
+PIN_INPUT_PATTERN = re.compile(r"^\d{0,%d}$" % PIN_LENGTH)
+# A complete PIN: ASCII digits only (str.isdigit() also accepts "²" or "١")
+PIN_PATTERN = re.compile(r"[0-9]{%d}" % PIN_LENGTH)
+
+
+def is_valid_pin(pin) -> bool:
+    """True if pin is a string of exactly PIN_LENGTH digits; anything else (None, numbers) is just invalid."""
+    return isinstance(pin, str) and PIN_PATTERN.fullmatch(pin) is not None
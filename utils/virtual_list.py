@@ -0,0 +1,159 @@
+# File: utils/virtual_list.py
+import customtkinter as ctk
+
+# Extra rows kept beyond the visible area so partial rows at both edges are covered
+OVERSCAN_ROWS = 2
+# Rows from the end at which on_reach_end fires (infinite scroll)
+REACH_END_THRESHOLD = 5
+WHEEL_STEP_PX = 40
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Scrollable list that only creates enough row widgets to fill the viewport.
+
+    Rows are created by make_row(parent) and recycled while scrolling:
+    bind_row(row, item) rebinds a pooled row to the item now at its slot.
+    The scroll offset is kept across set_items() calls unless reset.
+    """
+
+    def __init__(self, master, row_height, make_row, bind_row, on_reach_end=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_height = row_height
+        self.make_row = make_row
+        self.bind_row = bind_row
+        self.on_reach_end = on_reach_end
+
+        self.items = []
+        self.rows = []
+        self._bound = []
+        self._offset = 0
+        self._viewport_height = 0
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.viewport.grid(row=0, column=0, sticky="nsew")
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.message_label = ctk.CTkLabel(self.viewport, text="", text_color="gray")
+
+        self.viewport.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.viewport)
+        self._bind_wheel(self.message_label)
+
+    # ---------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------
+    def set_items(self, items, keep_position=True):
+        """Replace the list contents; keeps the scroll offset unless keep_position is False."""
+        self.items = items
+        self.message_label.place_forget()
+        if not keep_position:
+            self._offset = 0
+        self._refresh()
+
+    def refresh_item(self, index):
+        """Rebind only the pooled row currently showing items[index], if any."""
+        for slot, bound_index in enumerate(self._bound):
+            if bound_index == index:
+                self.bind_row(self.rows[slot], self.items[index])
+                return
+
+    def show_message(self, text):
+        """Clear the list and show a centred status message instead."""
+        self.items = []
+        self._offset = 0
+        self._refresh()
+        self.message_label.configure(text=text)
+        self.message_label.place(relx=0.5, y=20, anchor="n")
+
+    def scroll_to_top(self):
+        self._offset = 0
+        self._refresh()
+
+    # ---------------------------------------------------------
+    # Layout
+    # ---------------------------------------------------------
+    def _content_height(self):
+        return len(self.items) * self.row_height
+
+    def _max_offset(self):
+        return max(0, self._content_height() - self._viewport_height)
+
+    def _on_resize(self, event):
+        if event.height == self._viewport_height:
+            return
+        self._viewport_height = event.height
+        self._ensure_pool()
+        self._refresh()
+
+    def _ensure_pool(self):
+        needed = self._viewport_height // self.row_height + OVERSCAN_ROWS
+        while len(self.rows) < needed:
+            row = self.make_row(self.viewport)
+            self._bind_wheel(row)
+            self.rows.append(row)
+            self._bound.append(None)
+
+    def _refresh(self):
+        self._offset = min(max(self._offset, 0), self._max_offset())
+        first = self._offset // self.row_height
+        shift = self._offset % self.row_height
+
+        for slot, row in enumerate(self.rows):
+            index = first + slot
+            y = slot * self.row_height - shift
+            if index < len(self.items) and y < self._viewport_height:
+                if self._bound[slot] != index:
+                    self.bind_row(row, self.items[index])
+                    self._bound[slot] = index
+                row.place(x=0, y=y, relwidth=1, height=self.row_height)
+            else:
+                row.place_forget()
+                self._bound[slot] = None
+
+        self._update_scrollbar()
+
+        last_visible = (self._offset + self._viewport_height) // self.row_height
+        if self.on_reach_end and self.items and last_visible >= len(self.items) - REACH_END_THRESHOLD:
+            self.on_reach_end()
+
+    def _update_scrollbar(self):
+        total = self._content_height()
+        if total <= self._viewport_height or total == 0:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._offset / total, (self._offset + self._viewport_height) / total)
+
+    # ---------------------------------------------------------
+    # Scrolling
+    # ---------------------------------------------------------
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self._offset = int(float(args[1]) * self._content_height())
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            step = self._viewport_height if args[2] == "pages" else self.row_height
+            self._offset += amount * step
+        self._refresh()
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4:
+            delta = -1
+        elif getattr(event, "num", None) == 5:
+            delta = 1
+        else:
+            delta = -1 if event.delta > 0 else 1
+        self._offset += delta * WHEEL_STEP_PX
+        self._refresh()
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
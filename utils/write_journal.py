@@ -0,0 +1,282 @@
+# File: utils/write_journal.py
+import json
+import sqlite3
+import threading
+import time
+
+from utils.app_paths import app_data_path
+from utils.connectivity import is_network_error
+
+JOURNAL_FILENAME = "pending_writes.db"
+REPLAY_BATCH_SIZE = 100
+
+PENDING = "pending"
+CONFLICT = "conflict"
+
+
+class ReplayResult:
+    """Outcome of one replay pass."""
+
+    def __init__(self):
+        self.inserted = []      # rows returned by the server for replayed inserts
+        self.updated = []       # rows returned by the server for replayed updates
+        self.conflicts = []     # (op, user_name, reason) newly marked as conflicts
+        self.interrupted = False  # set by the caller when replay() raised ReplayInterrupted
+
+
+class ReplayInterrupted(ConnectionError):
+    """
+    The backend became unreachable during a replay. A network error, so the
+    circuit breaker counts it as a failure; result holds what was applied
+    before the connection dropped.
+    """
+
+    def __init__(self, result, cause):
+        super().__init__(f"Journal replay interrupted: {cause}")
+        self.result = result
+
+
+class WriteJournal:
+    """
+    Durable queue of account inserts/updates made while the backend was
+    unreachable. Entries are replayed in order and in batches once the
+    connection returns.
+
+    Before anything is written, each username is checked against the server
+    (and against the rest of the batch). A clash is marked as a conflict and
+    is never applied. An insert whose row is already on the server with the
+    same values (applied by a replay that lost the connection before it
+    could finish) counts as done. A batch the server rejects is retried one
+    row at a time; rows rejected on their own are marked as conflicts with
+    the server's error, so one bad row cannot block the rest of the journal.
+    on_change(pending, conflicts) is called from whichever thread changed the journal.
+    """
+
+    def __init__(self, path=None, on_change=None):
+        self.path = path or app_data_path(JOURNAL_FILENAME)
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS journal ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " op TEXT NOT NULL,"
+            " target TEXT NOT NULL,"
+            " record_id TEXT,"
+            " payload TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " status TEXT NOT NULL,"
+            " error TEXT)"
+        )
+        self._db.commit()
+
+    # ---------------------------------------------------------
+    # Queueing
+    # ---------------------------------------------------------
+    def enqueue_insert(self, target, payload):
+        self._enqueue("insert", target, None, payload)
+
+    def enqueue_update(self, target, record_id, payload):
+        self._enqueue("update", target, record_id, payload)
+
+    def _enqueue(self, op, target, record_id, payload):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO journal (op, target, record_id, payload, created_at, status) VALUES (?, ?, ?, ?, ?, ?)",
+                (op, target, None if record_id is None else str(record_id), json.dumps(payload), time.time(), PENDING)
+            )
+            self._db.commit()
+        self._notify()
+
+    # ---------------------------------------------------------
+    # Status
+    # ---------------------------------------------------------
+    def counts(self):
+        """Return (pending, conflicts)."""
+        with self._lock:
+            rows = dict(self._db.execute("SELECT status, COUNT(*) FROM journal GROUP BY status").fetchall())
+        return rows.get(PENDING, 0), rows.get(CONFLICT, 0)
+
+    def conflicts(self):
+        """Return [(op, user_name, reason)] for entries that could not be applied."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT op, payload, error FROM journal WHERE status = ? ORDER BY seq", (CONFLICT,)
+            ).fetchall()
+        return [(op, json.loads(payload).get("user_name"), error) for op, payload, error in rows]
+
+    def discard_conflicts(self):
+        with self._lock:
+            self._db.execute("DELETE FROM journal WHERE status = ?", (CONFLICT,))
+            self._db.commit()
+        self._notify()
+
+    def _notify(self):
+        if self.on_change:
+            try:
+                self.on_change(*self.counts())
+            except Exception as e:
+                print("[DEBUG] Journal listener failed:", e)
+
+    # ---------------------------------------------------------
+    # Replay (call from a worker thread)
+    # ---------------------------------------------------------
+    def replay(self, supabase, batch_size=REPLAY_BATCH_SIZE):
+        """
+        Apply pending entries in batches. Stops early (keeping the rest
+        pending) and raises ReplayInterrupted if the backend becomes
+        unreachable again.
+        Returns:
+        ReplayResult
+        """
+        result = ReplayResult()
+        if not self._replay_lock.acquire(blocking=False):
+            return result  # another replay is already running
+        try:
+            while True:
+                batch = self._next_batch(batch_size)
+                if not batch:
+                    break
+                try:
+                    self._replay_batch(supabase, batch, result)
+                except Exception as e:
+                    if is_network_error(e):
+                        raise ReplayInterrupted(result, e) from e
+                    raise
+        finally:
+            self._replay_lock.release()
+            self._notify()
+        return result
+
+    def _next_batch(self, batch_size):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, op, target, record_id, payload FROM journal WHERE status = ? ORDER BY seq LIMIT ?",
+                (PENDING, batch_size)
+            ).fetchall()
+        return [
+            {"seq": seq, "op": op, "target": target, "record_id": record_id, "payload": json.loads(payload)}
+            for seq, op, target, record_id, payload in rows
+        ]
+
+    def _replay_batch(self, supabase, batch, result):
+        # Later updates to the same record supersede earlier ones
+        latest_update = {}
+        for entry in batch:
+            if entry["op"] == "update":
+                latest_update[(entry["target"], entry["record_id"])] = entry["seq"]
+
+        by_target = {}
+        for entry in batch:
+            if entry["op"] == "update" and latest_update[(entry["target"], entry["record_id"])] != entry["seq"]:
+                self._finish([entry["seq"]])
+                continue
+            by_target.setdefault(entry["target"], []).append(entry)
+
+        for target, entries in by_target.items():
+            applicable = self._detect_conflicts(supabase, target, entries, result)
+            inserts = [e for e in applicable if e["op"] == "insert"]
+            updates = [e for e in applicable if e["op"] == "update"]
+
+            if inserts:
+                self._write(
+                    inserts, result.inserted, result,
+                    lambda entries: supabase.table(target).insert([e["payload"] for e in entries]).execute()
+                )
+            if updates:
+                self._write(
+                    updates, result.updated, result,
+                    lambda entries: supabase.table(target).upsert(
+                        [{"id": _coerce_id(e["record_id"]), **e["payload"]} for e in entries], on_conflict="id"
+                    ).execute()
+                )
+
+    def _write(self, entries, applied, result, send):
+        """
+        send(entries) as one request; if the server rejects it, send each
+        entry alone and mark the ones it still rejects as conflicts.
+        """
+        try:
+            response = send(entries)
+        except Exception as e:
+            if is_network_error(e):
+                raise
+            if len(entries) == 1:
+                self._reject(entries[0], e, result)
+                return
+            for entry in entries:
+                self._write([entry], applied, result, send)
+            return
+        applied.extend(response.data or [])
+        self._finish([e["seq"] for e in entries])
+
+    def _reject(self, entry, error, result):
+        reason = f"rejected by the server: {getattr(error, 'message', None) or error}"
+        self._mark_conflict(entry["seq"], reason)
+        result.conflicts.append((entry["op"], entry["payload"].get("user_name"), reason))
+
+    def _detect_conflicts(self, supabase, target, entries, result):
+        """Mark entries whose user_name clashes (or whose record vanished) as conflicts."""
+        names = sorted({e["payload"]["user_name"] for e in entries if e["payload"].get("user_name")})
+        update_ids = sorted({e["record_id"] for e in entries if e["op"] == "update"})
+
+        owners = {}
+        server_rows = {}
+        if names:
+            response = supabase.table(target).select("*").in_("user_name", names).execute()
+            server_rows = {row["user_name"]: row for row in response.data or []}
+            owners = {name: str(row["id"]) for name, row in server_rows.items()}
+        existing_ids = set()
+        if update_ids:
+            response = supabase.table(target).select("id").in_("id", [_coerce_id(i) for i in update_ids]).execute()
+            existing_ids = {str(row["id"]) for row in response.data or []}
+
+        applicable = []
+        claimed = {}
+        for entry in entries:
+            name = entry["payload"].get("user_name")
+            identity = entry["record_id"] or f"insert:{entry['seq']}"
+            owner = owners.get(name)
+            reason = None
+            if entry["op"] == "insert" and owner is not None and name not in claimed and _same_values(
+                server_rows[name], entry["payload"]
+            ):
+                # Written by an earlier replay that was cut off before it could finish
+                claimed[name] = owner
+                result.inserted.append(server_rows[name])
+                self._finish([entry["seq"]])
+                continue
+            if entry["op"] == "update" and entry["record_id"] not in existing_ids:
+                reason = "account no longer exists"
+            elif owner is not None and owner != entry["record_id"]:
+                reason = "username already taken"
+            elif name in claimed and claimed[name] != identity:
+                reason = "username used twice while offline"
+
+            if reason:
+                self._mark_conflict(entry["seq"], reason)
+                result.conflicts.append((entry["op"], name, reason))
+            else:
+                claimed[name] = identity
+                applicable.append(entry)
+        return applicable
+
+    def _finish(self, seqs):
+        with self._lock:
+            self._db.executemany("DELETE FROM journal WHERE seq = ?", [(seq,) for seq in seqs])
+            self._db.commit()
+
+    def _mark_conflict(self, seq, reason):
+        with self._lock:
+            self._db.execute("UPDATE journal SET status = ?, error = ? WHERE seq = ?", (CONFLICT, reason, seq))
+            self._db.commit()
+
+
+def _same_values(row, payload):
+    return all(str(row.get(column)) == str(value) for column, value in payload.items())
+
+
+def _coerce_id(record_id):
+    """Journal ids are stored as text; numeric ids go back to the server as ints."""
+    return int(record_id) if record_id is not None and record_id.isdigit() else record_id